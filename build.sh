@@ -4,6 +4,18 @@ set -e
 echo "Running migrations..."
 python manage.py migrate
 
+echo "Pruning expired sessions..."
+python manage.py prune_sessions
+
+echo "Verifying the committed front-end vendor bundle..."
+python manage.py vendor_assets --check
+
+echo "Building responsive images..."
+python manage.py build_responsive_images
+
+echo "Generating missing village image variants..."
+python manage.py generate_village_variants
+
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
@@ -32,5 +44,14 @@ else:
     print("Superuser env vars not set")
 EOF
 
-echo "Starting Gunicorn..."
-exec gunicorn ngo_project.wsgi:application
+# Status emails wait in EmailOutbox until send_outbox delivers them. With a
+# separate worker service running the Procfile's `worker` process, set
+# OUTBOX_WORKER=off; otherwise the sender runs alongside Gunicorn here and is
+# restarted if it exits. Claims skip locked rows, so running both is safe.
+if [ "${OUTBOX_WORKER:-inline}" = "inline" ]; then
+    echo "Starting the outbox sender..."
+    (while true; do python manage.py send_outbox --loop || echo "Outbox sender exited, restarting"; sleep 5; done) &
+fi
+
+echo "Starting Gunicorn (SERVER_MODE=${SERVER_MODE:-wsgi})..."
+exec gunicorn
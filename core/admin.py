@@ -1,7 +1,18 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import Donation, VolunteerApplication, Job, JobApplication, Page, ModelVillage, UserProfile
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from . import dashboard
+from .admin_search import IndexedSearchMixin, ORDER_ID_RE, PAYMENT_ID_RE
+from .models import Donation, DonorLeaderboard, DonationDailyRollup, EmailOutbox, VolunteerApplication, Job, JobApplication, Page, ModelVillage, UserProfile
+
+def invalidate_dashboard(updated):
+    """Bulk actions send no post_save, so they drop the dashboard snapshot themselves"""
+    if updated:
+        transaction.on_commit(dashboard.invalidate)
 
 # UserProfile Inline for User Admin
 class UserProfileInline(admin.StackedInline):
@@ -19,10 +30,13 @@ admin.site.register(User, UserAdmin)
 
 # Donation Admin
 @admin.register(Donation)
-class DonationAdmin(admin.ModelAdmin):
+class DonationAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['user', 'first_name', 'last_name', 'amount', 'status', 'created_at']
     list_filter = ['status', 'cause', 'created_at']
-    search_fields = ['first_name', 'last_name', 'email', 'phone']
+    search_fields = ['first_name', 'last_name', 'email']
+    search_email_field = 'email'
+    search_phone_field = 'phone'
+    search_id_fields = {'order_id': ORDER_ID_RE, 'payment_id': PAYMENT_ID_RE}
     
     fieldsets = (
         ('Donor Information', {
@@ -66,11 +80,13 @@ class VolunteerApplicationAdmin(admin.ModelAdmin):
     
     def approve_volunteers(self, request, queryset):
         updated = queryset.update(status='approved')
+        invalidate_dashboard(updated)
         self.message_user(request, f'{updated} volunteer(s) approved successfully.')
     approve_volunteers.short_description = 'Approve selected volunteers'
     
     def reject_volunteers(self, request, queryset):
         updated = queryset.update(status='rejected')
+        invalidate_dashboard(updated)
         self.message_user(request, f'{updated} volunteer(s) rejected.')
     reject_volunteers.short_description = 'Reject selected volunteers'
 
@@ -96,11 +112,13 @@ class JobAdmin(admin.ModelAdmin):
 
 # Job Application Admin
 @admin.register(JobApplication)
-class JobApplicationAdmin(admin.ModelAdmin):
+class JobApplicationAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'job', 'status', 'created_at']
     list_filter = ['status', 'job', 'created_at']
     search_fields = ['name', 'email', 'job__title']
-    readonly_fields = ['created_at', 'resume']
+    search_email_field = 'email'
+    search_phone_field = 'phone'
+    readonly_fields = ['created_at', 'resume_link']
     actions = ['mark_as_reviewed', 'mark_as_shortlisted', 'mark_as_rejected']
     
     fieldsets = (
@@ -108,25 +126,34 @@ class JobApplicationAdmin(admin.ModelAdmin):
             'fields': ('user', 'name', 'email', 'phone')
         }),
         ('Application Details', {
-            'fields': ('job', 'resume', 'cover_letter', 'status')
+            'fields': ('job', 'resume_link', 'cover_letter', 'status')
         }),
         ('Timestamp', {
             'fields': ('created_at',)
         }),
     )
     
+    def resume_link(self, obj):
+        if not obj.resume:
+            return '-'
+        return format_html('<a href="{}" target="_blank">Download resume</a>', reverse('download_resume', args=[obj.pk]))
+    resume_link.short_description = 'Resume'
+    
     def mark_as_reviewed(self, request, queryset):
-        updated = queryset.update(status='reviewed')
+        updated = queryset.set_status('reviewed')
+        invalidate_dashboard(updated)
         self.message_user(request, f'{updated} application(s) marked as reviewed.')
     mark_as_reviewed.short_description = 'Mark as reviewed'
     
     def mark_as_shortlisted(self, request, queryset):
-        updated = queryset.update(status='shortlisted')
+        updated = queryset.set_status('shortlisted')
+        invalidate_dashboard(updated)
         self.message_user(request, f'{updated} application(s) shortlisted.')
     mark_as_shortlisted.short_description = 'Mark as shortlisted'
     
     def mark_as_rejected(self, request, queryset):
-        updated = queryset.update(status='rejected')
+        updated = queryset.set_status('rejected')
+        invalidate_dashboard(updated)
         self.message_user(request, f'{updated} application(s) rejected.')
     mark_as_rejected.short_description = 'Mark as rejected'
 
@@ -142,7 +169,7 @@ class PageAdmin(admin.ModelAdmin):
 # Model Village Admin
 @admin.register(ModelVillage)
 class ModelVillageAdmin(admin.ModelAdmin):
-    list_display = ['name', 'location', 'start_date', 'is_active']
+    list_display = ['preview', 'name', 'location', 'start_date', 'is_active']
     list_filter = ['is_active', 'start_date']
     search_fields = ['name', 'location', 'description']
     readonly_fields = ['start_date']
@@ -157,4 +184,38 @@ class ModelVillageAdmin(admin.ModelAdmin):
         ('Status', {
             'fields': ('start_date', 'is_active')
         }),
-    )
\ No newline at end of file
+    )
+
+    def preview(self, obj):
+        if not obj.image:
+            return '-'
+        return format_html('<img src="{}" alt="" style="height: 48px; border-radius: 4px;">', obj.thumbnail_url)
+    preview.short_description = 'Image'
+# Donor Leaderboard Admin
+@admin.register(DonorLeaderboard)
+class DonorLeaderboardAdmin(admin.ModelAdmin):
+    list_display = ['donor_key', 'first_name', 'last_name', 'total_amount', 'donation_count', 'show_name', 'updated_at']
+    search_fields = ['donor_key', 'first_name', 'last_name']
+    readonly_fields = ['donor_key', 'user', 'total_amount', 'donation_count', 'updated_at']
+
+# Donation Daily Rollup Admin
+@admin.register(DonationDailyRollup)
+class DonationDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['day', 'cause', 'donation_count', 'total_amount', 'min_amount', 'max_amount']
+    list_filter = ['cause', 'day']
+    date_hierarchy = 'day'
+    readonly_fields = ['day', 'cause', 'donation_count', 'total_amount', 'min_amount', 'max_amount', 'updated_at']
+
+# Email Outbox Admin
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'to', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['to', 'subject']
+    readonly_fields = ['attempts', 'last_error', 'created_at', 'sent_at']
+    actions = ['retry_now']
+    
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+        self.message_user(request, f'{updated} email(s) queued for another attempt.')
+    retry_now.short_description = 'Retry selected emails now'
@@ -0,0 +1,120 @@
+"""Self-hosted front-end vendor bundle.
+
+Bootstrap, Bootstrap Icons, AOS and the Google Fonts used by the templates
+are fetched once by ``manage.py vendor_assets`` and concatenated into
+``vendor/site.css`` and ``vendor/site.js`` under core/static. Fonts
+referenced from the CSS go to ``vendor/fonts/`` and the ``url()``s are
+rewritten to point at them. collectstatic (whitenoise's
+CompressedManifestStaticFilesStorage) then fingerprints everything and
+writes gzip/Brotli copies. WhiteNoiseMiddleware serves fingerprinted files
+as immutable, so a page costs one first-party stylesheet and one script,
+cached forever, instead of four third-party hosts.
+
+The bundle is committed with ``vendor/vendor.lock.json``. The lock pins the
+SHA-256 of every upstream download and of every file the command writes.
+Builds run ``vendor_assets --check``, which needs no network and fails if a
+committed file no longer matches the lock. Refreshing the bundle means running
+``vendor_assets`` by hand and committing the result; upstream bytes that
+differ from the lock are refused unless ``--update-lock`` is given.
+
+Until a bundle has been committed, the template tags keep emitting the CDN
+links and ``--check`` only warns, so a checkout without one still deploys.
+"""
+import hashlib
+import json
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+
+STATIC_DIR = Path(settings.BASE_DIR) / 'core' / 'static'
+VENDOR_DIR = 'vendor'
+BUNDLE_CSS = 'vendor/site.css'
+BUNDLE_JS = 'vendor/site.js'
+LOCK_NAME = 'vendor.lock.json'
+
+# Pinned versions, in the order the templates loaded them
+CSS_SOURCES = [
+    'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css',
+    'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css',
+    'https://fonts.googleapis.com/css2?family=Playfair+Display:wght@600;700;800'
+    '&family=Inter:wght@300;400;500;600;700&display=swap',
+    'https://unpkg.com/aos@2.3.4/dist/aos.css',
+]
+JS_SOURCES = [
+    'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js',
+    'https://unpkg.com/aos@2.3.4/dist/aos.js',
+]
+
+# Google Fonts picks the font format from the User-Agent; ask for WOFF2
+FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+}
+
+CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+# The source maps are not vendored, and ManifestStaticFilesStorage fails on dangling references
+SOURCE_MAP_RE = re.compile(r'/[/*]# sourceMappingURL=[^\n]*?(\*/)?$', re.M)
+
+
+def bundle_exists(name):
+    return (STATIC_DIR / name).exists()
+
+
+def strip_source_maps(text):
+    return SOURCE_MAP_RE.sub('', text)
+
+
+def font_name(url):
+    """Local file name for a font URL; the path keeps names unique across families"""
+    path = urlsplit(url).path
+    stem, extension = posixpath.splitext(path)
+    digest = hashlib.sha256(path.encode()).hexdigest()[:10]
+    return f'{posixpath.basename(stem)[:40]}-{digest}{extension}'
+
+
+def rewrite_css(text, base_url):
+    """Replace remote ``url()``s with ``fonts/...`` paths; returns (css, {absolute url: local name})"""
+    fonts = {}
+
+    def replace(match):
+        reference = match.group(2)
+        if reference.startswith('data:'):
+            return match.group(0)
+        absolute = urljoin(base_url, reference)
+        name = font_name(absolute)
+        fonts[absolute.split('#')[0]] = name
+        return f'url("fonts/{name}")'
+
+    return CSS_URL_RE.sub(replace, text), fonts
+
+
+def digest(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def bundle_files():
+    """Digests of the built bundle files, keyed by path relative to the vendor directory"""
+    vendor_dir = STATIC_DIR / VENDOR_DIR
+    paths = [vendor_dir / 'site.css', vendor_dir / 'site.js']
+    if (vendor_dir / 'fonts').is_dir():
+        paths.extend(sorted((vendor_dir / 'fonts').iterdir()))
+    return {
+        path.relative_to(vendor_dir).as_posix(): digest(path.read_bytes())
+        for path in paths if path.is_file()
+    }
+
+
+def load_lock():
+    """{'sources': {url: sha256}, 'files': {path: sha256}}, or None before the bundle is pinned"""
+    try:
+        with open(STATIC_DIR / VENDOR_DIR / LOCK_NAME) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def write_lock(lock):
+    with open(STATIC_DIR / VENDOR_DIR / LOCK_NAME, 'w') as handle:
+        json.dump(lock, handle, indent=1, sort_keys=True)
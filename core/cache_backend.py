@@ -0,0 +1,229 @@
+"""Django cache backend on a local SQLite file in WAL mode.
+
+Every gunicorn worker on the host opens the same file, so the workers share
+one cache, and entries survive a restart. WAL lets readers run while another
+process writes, and the mmap keeps hot pages in shared memory. No external
+service is needed.
+
+- Each thread opens its own connection. A forked worker reopens instead of
+  reusing its parent's.
+- Integers are stored as SQLite integers, so ``incr``/``decr`` are a single
+  atomic UPDATE that is safe across processes. Everything else is pickled.
+- Expired rows are invisible at once and are deleted by the periodic cull.
+- The cull runs on roughly one ``set`` in CULL_EVERY. If the cache still
+  holds more than MAX_ENTRIES rows, it removes the least recently used
+  1/CULL_FREQUENCY of them. A read refreshes an entry's access time at most
+  once every ACCESS_RESOLUTION seconds, so hot keys do not turn every read
+  into a write.
+
+    CACHES = {'default': {
+        'BACKEND': 'core.cache_backend.SQLiteCache',
+        'LOCATION': '/var/tmp/ngo-cache.sqlite3',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }}
+"""
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Expiry stored for timeout=None; far past any real clock
+NEVER = float(2 ** 53)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires);
+CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed);
+'''
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.location = location
+        options = params.get('OPTIONS', {})
+        self.cull_every = int(options.get('CULL_EVERY', 100))
+        self.access_resolution = float(options.get('ACCESS_RESOLUTION', 10))
+        self.busy_timeout = float(options.get('BUSY_TIMEOUT', 5))
+        self.mmap_size = int(options.get('MMAP_SIZE', 64 * 1024 * 1024))
+        self._local = threading.local()
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.location)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit: each statement is its own transaction unless we BEGIN
+            connection = sqlite3.connect(self.location, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(f'PRAGMA mmap_size={self.mmap_size}')
+            connection.executescript(SCHEMA)
+            local.connection, local.pid = connection, os.getpid()
+        return local.connection
+
+    def _expiry(self, timeout):
+        # get_backend_timeout() already turns seconds into an absolute timestamp
+        expires = self.get_backend_timeout(timeout)
+        return NEVER if expires is None else expires
+
+    @staticmethod
+    def _encode(value):
+        # Plain ints stay native so incr() can add to them in SQL
+        if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(stored):
+        return stored if isinstance(stored, int) else pickle.loads(stored)
+
+    def _touch_accessed(self, connection, keys, now):
+        if keys:
+            connection.executemany('UPDATE cache_entry SET accessed = ? WHERE key = ?', [(now, key) for key in keys])
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            'SELECT value, accessed FROM cache_entry WHERE key = ? AND expires > ?', (key, now)
+        ).fetchone()
+        if row is None:
+            return default
+        if row[1] < now - self.access_resolution:
+            self._touch_accessed(connection, [key], now)
+        return self._decode(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        connection = self._connection()
+        now = time.time()
+        placeholders = ', '.join('?' * len(key_map))
+        rows = connection.execute(
+            f'SELECT key, value, accessed FROM cache_entry WHERE key IN ({placeholders}) AND expires > ?',
+            (*key_map, now),
+        ).fetchall()
+        self._touch_accessed(connection, [key for key, _, accessed in rows if accessed < now - self.access_resolution], now)
+        return {key_map[key]: self._decode(value) for key, value, _ in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+            (key, self._encode(value), self._expiry(timeout), time.time()),
+        )
+        self._maybe_cull(connection)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires, now = self._expiry(timeout), time.time()
+        rows = [(self.make_and_validate_key(key, version=version), self._encode(value), expires, now)
+                for key, value in data.items()]
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.executemany(
+                'INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?)', rows
+            )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        self._maybe_cull(connection)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        connection = self._connection()
+        now = time.time()
+        # Insert, or take over the row only if it has expired; one statement, so it is atomic
+        cursor = connection.execute(
+            'INSERT INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, '
+            'accessed = excluded.accessed WHERE cache_entry.expires <= ?',
+            (key, self._encode(value), self._expiry(timeout), now, now),
+        )
+        if cursor.rowcount:
+            self._maybe_cull(connection)
+        return cursor.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'UPDATE cache_entry SET expires = ? WHERE key = ? AND expires > ?',
+            (self._expiry(timeout), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        connection = self._connection()
+        now = time.time()
+        # fetchall() finishes the statement, so its write lock never outlives the call
+        rows = connection.execute(
+            "UPDATE cache_entry SET value = value + ? WHERE key = ? AND expires > ? AND typeof(value) = 'integer' "
+            'RETURNING value',
+            (delta, key, now),
+        ).fetchall()
+        if not rows:
+            if connection.execute('SELECT 1 FROM cache_entry WHERE key = ? AND expires > ?', (key, now)).fetchone():
+                raise TypeError(f"Value of '{key}' is not an integer")
+            raise ValueError(f"Key '{key}' not found")
+        return rows[0][0]
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+        return cursor.rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        keys = [(self.make_and_validate_key(key, version=version),) for key in keys]
+        if keys:
+            self._connection().executemany('DELETE FROM cache_entry WHERE key = ?', keys)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache_entry WHERE key = ? AND expires > ?', (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
+
+    def close(self, **kwargs):
+        # Connections are kept for the life of the thread; opening one costs several statements
+        pass
+
+    def _maybe_cull(self, connection):
+        if random.randrange(self.cull_every) == 0:
+            self.cull(connection)
+
+    def cull(self, connection=None):
+        """Delete expired rows, then the least recently used ones beyond MAX_ENTRIES"""
+        connection = connection or self._connection()
+        connection.execute('DELETE FROM cache_entry WHERE expires <= ?', (time.time(),))
+        count = connection.execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+        if count > self._max_entries:
+            if self._cull_frequency == 0:
+                connection.execute('DELETE FROM cache_entry')
+                return
+            excess = count - self._max_entries + self._max_entries // self._cull_frequency
+            connection.execute(
+                'DELETE FROM cache_entry WHERE key IN '
+                '(SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)',
+                (excess,),
+            )
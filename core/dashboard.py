@@ -0,0 +1,62 @@
+"""Cached snapshot of the counters shown on the admin dashboard.
+
+The snapshot is rebuilt at most every DASHBOARD_STATS_TTL seconds and is
+dropped as soon as a relevant model changes (see core.signals). Bulk
+``queryset.update()`` calls send no signals, so the views that make them call
+``invalidate`` on commit themselves.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from .models import Donation, DonationDailyRollup, VolunteerApplication, Job
+
+CACHE_KEY = 'dashboard:stats:v1'
+
+
+def compute_stats():
+    """Build the dashboard snapshot with one aggregate query per table"""
+    donations_by_cause = list(
+        DonationDailyRollup.objects.values('cause').annotate(
+            total=Sum('total_amount'),
+            count=Sum('donation_count'),
+        ).order_by('cause')
+    )
+    total_donations = sum(item['total'] for item in donations_by_cause)
+    donations_count = sum(item['count'] for item in donations_by_cause)
+    for item in donations_by_cause:
+        item['percentage'] = (item['total'] / total_donations) * 100 if total_donations > 0 else 0
+
+    volunteers = VolunteerApplication.objects.aggregate(
+        pending_volunteers=Count('id', filter=Q(status='pending')),
+        total_volunteers=Count('id', filter=Q(status='approved')),
+    )
+    # Pending applications are summed from the per-job counters in the same query
+    jobs = Job.objects.aggregate(
+        active_jobs=Count('id', filter=Q(is_active=True)),
+        pending_applications=Sum('pending_count'),
+    )
+    jobs['pending_applications'] = jobs['pending_applications'] or 0
+
+    return {
+        'total_donations': total_donations,
+        'donations_count': donations_count,
+        'donations_by_cause': donations_by_cause,
+        **volunteers,
+        **jobs,
+        'recent_donations': list(Donation.objects.filter(status='completed').order_by('-created_at')[:10]),
+        'recent_volunteers': list(VolunteerApplication.objects.order_by('-created_at')[:10]),
+    }
+
+
+def get_stats():
+    """Return the cached dashboard snapshot, rebuilding it if it expired"""
+    stats = cache.get(CACHE_KEY)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(CACHE_KEY, stats, settings.DASHBOARD_STATS_TTL)
+    return stats
+
+
+def invalidate():
+    cache.delete(CACHE_KEY)
@@ -0,0 +1 @@
+"""Database engines that draw connections from core.db_pool (see DB_POOL in settings)"""
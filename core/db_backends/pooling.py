@@ -0,0 +1,24 @@
+from core import db_pool
+
+
+class PooledDatabaseWrapperMixin:
+    """Take connections from the process-wide pool and give them back on close"""
+
+    @property
+    def pool(self):
+        return db_pool.get_pool(self.alias, self._open_pooled_connection, self.settings_dict.get('POOL', {}))
+
+    def _open_pooled_connection(self):
+        return super().get_new_connection(self.get_connection_params())
+
+    def get_new_connection(self, conn_params):
+        try:
+            return self.pool.acquire()
+        except db_pool.PoolTimeout as e:
+            # Surfaces as django.db.OperationalError through wrap_database_errors
+            raise self.Database.OperationalError(str(e)) from e
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
@@ -0,0 +1,6 @@
+from django.db.backends.postgresql import base
+from core.db_backends.pooling import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,6 @@
+from django.db.backends.sqlite3 import base
+from core.db_backends.pooling import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """Local stand-in for the pooled Postgres engine"""
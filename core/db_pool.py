@@ -0,0 +1,277 @@
+"""Per-process database connection pool used by the core.db_backends engines.
+
+Django 4.2 has no pool of its own: with CONN_MAX_AGE each thread keeps one
+connection, and nothing caps how many a worker opens. With DB_POOL=true the
+pooled engines take a connection from here when Django connects and hand it
+back when Django closes it, at the end of every request. A worker then never
+holds more than MAX_SIZE connections, and threads share them.
+
+- MIN_SIZE connections are opened on first use and are never closed for
+  being idle. Idle connections beyond MIN_SIZE close after MAX_IDLE seconds.
+- Every connection is recycled once it is MAX_LIFETIME seconds old.
+- With PRE_PING, a connection is checked with ``SELECT 1`` before it is
+  handed out. One that fails is replaced, so a database restart costs
+  nothing but a reconnect.
+- When the pool is exhausted, a checkout waits up to TIMEOUT seconds and
+  then raises ``PoolTimeout``.
+
+Wait times go into ``WAIT_TIME`` and the current state of every pool is
+exported by ``render_metrics`` on /metrics/.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from .metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+WAIT_TIME = LatencyHistogram(
+    'db_pool_wait_seconds',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool's timeout"""
+
+
+class _Waiter:
+    """A queued checkout; release() hands it a connection, or a free slot (None, None) to open one"""
+
+    __slots__ = ('event', 'item')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.item = None
+
+
+class ConnectionPool:
+    def __init__(self, name, connect, min_size=1, max_size=10, timeout=10.0,
+                 max_lifetime=1800.0, max_idle=300.0, pre_ping=True):
+        self.name = name
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.pre_ping = pre_ping
+        # (connection, opened_at, released_at); the most recently released is on the right
+        self._idle = deque()
+        self._opened_at = {}
+        self._size = 0
+        # Checkouts waiting in arrival order; a freed connection goes straight to the oldest
+        self._waiters = deque()
+        self._filled = False
+        self._lock = threading.Lock()
+        self.counters = {'checkouts': 0, 'opened': 0, 'recycled': 0, 'ping_failures': 0, 'timeouts': 0}
+
+    def acquire(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            connection, opened_at = self._checkout(deadline)
+            if connection is None:
+                connection = self._open()
+                break
+            if time.monotonic() - opened_at > self.max_lifetime:
+                self._discard(connection, 'recycled')
+                continue
+            if self.pre_ping and not self._ping(connection):
+                self._discard(connection, 'ping_failures')
+                continue
+            break
+        WAIT_TIME.observe(self.name, 'acquired', time.monotonic() - started)
+        with self._lock:
+            self.counters['checkouts'] += 1
+        if not self._filled:
+            self._fill()
+        return connection
+
+    def release(self, connection):
+        """Return a connection; it is closed instead if it is broken, too old or over MIN_SIZE and idle"""
+        try:
+            reusable = self._reset(connection)
+        except Exception:
+            reusable = False
+        opened_at = self._opened_at.get(id(connection), 0)
+        if not reusable or time.monotonic() - opened_at > self.max_lifetime:
+            self._discard(connection, 'recycled')
+            return
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            if self._waiters:
+                self._hand_off((connection, opened_at))
+                return
+            self._idle.append((connection, opened_at, now))
+            while self._idle and self._size - len(stale) > self.min_size and now - self._idle[0][2] > self.max_idle:
+                stale.append(self._idle.popleft()[0])
+        for old in stale:
+            self._discard(old, 'recycled')
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'waiting': len(self._waiters),
+                'max_size': self.max_size,
+                **self.counters,
+            }
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _, _ in idle:
+            self._discard(connection, None)
+
+    def _checkout(self, deadline):
+        """An idle (connection, opened_at), or (None, None) once the caller may open a new connection"""
+        with self._lock:
+            if self._idle:
+                connection, opened_at, _ = self._idle.pop()
+                return connection, opened_at
+            if self._size < self.max_size:
+                self._size += 1
+                return None, None
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+        if waiter.event.wait(max(deadline - time.monotonic(), 0)):
+            return waiter.item
+        with self._lock:
+            # The hand-off may have landed just after the wait gave up
+            if waiter.event.is_set():
+                return waiter.item
+            self._waiters.remove(waiter)
+            self.counters['timeouts'] += 1
+        WAIT_TIME.observe(self.name, 'timeout', self.timeout)
+        raise PoolTimeout(
+            f'No database connection available in pool {self.name!r} after {self.timeout}s ({self.max_size} in use)'
+        )
+
+    def _hand_off(self, item):
+        """Give the oldest waiter a connection or a slot; the caller holds the lock"""
+        waiter = self._waiters.popleft()
+        waiter.item = item
+        waiter.event.set()
+
+    def _free_slot(self):
+        """A connection went away; let the oldest waiter open a new one. The caller holds the lock"""
+        if self._waiters:
+            self._hand_off((None, None))
+        else:
+            self._size -= 1
+
+    def _open(self):
+        """Open a connection for a slot already reserved in _size"""
+        try:
+            connection = self._connect()
+        except BaseException:
+            with self._lock:
+                self._free_slot()
+            raise
+        with self._lock:
+            self._opened_at[id(connection)] = time.monotonic()
+            self.counters['opened'] += 1
+        return connection
+
+    def _fill(self):
+        self._filled = True
+        while True:
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                connection = self._open()
+            except Exception:
+                logger.warning('Could not pre-open connections for pool %s', self.name, exc_info=True)
+                return
+            self.release(connection)
+
+    def _discard(self, connection, counter):
+        with self._lock:
+            self._free_slot()
+            self._opened_at.pop(id(connection), None)
+            if counter:
+                self.counters[counter] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _ping(connection):
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _reset(connection):
+        """Roll back whatever the last user left open; False if the connection is unusable"""
+        if getattr(connection, 'closed', False):
+            return False
+        if hasattr(connection, 'get_transaction_status'):
+            # psycopg2: IDLE=0, ACTIVE=1, INTRANS=2, INERROR=3, UNKNOWN=4
+            status = connection.get_transaction_status()
+            if status == 4:
+                return False
+            if status != 0:
+                connection.rollback()
+        elif getattr(connection, 'in_transaction', False):
+            connection.rollback()
+        return True
+
+
+def get_pool(alias, connect, options):
+    """The pool for a database alias in this process, created on first use"""
+    key = (os.getpid(), alias)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                # A forked worker must not share its parent's sockets; drop the inherited pools
+                for stale in [k for k in _pools if k[0] != os.getpid()]:
+                    del _pools[stale]
+                pool = _pools[key] = ConnectionPool(
+                    alias,
+                    connect,
+                    min_size=int(options.get('MIN_SIZE', 1)),
+                    max_size=int(options.get('MAX_SIZE', 10)),
+                    timeout=float(options.get('TIMEOUT', 10)),
+                    max_lifetime=float(options.get('MAX_LIFETIME', 1800)),
+                    max_idle=float(options.get('MAX_IDLE', 300)),
+                    pre_ping=bool(options.get('PRE_PING', True)),
+                )
+    return pool
+
+
+def render_metrics():
+    """Pool gauges and counters plus the checkout wait histogram, Prometheus text format"""
+    lines = []
+    pools = [pool for (pid, _), pool in sorted(_pools.items()) if pid == os.getpid()]
+    if pools:
+        stats = {pool.name: pool.stats() for pool in pools}
+        for field in ('size', 'idle', 'in_use', 'waiting', 'max_size'):
+            lines.append(f'# TYPE db_pool_{field} gauge')
+            lines.extend(f'db_pool_{field}{{pool="{name}"}} {values[field]}' for name, values in stats.items())
+        for field in ('checkouts', 'opened', 'recycled', 'ping_failures', 'timeouts'):
+            lines.append(f'# TYPE db_pool_{field}_total counter')
+            lines.extend(f'db_pool_{field}_total{{pool="{name}"}} {values[field]}' for name, values in stats.items())
+    return ('\n'.join(lines) + '\n' if lines else '') + WAIT_TIME.render()
@@ -0,0 +1,151 @@
+"""Serving protected media (resumes) without tying up a Python worker.
+
+When ``PROTECTED_MEDIA_OFFLOAD`` names a front server mode, the view only
+checks permissions and answers with a header telling the server which file
+to send:
+
+* ``x-accel-redirect`` (nginx): ``PROTECTED_MEDIA_INTERNAL_URL`` + the
+  storage name, mapped to MEDIA_ROOT by an ``internal`` location, e.g.
+  ``location /protected-media/ { internal; alias /app/media/; }``;
+* ``x-sendfile`` (Apache mod_xsendfile, lighttpd): the absolute path.
+
+Without one, Django streams the file itself with ETag/Last-Modified
+validators and single byte-range support, so a 304 or a resumed download
+never re-sends what the client already has.
+
+Uploaded files are untrusted, so they always go out as attachments with
+``nosniff``, and only PDF and Word content types are ever named; anything
+else is sent as ``application/octet-stream``.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+from .streaming import StreamingFileResponse, StreamingResponse
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+CONTENT_HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+# An uploaded .html or .svg must never reach the browser as something it renders
+SAFE_CONTENT_TYPES = {
+    'application/pdf',
+    'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single byte range; None to send the whole file.
+
+    Raises ValueError when the range cannot be satisfied. Multi-range requests
+    are answered with the full file, which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def etag_for(name, stat):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if CONTENT_HASH_RE.match(stem):
+        # Content-addressed resumes (see ResumeBlob): the name is the strongest validator
+        return f'"{stem}"'
+    return f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def content_type_for(filename):
+    content_type = mimetypes.guess_type(filename)[0]
+    return content_type if content_type in SAFE_CONTENT_TYPES else 'application/octet-stream'
+
+
+def serve_protected(request, name, filename):
+    """Download response for the stored file ``name``; callers check permissions first"""
+    content_type = content_type_for(filename)
+    disposition = content_disposition_header(True, filename)
+
+    try:
+        path = default_storage.path(name)
+    except NotImplementedError:
+        # Remote storage (S3 and friends) serves its own, usually signed, URLs
+        return HttpResponseRedirect(default_storage.url(name))
+
+    offload = settings.PROTECTED_MEDIA_OFFLOAD
+    if offload == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_INTERNAL_URL + quote(name)
+    elif offload == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        response = _serve_file(request, name, path, content_type)
+    if response.status_code in (200, 206):
+        response['Content-Disposition'] = disposition
+    response['Cache-Control'] = 'private'
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+def _serve_file(request, name, path, content_type):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404('File not found')
+
+    etag = etag_for(name, stat)
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if conditional is not None:
+        conditional['ETag'] = etag
+        return conditional
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if not if_range or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+    if byte_range:
+        start, end = byte_range
+        response = StreamingResponse(read_range(path, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        # A whole-file FileResponse lets the WSGI server use wsgi.file_wrapper (sendfile)
+        response = StreamingFileResponse(open(path, 'rb'), content_type=content_type)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
@@ -1,6 +1,9 @@
 from django import forms
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.template.defaultfilters import filesizeformat
 from allauth.account.forms import SignupForm
-from .models import VolunteerApplication, JobApplication
+from .models import VolunteerApplication, JobApplication, ResumeBlob
 
 class CustomSignupForm(SignupForm):
     first_name = forms.CharField(
@@ -46,4 +49,24 @@ class JobApplicationForm(forms.ModelForm):
             'phone': forms.TextInput(attrs={'class': 'form-control'}),
             'resume': forms.FileInput(attrs={'class': 'form-control'}),
             'cover_letter': forms.Textarea(attrs={'class': 'form-control'}),
-        }
\ No newline at end of file
+        }
+
+    def clean_resume(self):
+        resume = self.cleaned_data.get('resume')
+        if isinstance(resume, UploadedFile) and resume.size > settings.RESUME_MAX_UPLOAD_SIZE:
+            raise forms.ValidationError(
+                f'File is too large. The maximum size is {filesizeformat(settings.RESUME_MAX_UPLOAD_SIZE)}.'
+            )
+        if isinstance(resume, UploadedFile) and ResumeBlob.sniff(resume) is None:
+            raise forms.ValidationError('Upload a PDF or Word document.')
+        return resume
+
+    def save(self, commit=True):
+        application = super().save(commit=False)
+        resume = self.cleaned_data.get('resume')
+        if isinstance(resume, UploadedFile):
+            # Point at the shared content-addressed copy instead of writing a new file
+            application.resume = ResumeBlob.store(resume).name
+        if commit:
+            application.save()
+        return application
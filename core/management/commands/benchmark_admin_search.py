@@ -0,0 +1,128 @@
+import random
+import re
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from core.models import Donation, Job, JobApplication
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Sneha', 'Arjun', 'Kavya', 'Rahul', 'Meera', 'Ishaan', 'Divya']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Nair', 'Singh', 'Kulkarni', 'Das', 'Menon', 'Joshi', 'Bose']
+JOB_TITLES = ['Field Coordinator', 'Accountant', 'Program Manager', 'Community Mobiliser', 'Data Analyst']
+
+# The search_fields the admin used before core.admin_search
+LEGACY_SEARCH_FIELDS = {
+    Donation: ['first_name', 'last_name', 'email', 'phone'],
+    JobApplication: ['name', 'email', 'job__title'],
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare admin search timings before and after the indexed search backend on a seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--donations', type=int, default=50000)
+        parser.add_argument('--applications', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--keep', action='store_true', help='Commit the seeded rows instead of rolling them back')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        try:
+            with transaction.atomic():
+                samples = self.seed(rng, options['donations'], options['applications'])
+                self.run(samples, options['repeat'])
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write('Seeded rows rolled back')
+
+    def seed(self, rng, donation_count, application_count):
+        self.stdout.write(f'Seeding {donation_count} donations and {application_count} applications...')
+        donations = []
+        for i in range(donation_count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            donations.append(Donation(
+                first_name=first, last_name=last,
+                email=f'{first}.{last}{i}@example.org'.lower(),
+                phone=f'9{rng.randrange(10 ** 9):09d}',
+                amount=Decimal(rng.choice([100, 500, 1000, 2500])),
+                order_id=f'order_{uuid.uuid4().hex[:14]}',
+                status=rng.choice(['completed', 'completed', 'pending', 'failed']),
+            ))
+        Donation.objects.bulk_create(donations, batch_size=2000)
+
+        jobs = [Job.objects.create(title=title, description='Benchmark', requirements='Benchmark', location='Pune',
+                                   employment_type='Full-time') for title in JOB_TITLES]
+        applications = []
+        for i in range(application_count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            applications.append(JobApplication(
+                job=rng.choice(jobs), name=f'{first} {last}',
+                email=f'{first}.{last}{i}@example.org'.lower(),
+                phone=f'8{rng.randrange(10 ** 9):09d}',
+                resume='resumes/benchmark.pdf', cover_letter='Benchmark',
+            ))
+        JobApplication.objects.bulk_create(applications, batch_size=2000)
+        Job.recount_applications([job.pk for job in jobs])
+
+        if connection.vendor in ('postgresql', 'sqlite'):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        donation, application = rng.choice(donations), rng.choice(applications)
+        return {
+            Donation: ['priya', 'shar', 'priya sharma', donation.email, donation.order_id, donation.phone, 'zzzz'],
+            JobApplication: ['rohan', 'rohan iyer', application.email, application.phone, 'field', 'zzzz'],
+        }
+
+    def run(self, samples, repeat):
+        request = RequestFactory().get('/admin/')
+        for model, terms in samples.items():
+            indexed = admin.site._registry[model]
+            legacy = type('LegacyAdmin', (admin.ModelAdmin,), {'search_fields': LEGACY_SEARCH_FIELDS[model]})(model, admin.site)
+
+            self.stdout.write(f'\n{model._meta.verbose_name_plural}')
+            self.stdout.write(f"{'term':<34} {'legacy ms':>10} {'indexed ms':>11} {'legacy rows':>12} {'indexed rows':>13}  indexes used")
+            for term in terms:
+                legacy_ms, legacy_rows = self.measure(legacy, request, model, term, repeat)
+                indexed_ms, indexed_rows = self.measure(indexed, request, model, term, repeat)
+                used = ', '.join(self.indexes_used(indexed, request, model, term)) or 'none (full scan)'
+                self.stdout.write(f'{term[:34]:<34} {legacy_ms:>10.2f} {indexed_ms:>11.2f} {legacy_rows:>12} {indexed_rows:>13}  {used}')
+
+    def measure(self, model_admin, request, model, term, repeat):
+        """Median time of what the changelist runs for a search: the count and the first page"""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset, may_have_duplicates = model_admin.get_search_results(request, model.objects.all(), term)
+            if may_have_duplicates:
+                queryset = queryset.distinct()
+            rows = queryset.count()
+            list(queryset[:100])
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000, rows
+
+    def indexes_used(self, model_admin, request, model, term):
+        """Indexes on the model's table that the plan of the indexed search names.
+
+        A lookup that no longer matches its index expression (say ``contains``
+        against the ``UPPER(col::text)`` trigram index) shows up here as a full scan.
+        """
+        queryset, _ = model_admin.get_search_results(request, model.objects.all(), term)
+        plan = queryset.explain()
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return sorted(
+            name for name, constraint in constraints.items()
+            if constraint['index'] and re.search(rf'\b{re.escape(name)}\b', plan)
+        )
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import tempfile
+import time
+
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.core.management.commands.createcachetable import Command as CreateCacheTable
+from django.db import connection, connections
+from core.cache_backend import SQLiteCache
+
+DB_TABLE = 'core_benchmark_cache'
+PAYLOAD = {'stats': list(range(50)), 'label': 'x' * 200}
+
+
+def _incr_worker(cache, key, count):
+    for _ in range(count):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The key is missing in this process (locmem is per process)
+            cache.add(key, 0)
+            cache.incr(key)
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Compare the shared SQLite cache backend with locmem and the database cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--operations', type=int, default=5000)
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--increments', type=int, default=500, help='incr() calls per process')
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp(prefix='cache-benchmark-')
+        create = CreateCacheTable()
+        create.verbosity = 0
+        create.create_table('default', DB_TABLE, dry_run=False)
+        backends = {
+            'locmem': LocMemCache('benchmark', {'OPTIONS': {'MAX_ENTRIES': 100000}}),
+            'database': DatabaseCache(DB_TABLE, {'OPTIONS': {'MAX_ENTRIES': 100000}}),
+            'sqlite': SQLiteCache(os.path.join(directory, 'cache.sqlite3'), {'OPTIONS': {'MAX_ENTRIES': 100000}}),
+        }
+        try:
+            self.stdout.write(f'Single process, {options["operations"]} operations each (microseconds per call)')
+            self.stdout.write(f'{"backend":<10}{"set":>10}{"get hit":>10}{"get miss":>10}{"incr":>10}{"get_many":>10}')
+            for name, cache in backends.items():
+                self.stdout.write(f'{name:<10}' + ''.join(f'{value:>10.1f}' for value in self.single(cache, options['operations'])))
+
+            processes, increments = options['processes'], options['increments']
+            self.stdout.write(f'\n{processes} processes x {increments} incr() on one key (expected {processes * increments})')
+            for name, cache in backends.items():
+                total, elapsed = self.shared_counter(cache, processes, increments)
+                self.stdout.write(f'{name:<10} counter={total!s:<8} {elapsed:.2f}s')
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {connection.ops.quote_name(DB_TABLE)}')
+            for path in os.listdir(directory):
+                os.remove(os.path.join(directory, path))
+            os.rmdir(directory)
+
+    def timed(self, count, call):
+        start = time.perf_counter()
+        for i in range(count):
+            call(i)
+        return (time.perf_counter() - start) / count * 1e6
+
+    def single(self, cache, count):
+        cache.clear()
+        keys = [f'bench:{i}' for i in range(count)]
+        cache.set('counter', 0)
+        return [
+            self.timed(count, lambda i: cache.set(keys[i], PAYLOAD, 300)),
+            self.timed(count, lambda i: cache.get(keys[i])),
+            self.timed(count, lambda i: cache.get(f'missing:{i}')),
+            self.timed(count, lambda i: cache.incr('counter')),
+            self.timed(count // 10, lambda i: cache.get_many(keys[i * 10:i * 10 + 10])),
+        ]
+
+    def shared_counter(self, cache, processes, increments):
+        """Increment one key from several processes; a shared, atomic backend ends at processes * increments"""
+        cache.set('shared', 0)
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_incr_worker, args=(cache, 'shared', increments)) for _ in range(processes)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return cache.get('shared'), time.perf_counter() - start
@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from core.models import Donation
+
+DONATION_FORM = {
+    'amount': '500', 'cause': 'Education', 'first_name': 'Server', 'last_name': 'Benchmark',
+    'email': 'server-benchmark@example.org', 'phone': '9999999999', 'state': 'Maharashtra',
+    'city': 'Pune', 'pin_code': '411001', 'address': 'Benchmark',
+}
+
+# name: (method, url name, form data, logged in)
+SCENARIOS = {
+    'donate': ('post', 'donate', DONATION_FORM, True),
+    'donate-page': ('get', 'donate', None, True),
+    'home': ('get', 'home', None, False),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare request throughput of the WSGI profile (N sync workers, one request each) with the ASGI '
+        'profile (one event loop, many requests in flight) in process, through the test clients '
+        '(use RAZORPAY_GATEWAY=stub)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario and mode')
+        parser.add_argument('--workers', type=int, default=4, help='Simulated sync workers for WSGI')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight on the ASGI worker')
+        parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                            help='Run only these scenarios (repeatable)')
+
+    def handle(self, *args, **options):
+        if settings.RAZORPAY_GATEWAY != 'stub':
+            raise CommandError('The donate scenario creates gateway orders; set RAZORPAY_GATEWAY=stub')
+        if options['concurrency'] > settings.RAZORPAY_MAX_CONCURRENCY:
+            self.stdout.write(self.style.WARNING(
+                f'Only RAZORPAY_MAX_CONCURRENCY={settings.RAZORPAY_MAX_CONCURRENCY} gateway calls run at once per '
+                'process; donations beyond that are refused (302). Raise it to match --concurrency.'
+            ))
+
+        user, _ = User.objects.get_or_create(username='server-benchmark', defaults={'email': DONATION_FORM['email']})
+        login = Client()
+        login.force_login(user)
+        session = login.cookies[settings.SESSION_COOKIE_NAME].value
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], SECURE_SSL_REDIRECT=False):
+                self.stdout.write(
+                    f'{options["requests"]} requests per run; WSGI: {options["workers"]} workers, '
+                    f'ASGI: 1 worker x {options["concurrency"]} in flight; gateway latency {settings.RAZORPAY_STUB_LATENCY}s'
+                )
+                self.stdout.write(f'{"scenario":<13}{"mode":<6}{"req/s":>9}{"p50 ms":>9}{"p99 ms":>9}  statuses')
+                for name in options['scenario'] or SCENARIOS:
+                    method, url_name, data, logged_in = SCENARIOS[name]
+                    cookies = {settings.SESSION_COOKIE_NAME: session} if logged_in else {}
+                    request = (method, reverse(url_name), data, cookies)
+                    self.report(name, 'wsgi', *self.run_wsgi(request, options['requests'], options['workers']))
+                    self.report(name, 'asgi', *asyncio.run(
+                        self.run_asgi(request, options['requests'], options['concurrency'])
+                    ))
+        finally:
+            login.logout()
+            Donation.objects.filter(user=user).delete()
+            user.delete()
+
+    def run_wsgi(self, request, total, workers):
+        method, path, data, cookies = request
+        issued = itertools.count()
+
+        def worker():
+            client = Client()
+            for name, value in cookies.items():
+                client.cookies[name] = value
+            results = []
+            try:
+                while next(issued) < total:
+                    started = time.perf_counter()
+                    response = getattr(client, method)(path, data)
+                    results.append((response.status_code, time.perf_counter() - started))
+            finally:
+                connections.close_all()
+            return results
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker) for _ in range(workers)]
+            results = [result for future in futures for result in future.result()]
+        return results, time.perf_counter() - started
+
+    async def run_asgi(self, request, total, concurrency):
+        method, path, data, cookies = request
+        client = AsyncClient()
+        for name, value in cookies.items():
+            client.cookies[name] = value
+        issued = itertools.count()
+        results = []
+
+        async def worker():
+            while next(issued) < total:
+                # As ASGIHandler does per request: its sync code gets a thread of its own
+                async with ThreadSensitiveContext():
+                    started = time.perf_counter()
+                    response = await getattr(client, method)(path, data)
+                    results.append((response.status_code, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return results, time.perf_counter() - started
+
+    def report(self, scenario, mode, results, elapsed):
+        latencies = sorted(latency for _, latency in results)
+        statuses = Counter(status for status, _ in results)
+        self.stdout.write(
+            f'{scenario:<13}{mode:<6}{len(results) / elapsed:>9.1f}'
+            f'{latencies[len(latencies) // 2] * 1000:>9.1f}{latencies[int(len(latencies) * 0.99) - 1] * 1000:>9.1f}  '
+            + ' '.join(f'{status}x{count}' for status, count in sorted(statuses.items()))
+        )
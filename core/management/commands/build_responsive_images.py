@@ -0,0 +1,46 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core import responsive_images as images
+
+
+class Command(BaseCommand):
+    help = 'Generate AVIF/WebP/fallback variants of core/static/images at several widths, plus their manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-encode images even if they are unchanged')
+        parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Images encoded in parallel')
+
+    def handle(self, *args, **options):
+        widths = settings.RESPONSIVE_IMAGE_WIDTHS
+        formats = images.modern_formats()
+        (images.STATIC_DIR / images.OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+
+        previous = {} if options['force'] else images.load_manifest()
+        manifest, stale = {}, {}
+        for relative in images.source_images():
+            digest = images.file_digest(images.STATIC_DIR / relative)
+            if images.is_current(previous.get(relative), digest, widths, formats):
+                manifest[relative] = previous[relative]
+            else:
+                stale[relative] = digest
+
+        with ProcessPoolExecutor(max_workers=max(options['jobs'], 1)) as pool:
+            futures = {
+                relative: pool.submit(images.build_entry, relative, digest, widths, formats)
+                for relative, digest in stale.items()
+            }
+            for relative, future in futures.items():
+                manifest[relative] = entry = future.result()
+                source_size = os.path.getsize(images.STATIC_DIR / relative)
+                smallest = min(sizes[-1][2] for sizes in entry['variants'].values())
+                self.stdout.write(f'{relative}: {source_size // 1024} KB -> {smallest // 1024} KB at the largest width')
+
+        images.write_manifest(manifest)
+        removed = images.prune_outputs(manifest)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(stale)} image(s) encoded, {len(manifest) - len(stale)} unchanged, {removed} stale file(s) removed'
+            f" (formats: {', '.join(formats) or 'fallback only'})"
+        ))
@@ -0,0 +1,107 @@
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class FakeRazorpayHandler(BaseHTTPRequestHandler):
+    """Just enough of the Razorpay orders API to exercise core.payments over HTTP"""
+
+    protocol_version = 'HTTP/1.1'
+    orders = {}
+    lock = threading.Lock()
+    latency = 0.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _simulate(self):
+        time.sleep(self.latency)
+        if random.random() < self.error_rate:
+            self._send(500, {'error': {'code': 'SERVER_ERROR', 'description': 'Simulated gateway failure'}})
+            return False
+        return True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if not self._simulate():
+            return
+        if self.path.rstrip('/') != '/v1/orders':
+            return self._send(404, {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'Not found'}})
+        data = json.loads(body or b'{}')
+        order = {
+            'id': f"order_fake{uuid.uuid4().hex[:14]}",
+            'entity': 'order',
+            'amount': data.get('amount'),
+            'currency': data.get('currency', 'INR'),
+            'receipt': data.get('receipt'),
+            'status': 'created',
+            'created_at': int(time.time()),
+        }
+        with self.lock:
+            self.orders[order['id']] = order
+        self._send(200, order)
+
+    def do_GET(self):
+        if not self._simulate():
+            return
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if parts == ['v1', 'payments']:
+            return self._send(200, {'entity': 'collection', 'count': 0, 'items': []})
+        if len(parts) >= 3 and parts[:2] == ['v1', 'orders']:
+            with self.lock:
+                order = self.orders.get(parts[2])
+            if order is None:
+                return self._send(400, {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'The id provided does not exist'}})
+            if parts[3:] == ['payments']:
+                return self._send(200, {'entity': 'collection', 'count': 0, 'items': []})
+            return self._send(200, order)
+        self._send(404, {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'Not found'}})
+
+
+class FakeRazorpayServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # A client that gave up on a slow response (a read timeout) is expected, not an error
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def make_server(port=0, latency=0.0, error_rate=0.0):
+    """A fake API server with its own settings and orders; port 0 picks a free port"""
+    handler = type('FakeRazorpayHandler', (FakeRazorpayHandler,), {
+        'orders': {}, 'lock': threading.Lock(), 'latency': latency, 'error_rate': error_rate,
+    })
+    return FakeRazorpayServer(('127.0.0.1', port), handler)
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake Razorpay HTTP API (set RAZORPAY_BASE_URL=http://127.0.0.1:<port>)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.1, help='Seconds to wait before each response')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 500')
+
+    def handle(self, *args, **options):
+        server = make_server(options['port'], options['latency'], options['error_rate'])
+        self.stdout.write(f"Fake Razorpay API on http://127.0.0.1:{options['port']} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
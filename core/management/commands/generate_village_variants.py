@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from core import thumbnails
+from core.models import ModelVillage
+
+
+class Command(BaseCommand):
+    help = 'Generate missing thumbnail/medium variants for ModelVillage images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-encode variants even if they already exist')
+        parser.add_argument('--jobs', type=int, default=2, help='Images processed in parallel')
+
+    def handle(self, *args, **options):
+        villages = ModelVillage.objects.exclude(image='')
+
+        def process(village):
+            try:
+                return thumbnails.generate(village, force=options['force']), None
+            except Exception as exc:
+                return False, f'{village.pk} ({village.image.name}): {exc}'
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=max(options['jobs'], 1)) as pool:
+            results = list(pool.map(process, villages))
+
+        for _, error in results:
+            if error:
+                self.stderr.write(f'Failed {error}')
+        updated = sum(1 for changed, _ in results if changed)
+        failed = sum(1 for _, error in results if error)
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} of {len(results)} village image(s), {failed} failed'))
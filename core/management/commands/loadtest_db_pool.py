@@ -0,0 +1,50 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from core import db_pool
+
+
+class Command(BaseCommand):
+    help = 'Run short "requests" from many threads through the pooled database engine and report pool waits (DB_POOL=true)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--queries', type=int, default=3, help='Queries per request')
+        parser.add_argument('--hold', type=float, default=0.002, help='Seconds each request keeps its connection')
+
+    def handle(self, *args, **options):
+        if 'POOL' not in settings.DATABASES['default']:
+            raise CommandError('The default database is not pooled; set DB_POOL=true')
+
+        def one_request(_):
+            started = time.perf_counter()
+            try:
+                with connection.cursor() as cursor:
+                    for _ in range(options['queries']):
+                        cursor.execute('SELECT 1')
+                        cursor.fetchone()
+                time.sleep(options['hold'])
+                outcome = 'ok'
+            except OperationalError:
+                outcome = 'error'
+            finally:
+                # What request_finished does with CONN_MAX_AGE=0: hand the connection back
+                connection.close()
+            return outcome, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+            results = list(pool.map(one_request, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for _, latency in results)
+        for outcome in ('ok', 'error'):
+            self.stdout.write(f"{outcome:>8}: {sum(1 for o, _ in results if o == outcome)}")
+        self.stdout.write(f"     p50: {latencies[len(latencies) // 2] * 1000:.1f} ms")
+        self.stdout.write(f"     p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+        self.stdout.write(f"    pool: {db_pool.get_pool('default', None, {}).stats()}")
+        self.stdout.write(self.style.SUCCESS(f"{len(results) / elapsed:.1f} requests/s over {elapsed:.2f}s"))
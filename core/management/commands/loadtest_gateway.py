@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from core import payments
+
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+
+class Command(BaseCommand):
+    help = (
+        'Fire concurrent order creations at the payment gateway and report latency '
+        '(use RAZORPAY_GATEWAY=stub, or --base-url pointing at manage.py fake_razorpay_server)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--timeout', type=float, default=None)
+        parser.add_argument('--base-url', help='Gateway API to call instead of RAZORPAY_BASE_URL')
+        parser.add_argument('--allow-live', action='store_true', help='Allow running against the real Razorpay API')
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'] or settings.RAZORPAY_BASE_URL
+        local = urlsplit(base_url).hostname in LOCAL_HOSTS
+        if settings.RAZORPAY_GATEWAY != 'stub' and not local and not options['allow_live']:
+            raise CommandError(
+                'Refusing to load-test the live gateway; set RAZORPAY_GATEWAY=stub, '
+                'pass a localhost --base-url or pass --allow-live'
+            )
+        with override_settings(RAZORPAY_BASE_URL=base_url):
+            # The process-wide client is rebuilt against the chosen base URL, and again afterwards
+            payments._client = None
+            try:
+                self.run(options)
+            finally:
+                payments._client = None
+
+    def run(self, options):
+        def one_call(_):
+            started = time.perf_counter()
+            try:
+                payments.create_order({'amount': 50000, 'currency': 'INR', 'payment_capture': 1}, timeout=options['timeout'])
+                outcome = 'ok'
+            except payments.GatewayBusy:
+                outcome = 'busy'
+            except payments.GatewayTimeout:
+                outcome = 'timeout'
+            except payments.GatewayError:
+                outcome = 'error'
+            return outcome, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(one_call, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for _, latency in results)
+        for outcome in ('ok', 'busy', 'timeout', 'error'):
+            self.stdout.write(f"{outcome:>8}: {sum(1 for o, _ in results if o == outcome)}")
+        self.stdout.write(f"     p50: {latencies[len(latencies) // 2] * 1000:.1f} ms")
+        self.stdout.write(f"     p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"{len(results) / elapsed:.1f} calls/s over {elapsed:.2f}s"))
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from core.models import Job
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Count database queries per authenticated request for each SESSION_MODE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Requests per view and mode')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, repeat):
+        user = User.objects.create_user('session-benchmark', 'session-benchmark@example.org', is_staff=True)
+        job = Job.objects.create(title='Benchmark', description='Benchmark', requirements='Benchmark', location='Pune')
+        urls = [
+            reverse(name, args=args) for name, args in [
+                ('home', ()), ('what_we_do', ()), ('donate', ()), ('volunteer', ()), ('jobs', ()),
+                ('job_detail', (job.pk,)), ('admin_dashboard', ()), ('manage_volunteers', ()),
+                ('manage_jobs', ()), ('manage_applications', (job.pk,)), ('donation_reports', ()),
+            ]
+        ]
+        modes = list(settings.SESSION_ENGINES)
+        results = {}
+        for mode in modes:
+            with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[mode],
+                                   ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], SECURE_SSL_REDIRECT=False):
+                client = Client()
+                client.force_login(user)
+                for url in urls:
+                    client.get(url)  # warm the session cache and any per-view caches
+                for url in urls:
+                    with CaptureQueriesContext(connection) as queries:
+                        for _ in range(repeat):
+                            client.get(url)
+                    session = [query for query in queries if 'django_session' in query['sql']]
+                    results[mode, url] = (len(queries) / repeat, len(session) / repeat)
+                client.logout()
+
+        self.stdout.write('Queries per request: total / django_session')
+        self.stdout.write(f'{"view":<42}' + ''.join(f'{mode:>18}' for mode in modes))
+        for url in urls:
+            self.stdout.write(f'{url:<42}' + ''.join(
+                f'{results[mode, url][0]:>11.1f} / {results[mode, url][1]:<3.1f}' for mode in modes
+            ))
+        for mode in modes:
+            total = sum(results[mode, url][0] for url in urls) / len(urls)
+            session = sum(results[mode, url][1] for url in urls) / len(urls)
+            self.stdout.write(f'{mode}: {total:.2f} queries per request on average, {session:.2f} for the session')
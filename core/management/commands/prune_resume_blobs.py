@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.utils import timezone
+from core.models import JobApplication, ResumeBlob
+
+
+class Command(BaseCommand):
+    help = 'Recount resume references and delete stored resumes no application uses any more'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-minutes', type=int, default=60,
+                            help='Keep unreferenced blobs this young; their application may still be saving')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        references = JobApplication.objects.filter(resume=OuterRef('name')).order_by().values('resume').annotate(
+            total=Count('pk')
+        ).values('total')
+        fixed = 0
+        for blob in ResumeBlob.objects.annotate(actual=Subquery(references)).iterator():
+            actual = blob.actual or 0
+            if blob.ref_count != actual and not options['dry_run']:
+                ResumeBlob.objects.filter(pk=blob.pk).update(ref_count=actual)
+                fixed += 1
+
+        cutoff = timezone.now() - timedelta(minutes=options['grace_minutes'])
+        removed = 0
+        for blob in ResumeBlob.objects.filter(ref_count=0, created_at__lt=cutoff).iterator():
+            if options['dry_run']:
+                self.stdout.write(f'Would delete {blob.name}')
+                continue
+            with transaction.atomic():
+                # Re-check under the row lock: an application may have been saved since the recount
+                locked = ResumeBlob.objects.select_for_update().filter(pk=blob.pk, ref_count=0).first()
+                if locked is None or JobApplication.objects.filter(resume=locked.name).exists():
+                    continue
+                locked.delete()
+                transaction.on_commit(lambda name=locked.name: default_storage.delete(name))
+            removed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Fixed {fixed} reference count(s), deleted {removed} unused resume(s)'))
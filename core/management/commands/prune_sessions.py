@@ -0,0 +1,41 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions from the database in small batches, and expired entries from the shared cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--loop', action='store_true', help='Keep running instead of exiting after one pass')
+        parser.add_argument('--interval', type=float, default=3600, help='Seconds between passes with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            removed = self.prune(options['batch_size'])
+            self.stdout.write(f'Deleted {removed} expired session(s)')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def prune(self, batch_size):
+        """Unlike clearsessions' single DELETE, short batches never hold a long lock on django_session"""
+        now = timezone.now()
+        removed = 0
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now).values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+            removed += Session.objects.filter(session_key__in=keys).delete()[0]
+
+        # cached_db sessions live in the cache too; core.cache_backend can drop its expired rows now
+        cache = caches['default']
+        if hasattr(cache, 'cull'):
+            cache.cull()
+        return removed
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from core.models import Donation, DonationDailyRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily donation rollups from completed donations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only rebuild days on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        donations = Donation.objects.filter(status='completed')
+        rollups = DonationDailyRollup.objects.all()
+        if options['since']:
+            try:
+                since = datetime.strptime(options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+            donations = donations.filter(created_at__date__gte=since)
+            rollups = rollups.filter(day__gte=since)
+
+        # TruncDate uses the active time zone, matching timezone.localdate() in DonationDailyRollup.record
+        rows = donations.annotate(
+            day=TruncDate('created_at', tzinfo=timezone.get_current_timezone())
+        ).values('day', 'cause').annotate(
+            donation_count=Count('id'),
+            total_amount=Sum('amount'),
+            min_amount=Min('amount'),
+            max_amount=Max('amount'),
+        ).order_by()
+
+        entries = [DonationDailyRollup(**row) for row in rows.iterator(chunk_size=options['batch_size'])]
+
+        with transaction.atomic():
+            rollups.delete()
+            DonationDailyRollup.objects.bulk_create(entries, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(entries)} daily rollup rows'))
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q, Sum
+from core.models import Donation, DonorLeaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the top donors leaderboard from completed donations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            # Hold off DonorLeaderboard.record() until the rebuild commits: a donation completed
+            # while the totals are being summed would otherwise be lost when the table is replaced
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LOCK TABLE {DonorLeaderboard._meta.db_table} IN EXCLUSIVE MODE')
+            # On SQLite this first write takes the database's write lock for the whole transaction
+            DonorLeaderboard.objects.all().delete()
+            entries = self.aggregate(batch_size)
+            DonorLeaderboard.objects.bulk_create(entries, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt leaderboard with {len(entries)} donors'))
+
+    def aggregate(self, batch_size):
+        """Leaderboard rows summed from completed donations"""
+        totals = {}
+
+        # Group by email in the database, then bucket the anonymous rows in Python
+        completed = Donation.objects.filter(status='completed')
+        for row in completed.exclude(email='').values('email').annotate(
+            total=Sum('amount'), count=Count('id'), latest_id=Max('id'),
+            anonymous=Count('id', filter=Q(show_name=False)),
+        ).iterator(chunk_size=batch_size):
+            key = row['email'].strip().lower()
+            entry = totals.setdefault(key, {'total': 0, 'count': 0, 'latest_id': 0, 'anonymous': 0})
+            entry['total'] += row['total']
+            entry['count'] += row['count']
+            entry['anonymous'] += row['anonymous']
+            entry['latest_id'] = max(entry['latest_id'], row['latest_id'])
+
+        for donation in completed.filter(email='').only('id', 'user_id', 'amount', 'show_name').iterator(chunk_size=batch_size):
+            key = DonorLeaderboard.key_for(donation)
+            entry = totals.setdefault(key, {'total': 0, 'count': 0, 'latest_id': 0, 'anonymous': 0})
+            entry['total'] += donation.amount
+            entry['count'] += 1
+            entry['anonymous'] += not donation.show_name
+            entry['latest_id'] = max(entry['latest_id'], donation.id)
+
+        # Names come from each donor's most recent donation; any anonymous donation keeps the row anonymous
+        latest = Donation.objects.only(
+            'id', 'user_id', 'first_name', 'last_name'
+        ).in_bulk([entry['latest_id'] for entry in totals.values()])
+
+        entries = []
+        for key, entry in totals.items():
+            donation = latest[entry['latest_id']]
+            entries.append(DonorLeaderboard(
+                donor_key=key,
+                user_id=donation.user_id,
+                first_name=donation.first_name,
+                last_name=donation.last_name,
+                show_name=not entry['anonymous'],
+                total_amount=entry['total'],
+                donation_count=entry['count'],
+            ))
+        return entries
@@ -0,0 +1,153 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from core import payments
+from core.models import Donation
+
+PAGE_SIZE = 100
+# Which payment decides an order when it has several attempts
+RANK = {'captured': 2, 'failed': 1}
+
+
+class Command(BaseCommand):
+    help = (
+        'Settle pending donations from Razorpay payment records in batches, and cancel stale ones '
+        'whose order shows no payment attempt'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=15, help='Only touch donations pending for at least this many minutes')
+        parser.add_argument('--expire-after', type=int, default=24,
+                            help='Check the order of donations still pending after this many hours, cancelling it if it has no payment attempt')
+        parser.add_argument('--lookback-days', type=int, default=7, help='Never page through payments older than this')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(minutes=options['older_than'])
+        pending = Donation.objects.filter(status='pending', created_at__lte=cutoff).exclude(order_id='')
+
+        oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+        if oldest is None:
+            self.stdout.write('No pending donations to reconcile')
+            return
+
+        # One stale pending row must not make the command page through years of payments
+        since = max(oldest, now - timedelta(days=options['lookback_days']))
+        totals = {'completed': 0, 'failed': 0, 'cancelled': 0}
+        # id -> status given in this run; a dry run reads it back instead of the database
+        settled = {}
+        try:
+            for items in self.payment_pages(since, now):
+                self.settle_page(items, cutoff, totals, settled, options['dry_run'])
+            self.expire(pending, now - timedelta(hours=options['expire_after']), cutoff, totals, settled, options)
+        except payments.GatewayError as e:
+            raise CommandError(f'Could not fetch payments (donations already checked are settled): {e}')
+
+        prefix = 'Would settle' if options['dry_run'] else 'Settled'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}: {totals['completed']} completed, {totals['failed']} failed, {totals['cancelled']} cancelled"
+        ))
+
+    def payment_pages(self, since, until):
+        """Razorpay payments created in the window, one page at a time, newest first.
+
+        Each page ends at the oldest payment of the one before (``to``) rather than
+        at a growing ``skip``, so payments that show up during the run cannot
+        shift later pages and make the command miss one.
+        """
+        since, to, skip, seen = int(since.timestamp()) - 60, int(until.timestamp()), 0, set()
+        while True:
+            items = payments.list_payments(since, to, count=PAGE_SIZE, skip=skip).get('items', [])
+            # The boundary second is read again, so drop what the last page already had
+            fresh = [payment for payment in items if payment.get('id') not in seen]
+            seen.update(payment.get('id') for payment in items)
+            if fresh:
+                yield fresh
+            if len(items) < PAGE_SIZE:
+                return
+            oldest = min(payment['created_at'] for payment in items)
+            if oldest < to:
+                to, skip = oldest, 0
+            else:
+                # A full page of payments from one second
+                skip += len(items)
+
+    def settle_page(self, items, cutoff, totals, settled, dry_run):
+        by_order = {}
+        for payment in items:
+            order_id = payment.get('order_id')
+            if not order_id or not payment.get('id') or payment.get('status') not in RANK:
+                continue
+            current = by_order.get(order_id)
+            if current is None or RANK[payment['status']] > RANK[current['status']]:
+                by_order[order_id] = payment
+        if not by_order:
+            return
+
+        with transaction.atomic():
+            # Re-check the status under lock so a concurrent webhook is never overwritten. Failed
+            # donations are included because a capture on an older page outranks a newer failure
+            donations = Donation.objects.select_for_update().filter(
+                order_id__in=by_order, created_at__lte=cutoff, status__in=('pending', 'failed'),
+            )
+            changed = []
+            completed = []
+            for donation in donations:
+                status = settled.get(donation.id, donation.status) if dry_run else donation.status
+                payment = by_order[donation.order_id]
+                if payment['status'] == 'captured' and status != 'completed':
+                    donation.status = 'completed'
+                    completed.append(donation)
+                elif payment['status'] == 'failed' and status == 'pending':
+                    donation.status = 'failed'
+                else:
+                    continue
+                if donation.id in settled:
+                    totals[settled[donation.id]] -= 1
+                settled[donation.id] = donation.status
+                totals[donation.status] += 1
+                donation.payment_id = payment['id']
+                donation.updated_at = timezone.now()
+                changed.append(donation)
+
+            if dry_run or not changed:
+                return
+            Donation.objects.bulk_update(changed, ['status', 'payment_id', 'updated_at'])
+            for donation in completed:
+                donation.record_completion()
+
+    def expire(self, pending, expire_before, cutoff, totals, settled, options):
+        """Check each donation still pending after --expire-after hours against its order.
+
+        The window above only holds captured and failed payments from the last
+        --lookback-days, so an order with no match there may still have been paid.
+        Only an order whose own payment list is empty is cancelled; attempts in
+        other states (authorized, created) leave the donation pending.
+        """
+        stale = pending.filter(created_at__lt=expire_before).order_by('id').values_list('id', 'order_id')
+        last_id = 0
+        while True:
+            # Keyset batches instead of one open cursor over rows that are being updated
+            rows = list(stale.filter(id__gt=last_id)[:options['batch_size']])
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            unpaid = []
+            for donation_id, order_id in rows:
+                if donation_id in settled:
+                    continue
+                attempts = payments.order_payments(order_id).get('items', [])
+                if attempts:
+                    self.settle_page(attempts, cutoff, totals, settled, options['dry_run'])
+                else:
+                    unpaid.append(donation_id)
+            if options['dry_run']:
+                totals['cancelled'] += len(unpaid)
+            else:
+                totals['cancelled'] += Donation.objects.filter(id__in=unpaid, status='pending').update(
+                    status='cancelled', updated_at=timezone.now()
+                )
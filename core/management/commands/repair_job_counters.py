@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from core.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized per-job application counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', type=int, help='Only repair these jobs')
+
+    def handle(self, *args, **options):
+        fixed = Job.recount_applications(options['job_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Repaired counters on {fixed} job(s)'))
@@ -0,0 +1,99 @@
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from core.models import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox over a single SMTP connection per batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the outbox is empty')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.drain(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, deferred {failed}')
+            if not options['loop']:
+                break
+            if not (sent or failed):
+                time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        """Send every due message, batch by batch. Returns (sent, failed)"""
+        sent = failed = 0
+        while True:
+            batch = self.claim(batch_size)
+            if not batch:
+                return sent, failed
+            batch_sent, batch_failed = self.deliver(batch)
+            sent += batch_sent
+            failed += batch_failed
+
+    def claim(self, batch_size):
+        """Lease a batch of due messages so a concurrent worker will not pick them up"""
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'id')[:batch_size]
+            )
+            # If this worker dies mid-batch the lease expires and the messages are retried
+            lease = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+            EmailOutbox.objects.filter(id__in=[message.id for message in batch]).update(next_attempt_at=lease)
+        return batch
+
+    def deliver(self, batch):
+        sent = failed = 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            for message in batch:
+                self.defer(message, e)
+            return 0, len(batch)
+
+        try:
+            for message in batch:
+                try:
+                    EmailMessage(
+                        message.subject,
+                        message.body,
+                        message.from_email or settings.DEFAULT_FROM_EMAIL,
+                        message.recipients,
+                        connection=connection,
+                    ).send()
+                except Exception as e:
+                    self.defer(message, e)
+                    failed += 1
+                else:
+                    EmailOutbox.objects.filter(id=message.id).update(
+                        status='sent', sent_at=timezone.now(), attempts=message.attempts + 1, last_error=''
+                    )
+                    sent += 1
+        finally:
+            connection.close()
+        return sent, failed
+
+    def defer(self, message, error):
+        attempts = message.attempts + 1
+        if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            status, next_attempt_at = 'failed', timezone.now()
+            self.stderr.write(f'Giving up on outbox message {message.id}: {error}')
+        else:
+            # Exponential backoff with jitter, capped
+            delay = min(settings.EMAIL_OUTBOX_BACKOFF * 2 ** (attempts - 1), settings.EMAIL_OUTBOX_MAX_BACKOFF)
+            status, next_attempt_at = 'pending', timezone.now() + timedelta(seconds=delay * random.uniform(0.5, 1.0))
+        EmailOutbox.objects.filter(id=message.id).update(
+            status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error)[:2000]
+        )
@@ -0,0 +1,84 @@
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from core import assets
+
+
+class Command(BaseCommand):
+    help = 'Download the pinned front-end libraries and build vendor/site.css and vendor/site.js, or --check the committed bundle'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Verify the committed bundle against vendor.lock.json without downloading anything')
+        parser.add_argument('--update-lock', action='store_true',
+                            help='Accept upstream bytes that differ from vendor.lock.json (or pin them the first time)')
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        lock = assets.load_lock()
+        if options['check']:
+            self.verify(lock)
+            return
+        if lock is None and not options['update_lock']:
+            raise CommandError(f'No {assets.LOCK_NAME} to verify downloads against; rerun with --update-lock to pin them')
+        pinned = {} if options['update_lock'] else lock['sources']
+
+        session = requests.Session()
+        session.headers.update(assets.FETCH_HEADERS)
+        sources = {}
+
+        def fetch(url):
+            try:
+                response = session.get(url, timeout=options['timeout'])
+                response.raise_for_status()
+            except requests.RequestException as exc:
+                raise CommandError(f'Could not download {url}: {exc}')
+            content_digest = assets.digest(response.content)
+            if url in pinned and pinned[url] != content_digest:
+                raise CommandError(f'{url} changed upstream; rerun with --update-lock after reviewing it')
+            if pinned and url not in pinned:
+                raise CommandError(f'{url} is not in {assets.LOCK_NAME}; rerun with --update-lock after reviewing it')
+            sources[url] = content_digest
+            return response.content
+
+        css_parts, fonts = [], {}
+        for url in assets.CSS_SOURCES:
+            css, found = assets.rewrite_css(assets.strip_source_maps(fetch(url).decode('utf-8')), url)
+            fonts.update(found)
+            css_parts.append(f'/* {url} */\n{css}\n')
+        js_parts = [f'/* {url} */\n{assets.strip_source_maps(fetch(url).decode("utf-8"))}\n;\n' for url in assets.JS_SOURCES]
+
+        vendor_dir = assets.STATIC_DIR / assets.VENDOR_DIR
+        fonts_dir = vendor_dir / 'fonts'
+        fonts_dir.mkdir(parents=True, exist_ok=True)
+        for url, name in fonts.items():
+            (fonts_dir / name).write_bytes(fetch(url))
+        stale = [path for path in fonts_dir.iterdir() if path.name not in set(fonts.values())]
+        for path in stale:
+            path.unlink()
+
+        (assets.STATIC_DIR / assets.BUNDLE_CSS).write_text(''.join(css_parts), encoding='utf-8')
+        (assets.STATIC_DIR / assets.BUNDLE_JS).write_text(''.join(js_parts), encoding='utf-8')
+        assets.write_lock({'sources': sources, 'files': assets.bundle_files()})
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Built {assets.BUNDLE_CSS} and {assets.BUNDLE_JS} with {len(fonts)} font file(s)'
+            f' ({len(stale)} stale removed); commit core/static/{assets.VENDOR_DIR}/'
+        ))
+
+    def verify(self, lock):
+        actual = assets.bundle_files()
+        if lock is None:
+            if actual:
+                raise CommandError(f'core/static/{assets.VENDOR_DIR}/ has files but no {assets.LOCK_NAME}')
+            # Nothing committed yet: the template tags keep serving the CDN links
+            self.stdout.write(self.style.WARNING(
+                f'No vendor bundle committed; pages load the CDN assets. Run `manage.py vendor_assets --update-lock` '
+                f'once with network access and commit core/static/{assets.VENDOR_DIR}/'
+            ))
+            return
+        problems = [f'missing {path}' for path in lock['files'] if path not in actual]
+        problems += [f'modified {path}' for path, sha in lock['files'].items() if path in actual and actual[path] != sha]
+        problems += [f'not in the lock: {path}' for path in actual if path not in lock['files']]
+        if problems:
+            raise CommandError('Vendor bundle does not match ' + assets.LOCK_NAME + ': ' + '; '.join(problems))
+        self.stdout.write(self.style.SUCCESS(f'Vendor bundle matches {assets.LOCK_NAME} ({len(actual)} file(s))'))
@@ -0,0 +1,41 @@
+"""Small in-process metrics rendered in the Prometheus text format by /metrics/"""
+import bisect
+import threading
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram per (operation, outcome), Prometheus style"""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, buckets=None):
+        self.name = name
+        self.buckets = buckets or self.BUCKETS
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, operation, outcome, seconds):
+        with self._lock:
+            series = self._series.setdefault(
+                (operation, outcome), {'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0}
+            )
+            index = bisect.bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):
+                series['buckets'][index] += 1
+            series['count'] += 1
+            series['sum'] += seconds
+
+    def render(self):
+        """Return the histogram in the Prometheus text exposition format"""
+        lines = [f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for (operation, outcome), series in sorted(self._series.items()):
+                labels = f'operation="{operation}",outcome="{outcome}"'
+                running = 0
+                for bound, count in zip(self.buckets, series['buckets']):
+                    running += count
+                    lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {running}')
+                lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series["count"]}')
+                lines.append(f'{self.name}_sum{{{labels}}} {series["sum"]:.6f}')
+                lines.append(f'{self.name}_count{{{labels}}} {series["count"]}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,41 @@
+"""Middleware that runs natively under both WSGI and ASGI.
+
+WhiteNoise 6's middleware is sync-only. One sync middleware at the top of the
+stack makes Django run every request under ASGI through a thread, even
+requests for async views. ``AsyncWhiteNoiseMiddleware`` serves the same files
+in both modes. Under ASGI, the file body is read in a worker thread, one
+batch at a time, instead of all at once.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .streaming import athreaded
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        response = self.serve(static_file, request)
+        if response.streaming:
+            # The opened file stays registered with the response, which closes it when done
+            response.streaming_content = athreaded(response.streaming_content, thread_sensitive=False)
+        return response
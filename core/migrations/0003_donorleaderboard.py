@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0002_remove_donation_donor_email_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonorLeaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('donor_key', models.CharField(max_length=254, unique=True)),
+                ('first_name', models.CharField(default='', max_length=100)),
+                ('last_name', models.CharField(default='', max_length=100)),
+                ('show_name', models.BooleanField(default=True)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('donation_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-total_amount'],
+                'indexes': [models.Index(fields=['-total_amount', 'id'], name='leaderboard_total_idx')],
+            },
+        ),
+    ]
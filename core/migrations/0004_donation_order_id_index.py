@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_donorleaderboard'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='donation',
+            name='order_id',
+            field=models.CharField(blank=True, db_index=True, max_length=200),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_donation_order_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('cause', models.CharField(choices=[('education', 'Education'), ('healthcare', 'Healthcare'), ('environment', 'Environment'), ('poverty', 'Poverty Alleviation'), ('women_empowerment', 'Women Empowerment'), ('general', 'General Fund')], max_length=50)),
+                ('donation_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('min_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-day', 'cause'],
+                'unique_together': {('day', 'cause')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_donationdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='donation_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-created_at', '-id'], name='job_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-created_at', '-id'], name='jobapp_job_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerapplication',
+            index=models.Index(fields=['-created_at', '-id'], name='volunteer_created_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:51
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    Job = apps.get_model('core', 'Job')
+    JobApplication = apps.get_model('core', 'JobApplication')
+    statuses = ['pending', 'reviewed', 'shortlisted', 'rejected']
+    counts = JobApplication.objects.values('job_id').annotate(
+        total=models.Count('id'),
+        **{status: models.Count('id', filter=models.Q(status=status)) for status in statuses},
+    ).order_by()
+    for row in counts:
+        Job.objects.filter(pk=row['job_id']).update(
+            application_count=row['total'],
+            **{f'{status}_count': row[status] for status in statuses},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='reviewed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='shortlisted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
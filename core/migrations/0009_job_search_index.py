@@ -0,0 +1,75 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE core_job ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(requirements, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX core_job_search_vector_gin ON core_job USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS core_job_search_vector_gin",
+    "ALTER TABLE core_job DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_job_fts USING fts5(
+        title, description, requirements, location,
+        content='core_job', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_job_fts_insert AFTER INSERT ON core_job BEGIN
+        INSERT INTO core_job_fts(rowid, title, description, requirements, location)
+        VALUES (new.id, new.title, new.description, new.requirements, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER core_job_fts_delete AFTER DELETE ON core_job BEGIN
+        INSERT INTO core_job_fts(core_job_fts, rowid, title, description, requirements, location)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER core_job_fts_update AFTER UPDATE OF title, description, requirements, location ON core_job BEGIN
+        INSERT INTO core_job_fts(core_job_fts, rowid, title, description, requirements, location)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements, old.location);
+        INSERT INTO core_job_fts(rowid, title, description, requirements, location)
+        VALUES (new.id, new.title, new.description, new.requirements, new.location);
+    END
+    """,
+    "INSERT INTO core_job_fts(core_job_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_job_fts_update",
+    "DROP TRIGGER IF EXISTS core_job_fts_delete",
+    "DROP TRIGGER IF EXISTS core_job_fts_insert",
+    "DROP TABLE IF EXISTS core_job_fts",
+]
+
+
+def run(statements_by_vendor):
+    def apply(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return apply
+
+
+class Migration(migrations.Migration):
+    """Database-maintained full-text index over jobs, used by core.search"""
+
+    dependencies = [
+        ('core', '0008_job_application_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:54
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+# Substring search on PostgreSQL. The expressions match what icontains emits
+TRIGRAM_INDEXES = {
+    'core_donation_search_trgm': ('core_donation', ['first_name', 'last_name', 'email', 'phone']),
+    'core_jobapplication_search_trgm': ('core_jobapplication', ['name', 'email', 'phone']),
+    'core_job_title_trgm': ('core_job', ['title']),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, (table, columns) in TRIGRAM_INDEXES.items():
+        expressions = ', '.join(f'UPPER({column}::text) gin_trgm_ops' for column in columns)
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING GIN ({expressions})')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='donation_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(django.db.models.functions.text.Lower('first_name'), name='donation_first_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(django.db.models.functions.text.Lower('last_name'), name='donation_last_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['phone'], name='donation_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['payment_id'], name='donation_payment_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='job_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='jobapp_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='jobapp_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['phone'], name='jobapp_phone_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_resumeblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelvillage',
+            name='image_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='modelvillage',
+            name='image_medium',
+            field=models.ImageField(blank=True, editable=False, upload_to='villages/variants/'),
+        ),
+        migrations.AddField(
+            model_name='modelvillage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='villages/variants/'),
+        ),
+    ]
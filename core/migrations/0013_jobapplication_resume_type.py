@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:59
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_village_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='resume',
+            field=models.FileField(upload_to='resumes/', validators=[django.core.validators.FileExtensionValidator(['pdf', 'doc', 'docx'])]),
+        ),
+    ]
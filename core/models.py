@@ -1,4 +1,11 @@
-from django.db import models
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.validators import FileExtensionValidator
+from django.db import models, transaction
+from django.db.models.functions import Greatest, Lower
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 class UserProfile(models.Model):
@@ -56,7 +63,7 @@ class Donation(models.Model):
     
     # Payment Information
     payment_id = models.CharField(max_length=200, blank=True)
-    order_id = models.CharField(max_length=200, blank=True)
+    order_id = models.CharField(max_length=200, blank=True, db_index=True)
     signature = models.CharField(max_length=500, blank=True)
     status = models.CharField(max_length=20, choices=PAYMENT_STATUS, default='pending')
     
@@ -69,6 +76,15 @@ class Donation(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at', '-id'], name='donation_status_created_idx'),
+            # Admin search (see core.admin_search)
+            models.Index(Lower('email'), name='donation_email_lower_idx'),
+            models.Index(Lower('first_name'), name='donation_first_name_lower_idx'),
+            models.Index(Lower('last_name'), name='donation_last_name_lower_idx'),
+            models.Index(fields=['phone'], name='donation_phone_idx'),
+            models.Index(fields=['payment_id'], name='donation_payment_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - ₹{self.amount}"
@@ -79,6 +95,112 @@ class Donation(models.Model):
             return f"{self.first_name} {self.last_name}"
         return "Anonymous Donor"
 
+    @classmethod
+    def complete(cls, order_id, payment_id, signature=''):
+        """Mark the donation for an order as completed. Safe to call repeatedly.
+
+        Returns (donation, newly_completed); raises DoesNotExist for unknown orders.
+        """
+        with transaction.atomic():
+            donation = cls.objects.select_for_update().get(order_id=order_id)
+            if donation.status == 'completed':
+                return donation, False
+            donation.payment_id = payment_id
+            if signature:
+                donation.signature = signature
+            donation.status = 'completed'
+            donation.save(update_fields=['payment_id', 'signature', 'status', 'updated_at'])
+            donation.record_completion()
+        return donation, True
+
+    def record_completion(self):
+        """Update the aggregates that track completed donations. Call inside a transaction."""
+        DonorLeaderboard.record(self)
+        DonationDailyRollup.record(self)
+
+class DonorLeaderboard(models.Model):
+    """Running total of completed donations per donor, used for the top donors list"""
+    donor_key = models.CharField(max_length=254, unique=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    first_name = models.CharField(max_length=100, default='')
+    last_name = models.CharField(max_length=100, default='')
+    show_name = models.BooleanField(default=True)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    donation_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-total_amount']
+        indexes = [
+            models.Index(fields=['-total_amount', 'id'], name='leaderboard_total_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.donor_key} - ₹{self.total_amount}"
+
+    @staticmethod
+    def key_for(donation):
+        """Donors are grouped by email, falling back to the user account"""
+        if donation.email:
+            return donation.email.strip().lower()
+        if donation.user_id:
+            return f"user:{donation.user_id}"
+        return f"donation:{donation.pk}"
+
+    @classmethod
+    def record(cls, donation):
+        """Add a newly completed donation to its donor's total. Call inside a transaction."""
+        entry, created = cls.objects.select_for_update().get_or_create(
+            donor_key=cls.key_for(donation),
+            defaults={'user': donation.user, 'show_name': donation.show_name},
+        )
+        entry.user = donation.user or entry.user
+        entry.first_name = donation.first_name
+        entry.last_name = donation.last_name
+        # The total includes every donation, so one anonymous gift keeps the whole row anonymous
+        entry.show_name = entry.show_name and donation.show_name
+        entry.total_amount = models.F('total_amount') + donation.amount
+        entry.donation_count = models.F('donation_count') + 1
+        entry.save()
+        return entry
+
+    def get_display_name(self):
+        """Return display name based on privacy settings"""
+        if self.show_name:
+            return f"{self.first_name} {self.last_name}"
+        return "Anonymous Donor"
+
+class DonationDailyRollup(models.Model):
+    """Completed donation totals per local day and cause, used by the dashboard and reports"""
+    day = models.DateField()
+    cause = models.CharField(max_length=50, choices=Donation.CAUSES)
+    donation_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    min_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day', 'cause']
+        unique_together = ['day', 'cause']
+
+    def __str__(self):
+        return f"{self.day} {self.cause} - ₹{self.total_amount}"
+
+    @classmethod
+    def record(cls, donation):
+        """Add a newly completed donation to its day's totals. Call inside a transaction."""
+        entry, created = cls.objects.select_for_update().get_or_create(
+            day=timezone.localdate(donation.created_at),
+            cause=donation.cause,
+        )
+        entry.min_amount = donation.amount if entry.min_amount is None else min(entry.min_amount, donation.amount)
+        entry.max_amount = donation.amount if entry.max_amount is None else max(entry.max_amount, donation.amount)
+        entry.total_amount = models.F('total_amount') + donation.amount
+        entry.donation_count = models.F('donation_count') + 1
+        entry.save()
+        return entry
+
 class VolunteerApplication(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -109,6 +231,9 @@ class VolunteerApplication(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='volunteer_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.area_of_interest}"
@@ -124,12 +249,170 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     deadline = models.DateField(null=True, blank=True)
     
+    # Denormalized application counters, kept in sync by JobApplication
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+    reviewed_count = models.PositiveIntegerField(default=0, editable=False)
+    shortlisted_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='job_created_idx'),
+            models.Index(Lower('title'), name='job_title_lower_idx'),
+        ]
     
     def __str__(self):
         return self.title
 
+    @classmethod
+    def adjust_application_counters(cls, job_id, deltas):
+        """Apply {status: +/-n} changes to one job's counters with a single UPDATE.
+
+        Decrements stop at zero: a counter that has drifted low (fixed by
+        ``manage.py repair_job_counters``) must not fail the change that
+        touches it on the positive-integer check.
+        """
+        changes = {}
+        for status, delta in deltas.items():
+            if delta:
+                field = f'{status}_count'
+                changes[field] = cls._shifted(field, delta)
+        total = sum(deltas.values())
+        if total:
+            changes['application_count'] = cls._shifted('application_count', total)
+        if changes:
+            cls.objects.filter(pk=job_id).update(**changes)
+
+    @staticmethod
+    def _shifted(field, delta):
+        if delta < 0:
+            return Greatest(models.F(field) + delta, 0)
+        return models.F(field) + delta
+
+    @classmethod
+    def recount_applications(cls, job_ids=None):
+        """Recompute the counters from the applications table. Returns the number of jobs fixed"""
+        statuses = [status for status, _ in JobApplication.STATUS_CHOICES]
+        counts = JobApplication.objects.values('job_id').annotate(
+            total=models.Count('id'),
+            **{status: models.Count('id', filter=models.Q(status=status)) for status in statuses},
+        ).order_by()
+        jobs = cls.objects.all()
+        if job_ids is not None:
+            counts = counts.filter(job_id__in=job_ids)
+            jobs = jobs.filter(pk__in=job_ids)
+        by_job = {row['job_id']: row for row in counts}
+
+        fields = ['application_count'] + [f'{status}_count' for status in statuses]
+        stale = []
+        for job in jobs.only('id', *fields).iterator():
+            row = by_job.get(job.id, {})
+            expected = {'application_count': row.get('total', 0)}
+            expected.update({f'{status}_count': row.get(status, 0) for status in statuses})
+            if any(getattr(job, field) != value for field, value in expected.items()):
+                for field, value in expected.items():
+                    setattr(job, field, value)
+                stale.append(job)
+        cls.objects.bulk_update(stale, fields, batch_size=500)
+        return len(stale)
+
+class JobApplicationQuerySet(models.QuerySet):
+    def set_status(self, status):
+        """Set-based status change that keeps the per-job counters in sync.
+
+        Use this instead of ``update(status=...)``, which would bypass the counters.
+        """
+        with transaction.atomic():
+            rows = list(self.select_for_update().exclude(status=status).values_list('id', 'job_id', 'status'))
+            if not rows:
+                return 0
+            updated = JobApplication.objects.filter(id__in=[row[0] for row in rows]).update(status=status)
+            deltas = {}
+            for _, job_id, old_status in rows:
+                job_deltas = deltas.setdefault(job_id, {})
+                job_deltas[old_status] = job_deltas.get(old_status, 0) - 1
+                job_deltas[status] = job_deltas.get(status, 0) + 1
+            for job_id, job_deltas in deltas.items():
+                Job.adjust_application_counters(job_id, job_deltas)
+        return updated
+
+RESUME_EXTENSIONS = ['pdf', 'doc', 'docx']
+# Leading bytes of each accepted format; .docx is a ZIP container
+RESUME_SIGNATURES = {
+    '.pdf': b'%PDF-',
+    '.doc': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',
+    '.docx': b'PK\x03\x04',
+}
+
+
+class ResumeBlob(models.Model):
+    """One stored resume file, shared by every application that uploaded the same bytes"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=100, unique=True)
+    size = models.PositiveIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+    @staticmethod
+    def digest_of(upload):
+        """SHA-256 of an upload; the resume upload handler computes it while streaming"""
+        digest = getattr(upload, 'sha256', None)
+        if digest:
+            return digest
+        hasher = hashlib.sha256()
+        for chunk in upload.chunks():
+            hasher.update(chunk)
+        upload.seek(0)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def sniff(upload):
+        """Extension matching the upload's leading bytes, or None if it is not a PDF or Word file"""
+        upload.seek(0)
+        head = upload.read(8)
+        upload.seek(0)
+        for extension, signature in RESUME_SIGNATURES.items():
+            if head.startswith(signature):
+                return extension
+        return None
+
+    @classmethod
+    def store(cls, upload):
+        """Return the blob for ``upload``, writing the file only if its content is new"""
+        # The stored name takes its extension from the content, never from the
+        # uploaded name, so the file can't later be served as HTML or SVG
+        extension = cls.sniff(upload)
+        if extension is None:
+            raise ValidationError('Upload a PDF or Word document.', code='invalid_resume')
+        digest = cls.digest_of(upload)
+        blob = cls.objects.filter(sha256=digest).first()
+        if blob:
+            return blob
+
+        name = f"resumes/sha256/{digest[:2]}/{digest}{extension}"
+        if not default_storage.exists(name):
+            name = default_storage.save(name, upload)
+        blob, created = cls.objects.get_or_create(sha256=digest, defaults={'name': name, 'size': upload.size})
+        if not created and blob.name != name:
+            # Lost a race with an identical upload; keep theirs
+            default_storage.delete(name)
+        return blob
+
+    @classmethod
+    def acquire(cls, name):
+        cls.objects.filter(name=name).update(ref_count=models.F('ref_count') + 1)
+
+    @classmethod
+    def release(cls, name):
+        # Files are removed by ``prune_resume_blobs`` so a concurrent identical upload
+        # can never be handed a blob that is being deleted underneath it
+        cls.objects.filter(name=name, ref_count__gt=0).update(ref_count=models.F('ref_count') - 1)
+
 class JobApplication(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -143,18 +426,75 @@ class JobApplication(models.Model):
     name = models.CharField(max_length=200)
     email = models.EmailField()
     phone = models.CharField(max_length=15)
-    resume = models.FileField(upload_to='resumes/')
+    resume = models.FileField(upload_to='resumes/', validators=[FileExtensionValidator(RESUME_EXTENSIONS)])
     cover_letter = models.TextField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = JobApplicationQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         unique_together = ['job', 'email']
+        indexes = [
+            models.Index(fields=['job', '-created_at', '-id'], name='jobapp_job_created_idx'),
+            # Admin search (see core.admin_search)
+            models.Index(Lower('email'), name='jobapp_email_lower_idx'),
+            models.Index(Lower('name'), name='jobapp_name_lower_idx'),
+            models.Index(fields=['phone'], name='jobapp_phone_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.job.title}"
 
+class EmailOutbox(models.Model):
+    """Emails queued in the same transaction as the change that triggers them.
+
+    The send_outbox command delivers them; the request that queued them never
+    touches SMTP.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.TextField(help_text="Comma-separated recipient addresses")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Email outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to}"
+
+    @classmethod
+    def build(cls, subject, body, recipients, from_email=''):
+        """Unsaved message, for bulk_create"""
+        return cls(subject=subject, body=body, to=','.join(recipients), from_email=from_email)
+
+    @classmethod
+    def enqueue(cls, subject, body, recipients, from_email=''):
+        message = cls.build(subject, body, recipients, from_email)
+        message.save()
+        return message
+
+    @property
+    def recipients(self):
+        return [address for address in self.to.split(',') if address]
+
 class Page(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
@@ -174,8 +514,22 @@ class ModelVillage(models.Model):
     goals = models.TextField()
     impact = models.TextField()
     image = models.ImageField(upload_to='villages/', blank=True)
+    # Generated from ``image`` in the background by core.thumbnails
+    image_digest = models.CharField(max_length=64, blank=True, editable=False)
+    thumbnail = models.ImageField(upload_to='villages/variants/', blank=True, editable=False)
+    image_medium = models.ImageField(upload_to='villages/variants/', blank=True, editable=False)
     start_date = models.DateField()
     is_active = models.BooleanField(default=True)
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    @property
+    def thumbnail_url(self):
+        variant = self.thumbnail or self.image
+        return variant.url if variant else ''
+
+    @property
+    def medium_url(self):
+        variant = self.image_medium or self.image
+        return variant.url if variant else ''
@@ -0,0 +1,23 @@
+"""Applicant-facing emails. Everything here queues into EmailOutbox; nothing sends directly."""
+from django.conf import settings
+
+from .models import EmailOutbox
+
+APPLICATION_STATUS_MESSAGES = {
+    'shortlisted': 'Dear {name},\n\nCongratulations! Your application for {title} has been shortlisted. We will contact you soon with next steps.\n\nBest regards,\nEvergreen Villages Trust',
+    'rejected': 'Dear {name},\n\nThank you for your interest in the {title} position. After careful consideration, we have decided to move forward with other candidates.\n\nWe appreciate your time and wish you the best in your job search.\n\nBest regards,\nEvergreen Villages Trust',
+}
+
+
+def application_status_email(application, job, status):
+    """Unsaved outbox message telling an applicant about a status change, or None"""
+    template = APPLICATION_STATUS_MESSAGES.get(status)
+    if template is None:
+        return None
+    return EmailOutbox.build(
+        f'Application Update - {job.title}',
+        template.format(name=application.name, title=job.title),
+        [application.email],
+        settings.DEFAULT_FROM_EMAIL,
+    )
+
@@ -0,0 +1,141 @@
+"""Full-page cache for anonymous visitors to the public pages.
+
+Views decorated with ``cache_anonymous_page`` render the same HTML for every
+visitor who is not logged in. ``AnonymousPageCacheMiddleware`` sits in front
+of the session, auth, messages and allauth middleware. A GET or HEAD without
+a session or messages cookie is answered straight from the cache, or with a
+304 when the browser already holds the current ETag. Nothing touches the
+session or the database on a hit.
+
+A miss goes through the normal stack. The response is stored if it is a plain
+200 that set no cookies. The cache key carries a version built from
+PAGE_CACHE_VERSION (set it per deploy), the project templates, the
+staticfiles manifest and the responsive image manifest. A deploy that changes
+any of them therefore starts from a fresh cache, and old entries simply
+expire. Query strings are not part of the key: these pages ignore them, and
+campaign links (``?utm_source=...``) should share one entry.
+"""
+import hashlib
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from . import responsive_images
+
+TEMPLATE_DIR = Path(settings.BASE_DIR) / 'core' / 'templates'
+
+_version = None
+
+
+def cache_anonymous_page(view):
+    """Mark a view whose anonymous response may be cached whole"""
+    view.cache_anonymous_page = True
+    return view
+
+
+def page_version():
+    """Digest of everything that can change a cached page, computed once per process (every call in DEBUG)"""
+    global _version
+    if _version is not None and not settings.DEBUG:
+        return _version
+    hasher = hashlib.sha256(settings.PAGE_CACHE_VERSION.encode())
+    sources = sorted(TEMPLATE_DIR.rglob('*.html'))
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest and settings.STATIC_ROOT:
+        sources.append(Path(settings.STATIC_ROOT) / manifest)
+    sources.append(responsive_images.manifest_path())
+    for path in sources:
+        hasher.update(str(path).encode())
+        if path.exists():
+            hasher.update(path.read_bytes())
+    _version = hasher.hexdigest()[:16]
+    return _version
+
+
+class AnonymousPageCacheMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.private_cookies = (settings.SESSION_COOKIE_NAME, 'messages')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_candidate(request):
+            return self.get_response(request)
+
+        key = self.cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            return self.cached_response(request, entry)
+
+        response = self.get_response(request)
+        if self.is_storable(request, response):
+            cache.set(key, self.make_entry(response), settings.PAGE_CACHE_TIMEOUT)
+            return get_conditional_response(request, etag=response['ETag'], response=response)
+        return response
+
+    async def __acall__(self, request):
+        if not self.is_candidate(request):
+            return await self.get_response(request)
+
+        key = self.cache_key(request)
+        entry = await cache.aget(key)
+        if entry is not None:
+            return self.cached_response(request, entry)
+
+        response = await self.get_response(request)
+        # request.user may still be unevaluated, and evaluating it can query the database
+        if await sync_to_async(self.is_storable)(request, response):
+            await cache.aset(key, self.make_entry(response), settings.PAGE_CACHE_TIMEOUT)
+            return get_conditional_response(request, etag=response['ETag'], response=response)
+        return response
+
+    def cache_key(self, request):
+        return f'page:{page_version()}:{request.get_host()}:{request.path}'
+
+    def make_entry(self, response):
+        """Tag the response with its ETag and return what goes in the cache"""
+        response['ETag'] = '"%s"' % hashlib.sha256(response.content).hexdigest()[:32]
+        patch_cache_control(response, no_cache=True)
+        return {
+            'content': response.content,
+            'headers': [(name, value) for name, value in response.items() if name.lower() != 'set-cookie'],
+        }
+
+    def is_candidate(self, request):
+        if settings.PAGE_CACHE_TIMEOUT <= 0 or request.method not in ('GET', 'HEAD'):
+            return False
+        if 'Authorization' in request.headers or any(name in request.COOKIES for name in self.private_cookies):
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return getattr(match.func, 'cache_anonymous_page', False)
+
+    def is_storable(self, request, response):
+        user = getattr(request, 'user', None)
+        return (
+            request.method == 'GET'
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not (user and user.is_authenticated)
+        )
+
+    def cached_response(self, request, entry):
+        response = HttpResponse(entry['content'] if request.method == 'GET' else b'')
+        for name, value in entry['headers']:
+            response[name] = value
+        return get_conditional_response(request, etag=response['ETag'], response=response)
@@ -0,0 +1,156 @@
+"""Keyset (seek) pagination and filtering for the admin dashboard lists.
+
+Pages are addressed by the (created_at, id) of the last row shown instead of
+an OFFSET, so every page costs one indexed range scan no matter how deep the
+admin scrolls. Each list model carries a matching (created_at, id) index.
+"""
+import base64
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(obj):
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """Return (created_at, id) or None if the cursor is missing or malformed"""
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        created_at = parse_datetime(created_at)
+        return (created_at, int(pk)) if created_at else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def day_start(day):
+    """Aware datetime for local midnight, so date filters stay index range scans"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+class KeysetPage:
+    """One page of rows plus the query strings for the neighbouring pages"""
+
+    def __init__(self, object_list, filters, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.filters = filters
+        self.has_next = next_cursor is not None
+        self.has_previous = previous_cursor is not None
+        self.next_query = self._query(after=next_cursor)
+        self.previous_query = self._query(before=previous_cursor)
+        self.first_query = self._query()
+
+    def _query(self, **cursor):
+        query = QueryDict(mutable=True)
+        for key, value in self.filters.items():
+            if value:
+                query[key] = value
+        for key, value in cursor.items():
+            if value:
+                query[key] = value
+        return query.urlencode()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Filter a queryset from GET parameters and return one keyset page of it.
+
+    Supported parameters: ``q`` (search across ``search_fields``), ``status``
+    (a key of ``statuses``), ``start_date``/``end_date`` (local days on
+    created_at) and the ``after``/``before`` cursors.
+    """
+
+    def __init__(self, queryset, search_fields=(), statuses=None, per_page=None):
+        self.queryset = queryset
+        self.search_fields = search_fields
+        self.statuses = statuses or {}
+        self.per_page = per_page or settings.ADMIN_LIST_PAGE_SIZE
+
+    @staticmethod
+    def status_choices(field, choices):
+        """Build a ``statuses`` mapping from a model field's choices"""
+        return {value: (label, Q(**{field: value})) for value, label in choices}
+
+    def filter(self, params):
+        queryset = self.queryset
+        filters = {
+            'q': params.get('q', '').strip(),
+            'status': params.get('status', ''),
+            'start_date': params.get('start_date', ''),
+            'end_date': params.get('end_date', ''),
+        }
+
+        if filters['q'] and self.search_fields:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f'{field}__icontains': filters['q']})
+            queryset = queryset.filter(condition)
+
+        if filters['status'] in self.statuses:
+            queryset = queryset.filter(self.statuses[filters['status']][1])
+        else:
+            filters['status'] = ''
+
+        start_date = parse_date(filters['start_date'])
+        end_date = parse_date(filters['end_date'])
+        if start_date:
+            queryset = queryset.filter(created_at__gte=day_start(start_date))
+        else:
+            filters['start_date'] = ''
+        if end_date:
+            queryset = queryset.filter(created_at__lt=day_start(end_date + timedelta(days=1)))
+        else:
+            filters['end_date'] = ''
+
+        return queryset, filters
+
+    def page(self, params):
+        queryset, filters = self.filter(params)
+        after = decode_cursor(params.get('after'))
+        before = decode_cursor(params.get('before')) if not after else None
+
+        if before:
+            # Walk towards newer rows, then flip back to newest-first for display
+            created_at, pk = before
+            rows = list(
+                queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+                .order_by('created_at', 'pk')[:self.per_page + 1]
+            )
+            has_newer = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            next_cursor = encode_cursor(rows[-1]) if rows else None
+            previous_cursor = encode_cursor(rows[0]) if rows and has_newer else None
+        else:
+            if after:
+                created_at, pk = after
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+            rows = list(queryset.order_by('-created_at', '-pk')[:self.per_page + 1])
+            has_older = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            next_cursor = encode_cursor(rows[-1]) if rows and has_older else None
+            previous_cursor = encode_cursor(rows[0]) if rows and after else None
+
+        page = KeysetPage(rows, filters, next_cursor, previous_cursor)
+        page.status_options = [(value, label) for value, (label, _) in self.statuses.items()]
+        return page
@@ -0,0 +1,313 @@
+"""Razorpay gateway access for the donation views.
+
+Order creation runs on a small bounded thread pool so a slow gateway can only
+hold a request for RAZORPAY_ORDER_TIMEOUT seconds, and only
+RAZORPAY_MAX_CONCURRENCY calls can be in flight per worker process.
+Async views use ``acreate_order``, which awaits the same pool.
+Set RAZORPAY_GATEWAY=stub to use the local StubGateway instead of the real API.
+
+Every call goes through ``_call``. That step applies the circuit breaker and
+bounded retries with jittered backoff, and it records latency into
+``LATENCY``. The real client shares one keep-alive ``requests`` session whose
+requests always carry a (connect, read) timeout. Point RAZORPAY_BASE_URL at
+``manage.py fake_razorpay_server`` to exercise the HTTP path locally.
+"""
+import asyncio
+import hashlib
+import hmac
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import razorpay
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from .metrics import LatencyHistogram
+
+
+class GatewayError(Exception):
+    """The payment gateway could not complete the call"""
+
+
+class GatewayTimeout(GatewayError):
+    """The payment gateway did not answer within the configured timeout"""
+
+
+class GatewayBusy(GatewayError):
+    """Too many gateway calls are already in flight in this process"""
+
+
+class GatewayUnavailable(GatewayError):
+    """The circuit breaker is open because the gateway keeps failing"""
+
+
+class CircuitBreaker:
+    """Fail fast after ``threshold`` consecutive failures.
+
+    Once open, calls are rejected for ``reset_after`` seconds; after that a
+    single trial call is let through and its outcome closes or re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, threshold, reset_after):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_after:
+                    raise GatewayUnavailable('Payment gateway is temporarily unavailable, please try again shortly')
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                # A trial call is already running
+                raise GatewayUnavailable('Payment gateway is temporarily unavailable, please try again shortly')
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default (connect, read) timeout to every call"""
+
+    def __init__(self, timeout, pool_size):
+        super().__init__()
+        self.default_timeout = timeout
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+class StubGateway:
+    """Local stand-in for razorpay.Client used for load tests and development.
+
+    Mirrors the parts of the client the app uses (``order.create``,
+    ``order.payments``, ``payment.all`` and the signature checks) and sleeps
+    for ``latency`` seconds to imitate the gateway round trip.
+    """
+
+    def __init__(self, key_secret, latency=0.0):
+        self.key_secret = key_secret or 'stub-secret'
+        self.latency = latency
+        self.order = self._Orders(self)
+        self.payment = self._Payments(self)
+        self.utility = self._Utility(self)
+
+    def sign(self, order_id, payment_id):
+        message = f"{order_id}|{payment_id}".encode()
+        return hmac.new(self.key_secret.encode(), message, hashlib.sha256).hexdigest()
+
+    class _Orders:
+        def __init__(self, gateway):
+            self.gateway = gateway
+
+        def create(self, data=None, **kwargs):
+            time.sleep(self.gateway.latency)
+            data = data or {}
+            return {
+                'id': f"order_stub{uuid.uuid4().hex[:14]}",
+                'entity': 'order',
+                'amount': data.get('amount'),
+                'currency': data.get('currency', 'INR'),
+                'status': 'created',
+                'created_at': int(time.time()),
+            }
+
+        def payments(self, order_id, data=None, **kwargs):
+            time.sleep(self.gateway.latency)
+            return {'entity': 'collection', 'count': 0, 'items': []}
+
+    class _Payments:
+        def __init__(self, gateway):
+            self.gateway = gateway
+
+        def all(self, data=None, **kwargs):
+            time.sleep(self.gateway.latency)
+            return {'entity': 'collection', 'count': 0, 'items': []}
+
+    class _Utility:
+        def __init__(self, gateway):
+            self.gateway = gateway
+
+        def verify_webhook_signature(self, body, signature, secret):
+            expected = hmac.new(secret.encode(), body.encode(), hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(expected, signature or ''):
+                raise razorpay.errors.SignatureVerificationError('Razorpay Signature Verification Failed')
+            return True
+
+        def verify_payment_signature(self, parameters):
+            expected = self.gateway.sign(parameters['razorpay_order_id'], parameters['razorpay_payment_id'])
+            if not hmac.compare_digest(expected, parameters.get('razorpay_signature') or ''):
+                raise razorpay.errors.SignatureVerificationError('Razorpay Signature Verification Failed')
+            return True
+
+
+# Transport failures worth retrying. Read timeouts are not retried for order
+# creation because the gateway may already have created the order.
+RETRYABLE = (requests.ConnectionError, razorpay.errors.ServerError)
+# Rejections of our own request; the gateway answered, so it counts as healthy
+CLIENT_ERRORS = (razorpay.errors.BadRequestError, razorpay.errors.SignatureVerificationError)
+
+LATENCY = LatencyHistogram('razorpay_call_duration_seconds')
+
+_client = None
+_client_lock = threading.Lock()
+_breaker = CircuitBreaker(settings.RAZORPAY_BREAKER_THRESHOLD, settings.RAZORPAY_BREAKER_RESET)
+_executor = ThreadPoolExecutor(
+    max_workers=settings.RAZORPAY_MAX_CONCURRENCY,
+    thread_name_prefix='razorpay',
+)
+_slots = threading.BoundedSemaphore(settings.RAZORPAY_MAX_CONCURRENCY)
+
+
+def get_client():
+    """Return the process-wide gateway client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if settings.RAZORPAY_GATEWAY == 'stub':
+                    _client = StubGateway(settings.RAZORPAY_KEY_SECRET, settings.RAZORPAY_STUB_LATENCY)
+                else:
+                    session = TimeoutSession(
+                        timeout=(settings.RAZORPAY_CONNECT_TIMEOUT, settings.RAZORPAY_READ_TIMEOUT),
+                        pool_size=settings.RAZORPAY_MAX_CONCURRENCY,
+                    )
+                    _client = razorpay.Client(
+                        session=session,
+                        auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                        base_url=settings.RAZORPAY_BASE_URL,
+                    )
+    return _client
+
+
+def _call(operation, func, *args, retryable=RETRYABLE, **kwargs):
+    """Run one gateway operation with the circuit breaker, retries and latency metrics"""
+    attempts = settings.RAZORPAY_MAX_RETRIES + 1
+    for attempt in range(attempts):
+        _breaker.before_call()
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except retryable as e:
+            LATENCY.observe(operation, 'error', time.perf_counter() - started)
+            _breaker.record_failure()
+            if attempt == attempts - 1:
+                raise GatewayError(f'Payment gateway error: {e}') from e
+            # Full jitter keeps retrying workers from hitting the gateway in lockstep
+            time.sleep(random.uniform(0, settings.RAZORPAY_RETRY_BACKOFF * 2 ** attempt))
+        except requests.Timeout as e:
+            LATENCY.observe(operation, 'timeout', time.perf_counter() - started)
+            _breaker.record_failure()
+            raise GatewayTimeout(f'Payment gateway timed out: {e}') from e
+        except CLIENT_ERRORS:
+            LATENCY.observe(operation, 'rejected', time.perf_counter() - started)
+            _breaker.record_success()
+            raise
+        except Exception:
+            # Gateway errors and malformed responses; this also re-opens a half-open breaker
+            LATENCY.observe(operation, 'error', time.perf_counter() - started)
+            _breaker.record_failure()
+            raise
+        else:
+            LATENCY.observe(operation, 'ok', time.perf_counter() - started)
+            _breaker.record_success()
+            return result
+
+
+def _submit(func, *args, **kwargs):
+    # Refuse instead of queueing so a stalled gateway cannot build a backlog
+    if not _slots.acquire(blocking=False):
+        raise GatewayBusy('Payment gateway is busy, please try again')
+    try:
+        future = _executor.submit(func, *args, **kwargs)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def create_order(data, timeout=None):
+    """Create a Razorpay order, giving up after ``timeout`` seconds"""
+    timeout = settings.RAZORPAY_ORDER_TIMEOUT if timeout is None else timeout
+    future = _submit(_call, 'order.create', get_client().order.create, data=data)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        future.cancel()
+        raise GatewayTimeout(f'Payment gateway did not respond within {timeout}s')
+
+
+async def acreate_order(data, timeout=None):
+    """create_order for async views: the request awaits the gateway pool instead of blocking a thread"""
+    timeout = settings.RAZORPAY_ORDER_TIMEOUT if timeout is None else timeout
+    future = _submit(_call, 'order.create', get_client().order.create, data=data)
+    try:
+        # wait_for cancels the wrapped future on timeout, which cancels the pool job if it has not started
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        raise GatewayTimeout(f'Payment gateway did not respond within {timeout}s')
+
+
+def verify_payment_signature(params):
+    """Raise razorpay.errors.SignatureVerificationError if the signature is invalid.
+
+    This is a local HMAC check, so it bypasses _call: the circuit breaker must
+    neither reject a paid donor's confirmation nor be reset by it.
+    """
+    return get_client().utility.verify_payment_signature(params)
+
+
+def verify_webhook_signature(body, signature):
+    """Raise razorpay.errors.SignatureVerificationError unless the webhook body is signed with our secret"""
+    if not settings.RAZORPAY_WEBHOOK_SECRET:
+        raise razorpay.errors.SignatureVerificationError('RAZORPAY_WEBHOOK_SECRET is not configured')
+    return get_client().utility.verify_webhook_signature(body, signature, settings.RAZORPAY_WEBHOOK_SECRET)
+
+
+def list_payments(since, until, count=100, skip=0):
+    """One page of payments created between two unix timestamps, newest first"""
+    return _call(
+        'payment.all',
+        get_client().payment.all,
+        {'from': int(since), 'to': int(until), 'count': count, 'skip': skip},
+        retryable=RETRYABLE + (requests.Timeout,),
+    )
+
+
+def order_payments(order_id):
+    """Every payment attempt made against one order"""
+    return _call(
+        'order.payments',
+        get_client().order.payments,
+        order_id,
+        retryable=RETRYABLE + (requests.Timeout,),
+    )
+
+
+def render_metrics():
+    """Gateway latency histograms for this process in Prometheus text format"""
+    return LATENCY.render()
@@ -0,0 +1,147 @@
+"""Build-time responsive variants of the images in core/static/images.
+
+``manage.py build_responsive_images`` resizes every source image to the
+RESPONSIVE_IMAGE_WIDTHS it is wide enough for and encodes each size as AVIF,
+WebP and a JPEG (PNG when the image has transparency) fallback. Files go to
+core/static/images/responsive/, which collectstatic then fingerprints and
+compresses like any other static file. ``manifest.json`` in that directory
+records every variant and the source digest it was built from, so reruns only
+re-encode images that changed.
+
+The ``responsive_images`` template tags read the manifest to emit
+``<picture>``/``srcset`` markup. An image with no manifest entry falls back to
+its original file.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image, features
+
+STATIC_DIR = Path(settings.BASE_DIR) / 'core' / 'static'
+SOURCE_DIR = 'images'
+OUTPUT_DIR = 'images/responsive'
+MANIFEST_NAME = 'manifest.json'
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# In order of preference; the tags list formats in this order
+ENCODERS = {
+    'avif': {'mime': 'image/avif', 'options': {'quality': 55, 'speed': 6}},
+    'webp': {'mime': 'image/webp', 'options': {'quality': 80, 'method': 4}},
+    'jpeg': {'mime': 'image/jpeg', 'options': {'quality': 82, 'optimize': True, 'progressive': True}},
+    'png': {'mime': 'image/png', 'options': {'optimize': True}},
+}
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+
+_manifest_cache = {'mtime': None, 'data': {}}
+
+
+def manifest_path():
+    return STATIC_DIR / OUTPUT_DIR / MANIFEST_NAME
+
+
+def load_manifest():
+    """The manifest, re-read only when the file changes"""
+    try:
+        mtime = manifest_path().stat().st_mtime
+    except FileNotFoundError:
+        return {}
+    if _manifest_cache['mtime'] != mtime:
+        with open(manifest_path()) as handle:
+            _manifest_cache['data'] = json.load(handle)
+        _manifest_cache['mtime'] = mtime
+    return _manifest_cache['data']
+
+
+def modern_formats():
+    return [name for name in ('avif', 'webp') if features.check(name)]
+
+
+def file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def source_images():
+    """Static-relative paths of the source images, skipping generated output"""
+    root = STATIC_DIR / SOURCE_DIR
+    for path in sorted(root.rglob('*')):
+        relative = path.relative_to(STATIC_DIR).as_posix()
+        if path.suffix.lower() in SOURCE_EXTENSIONS and not relative.startswith(OUTPUT_DIR + '/'):
+            yield relative
+
+
+def target_widths(source_width, widths):
+    """Configured widths narrower than the source, plus the source width itself (capped)"""
+    chosen = [width for width in sorted(widths) if width < source_width]
+    largest = min(source_width, max(widths))
+    if largest not in chosen:
+        chosen.append(largest)
+    return chosen
+
+
+def build_entry(relative, digest, widths, formats):
+    """Encode every variant of one source image and return its manifest entry"""
+    with Image.open(STATIC_DIR / relative) as image:
+        image.load()
+        image = image.convert('RGBA')
+    # Many of our photos are RGBA with a fully opaque alpha channel; those can be JPEGs
+    has_alpha = image.getchannel('A').getextrema()[0] < 255
+    if not has_alpha:
+        image = image.convert('RGB')
+    fallback = 'png' if has_alpha else 'jpeg'
+    stem = Path(relative).relative_to(SOURCE_DIR).with_suffix('').as_posix().replace('/', '-')
+
+    variants = {}
+    for width in target_widths(image.width, widths):
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for format_name in [*formats, fallback]:
+            name = f'{OUTPUT_DIR}/{stem}-{width}.{EXTENSIONS[format_name]}'
+            # A 256-colour palette keeps transparency and makes the PNG fallback several times smaller
+            encoded = resized.quantize(256, method=Image.Quantize.FASTOCTREE) if format_name == 'png' else resized
+            encoded.save(STATIC_DIR / name, format=format_name.upper(), **ENCODERS[format_name]['options'])
+            variants.setdefault(format_name, []).append([width, name, os.path.getsize(STATIC_DIR / name)])
+
+    return {
+        'source': digest,
+        'width': image.width,
+        'height': image.height,
+        'fallback': fallback,
+        'widths': sorted(widths),
+        'variants': variants,
+    }
+
+
+def is_current(entry, digest, widths, formats):
+    if not entry or entry['source'] != digest or entry['widths'] != sorted(widths):
+        return False
+    if set(entry['variants']) != {*formats, entry['fallback']}:
+        return False
+    return all((STATIC_DIR / name).exists() for sizes in entry['variants'].values() for _, name, _ in sizes)
+
+
+def write_manifest(manifest):
+    """Write atomically so a running server never reads a half-written manifest"""
+    path = manifest_path()
+    temporary = path.with_suffix('.tmp')
+    with open(temporary, 'w') as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def prune_outputs(manifest):
+    """Delete generated files the manifest no longer mentions; returns how many"""
+    keep = {name for entry in manifest.values() for sizes in entry['variants'].values() for _, name, _ in sizes}
+    removed = 0
+    for path in (STATIC_DIR / OUTPUT_DIR).iterdir():
+        relative = path.relative_to(STATIC_DIR).as_posix()
+        if path.name != MANIFEST_NAME and path.is_file() and relative not in keep:
+            path.unlink()
+            removed += 1
+    return removed
@@ -0,0 +1,124 @@
+"""Full-text search over jobs.
+
+The index lives in the database and is kept in sync by the database itself,
+so jobs saved through create_job, the admin or a bulk ``update()`` are all
+searchable straight away (see migration 0009_job_search_index):
+
+* PostgreSQL: a generated ``core_job.search_vector`` tsvector column with a
+  GIN index, queried with ``websearch_to_tsquery`` and ranked by ``ts_rank``.
+* SQLite: an external-content FTS5 table ``core_job_fts`` maintained by
+  triggers, ranked by ``bm25``. SQLite drops a table's triggers whenever it
+  rebuilds the table, which any later ``AlterField`` on Job does, so
+  ``ensure_sqlite_index`` puts missing ones back after every ``migrate``.
+
+Other backends fall back to a plain ``icontains`` scan.
+"""
+import logging
+import re
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Q
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Same as migration 0009_job_search_index
+SQLITE_TRIGGERS = {
+    'core_job_fts_insert': """
+        CREATE TRIGGER core_job_fts_insert AFTER INSERT ON core_job BEGIN
+            INSERT INTO core_job_fts(rowid, title, description, requirements, location)
+            VALUES (new.id, new.title, new.description, new.requirements, new.location);
+        END
+    """,
+    'core_job_fts_delete': """
+        CREATE TRIGGER core_job_fts_delete AFTER DELETE ON core_job BEGIN
+            INSERT INTO core_job_fts(core_job_fts, rowid, title, description, requirements, location)
+            VALUES ('delete', old.id, old.title, old.description, old.requirements, old.location);
+        END
+    """,
+    'core_job_fts_update': """
+        CREATE TRIGGER core_job_fts_update AFTER UPDATE OF title, description, requirements, location ON core_job BEGIN
+            INSERT INTO core_job_fts(core_job_fts, rowid, title, description, requirements, location)
+            VALUES ('delete', old.id, old.title, old.description, old.requirements, old.location);
+            INSERT INTO core_job_fts(rowid, title, description, requirements, location)
+            VALUES (new.id, new.title, new.description, new.requirements, new.location);
+        END
+    """,
+}
+
+
+def fts5_query(text):
+    """Turn free text into a safe FTS5 expression: every word must match, as a prefix"""
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(text))
+
+
+def ensure_sqlite_index(using='default'):
+    """Recreate missing FTS5 sync triggers and reindex. Returns the names of the recreated triggers"""
+    database = connections[using]
+    if database.vendor != 'sqlite':
+        return []
+    with database.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'core_job_fts'")
+        if cursor.fetchone() is None:
+            # 0009_job_search_index is not applied yet
+            return []
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'core_job'")
+        present = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in SQLITE_TRIGGERS if name not in present]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            # Jobs written while the triggers were gone are not in the index yet
+            cursor.execute("INSERT INTO core_job_fts(core_job_fts) VALUES ('rebuild')")
+            logger.warning('Recreated job search triggers %s and rebuilt core_job_fts', ', '.join(missing))
+    return missing
+
+
+def _ranked_ids(text, limit, offset):
+    if connection.vendor == 'postgresql':
+        sql = (
+            "SELECT id FROM core_job, websearch_to_tsquery('english', %s) query "
+            "WHERE is_active AND search_vector @@ query "
+            "ORDER BY ts_rank(search_vector, query) DESC, created_at DESC "
+            "LIMIT %s OFFSET %s"
+        )
+        params = [text, limit, offset]
+    elif connection.vendor == 'sqlite':
+        match = fts5_query(text)
+        if not match:
+            return []
+        # Column weights: title, description, requirements, location
+        sql = (
+            "SELECT core_job.id FROM core_job_fts JOIN core_job ON core_job.id = core_job_fts.rowid "
+            "WHERE core_job_fts MATCH %s AND core_job.is_active "
+            "ORDER BY bm25(core_job_fts, 10.0, 2.0, 2.0, 5.0), core_job.created_at DESC "
+            "LIMIT %s OFFSET %s"
+        )
+        params = [match, limit, offset]
+    else:
+        condition = Q()
+        for field in ('title', 'description', 'requirements', 'location'):
+            condition |= Q(**{f'{field}__icontains': text})
+        return list(
+            Job.objects.filter(condition, is_active=True).order_by('-created_at')
+            .values_list('id', flat=True)[offset:offset + limit]
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_jobs(text, page=1, per_page=None):
+    """Return (jobs, has_next) for one page of active jobs matching ``text``, best match first"""
+    per_page = per_page or settings.JOB_SEARCH_PAGE_SIZE
+    page = max(page, 1)
+    ids = _ranked_ids(text.strip(), per_page + 1, (page - 1) * per_page)
+    has_next = len(ids) > per_page
+    ids = ids[:per_page]
+    jobs = Job.objects.in_bulk(ids)
+    return [jobs[job_id] for job_id in ids if job_id in jobs], has_next
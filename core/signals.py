@@ -0,0 +1,85 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import dashboard, thumbnails
+from .models import Donation, DonationDailyRollup, VolunteerApplication, Job, JobApplication, ModelVillage, ResumeBlob
+
+
+def _invalidate_dashboard():
+    # Wait for the commit so a concurrent dashboard load cannot re-cache stale rows
+    transaction.on_commit(dashboard.invalidate)
+
+
+@receiver([post_save, post_delete], sender=Donation)
+def donation_changed(sender, instance, **kwargs):
+    # Pending checkouts are invisible on the dashboard, so they must not flush it
+    if instance.status == 'completed':
+        _invalidate_dashboard()
+
+
+@receiver([post_save, post_delete], sender=DonationDailyRollup)
+@receiver([post_save, post_delete], sender=VolunteerApplication)
+@receiver([post_save, post_delete], sender=JobApplication)
+@receiver([post_save, post_delete], sender=Job)
+def dashboard_source_changed(sender, **kwargs):
+    _invalidate_dashboard()
+
+
+@receiver(post_init, sender=JobApplication)
+def remember_application_state(sender, instance, **kwargs):
+    # Instances loaded with these fields deferred are left out of the counter bookkeeping
+    fields = instance.__dict__
+    instance._counted_as = (fields.get('job_id'), fields.get('status'))
+
+
+@receiver(post_save, sender=JobApplication)
+def application_saved(sender, instance, created, **kwargs):
+    current = (instance.job_id, instance.status)
+    if created:
+        Job.adjust_application_counters(instance.job_id, {instance.status: 1})
+    else:
+        previous_job, previous_status = instance._counted_as
+        if previous_job is None or previous_status is None or (previous_job, previous_status) == current:
+            pass
+        elif previous_job == instance.job_id:
+            Job.adjust_application_counters(instance.job_id, {previous_status: -1, instance.status: 1})
+        else:
+            Job.adjust_application_counters(previous_job, {previous_status: -1})
+            Job.adjust_application_counters(instance.job_id, {instance.status: 1})
+    instance._counted_as = current
+
+
+@receiver(post_delete, sender=JobApplication)
+def application_deleted(sender, instance, **kwargs):
+    Job.adjust_application_counters(instance.job_id, {instance.status: -1})
+
+
+@receiver(post_save, sender=JobApplication)
+def resume_referenced(sender, instance, created, **kwargs):
+    if created and instance.resume:
+        ResumeBlob.acquire(instance.resume.name)
+
+
+@receiver(post_delete, sender=JobApplication)
+def resume_released(sender, instance, **kwargs):
+    if instance.resume:
+        ResumeBlob.release(instance.resume.name)
+
+
+@receiver(post_init, sender=ModelVillage)
+def remember_village_image(sender, instance, **kwargs):
+    image = instance.__dict__.get('image')
+    instance._saved_image = getattr(image, 'name', image) or ''
+
+
+@receiver(post_save, sender=ModelVillage)
+def village_image_changed(sender, instance, **kwargs):
+    image = instance.image.name or ''
+    previous, instance._saved_image = instance._saved_image, image
+    if not image:
+        if instance.image_digest:
+            ModelVillage.objects.filter(pk=instance.pk).update(image_digest='', thumbnail='', image_medium='')
+    elif image != previous or not instance.image_digest:
+        # Work the request thread should not do; see core.thumbnails
+        thumbnails.schedule(instance.pk)
@@ -0,0 +1,31 @@
+// Amount pill interaction
+document.querySelectorAll('.amount-pill').forEach(pill => {
+    pill.addEventListener('click', function() {
+        document.querySelectorAll('.amount-pill').forEach(p => p.classList.remove('active'));
+        this.classList.add('active');
+        document.querySelector('input[name="amount"]').value = this.dataset.amount;
+    });
+});
+
+
+function toggleCustomCode() {
+    const select = document.getElementById("countryCodeSelect");
+    const customInput = document.getElementById("customCountryCode");
+
+    if (select.value === "custom") {
+        customInput.style.display = "block";
+        customInput.required = true;
+    } else {
+        customInput.style.display = "none";
+        customInput.required = false;
+        customInput.value = "";
+    }
+}
+
+// Auto-run on page load (important for edit profile)
+document.addEventListener("DOMContentLoaded", toggleCustomCode);
+
+// Update amount when typing in custom field
+document.querySelector('input[name="amount"]').addEventListener('input', function() {
+    document.querySelectorAll('.amount-pill').forEach(p => p.classList.remove('active'));
+});
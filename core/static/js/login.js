@@ -0,0 +1 @@
+AOS.init({ duration: 800, once: true });
@@ -0,0 +1,89 @@
+// Modal control functions
+function openModal(modalId) {
+    const modal = document.getElementById(modalId);
+    const backdrop = document.createElement('div');
+    backdrop.className = 'modal-backdrop fade show';
+    backdrop.id = `backdrop-${modalId}`;
+    backdrop.onclick = function() {
+        closeModal(modalId);
+    };
+
+    document.body.appendChild(backdrop);
+    document.body.classList.add('modal-open');
+    document.body.style.overflow = 'hidden';
+    document.body.style.paddingRight = '0px';
+
+    modal.classList.add('show');
+    modal.style.display = 'block';
+    modal.setAttribute('aria-modal', 'true');
+    modal.removeAttribute('aria-hidden');
+
+    // Fade in effect
+    setTimeout(() => {
+        backdrop.classList.add('show');
+    }, 10);
+}
+
+function closeModal(modalId) {
+    const modal = document.getElementById(modalId);
+    const backdrop = document.getElementById(`backdrop-${modalId}`);
+
+    if (modal) {
+        modal.classList.remove('show');
+        setTimeout(() => {
+            modal.style.display = 'none';
+            modal.setAttribute('aria-hidden', 'true');
+            modal.removeAttribute('aria-modal');
+        }, 150);
+    }
+
+    if (backdrop) {
+        backdrop.classList.remove('show');
+        setTimeout(() => {
+            backdrop.remove();
+        }, 150);
+    }
+
+    // Clean up body styles
+    document.body.classList.remove('modal-open');
+    document.body.style.overflow = '';
+    document.body.style.paddingRight = '';
+
+    // Remove any other lingering backdrops
+    setTimeout(() => {
+        const allBackdrops = document.querySelectorAll('.modal-backdrop');
+        allBackdrops.forEach(bd => bd.remove());
+    }, 200);
+}
+
+// Close modal on ESC key
+document.addEventListener('keydown', function(event) {
+    if (event.key === 'Escape') {
+        const openModals = document.querySelectorAll('.modal.show');
+        openModals.forEach(modal => {
+            closeModal(modal.id);
+        });
+    }
+});
+
+// Prevent body scroll when modal is open
+document.addEventListener('DOMContentLoaded', function() {
+    // Clean up any existing backdrops on page load
+    const existingBackdrops = document.querySelectorAll('.modal-backdrop');
+    existingBackdrops.forEach(backdrop => backdrop.remove());
+    document.body.classList.remove('modal-open');
+    document.body.style.overflow = '';
+});
+
+// The header checkbox selects every row for the bulk status update
+document.addEventListener('DOMContentLoaded', function() {
+    const selectAll = document.querySelector('.bulk-select-all');
+    if (!selectAll) {
+        return;
+    }
+    selectAll.addEventListener('change', function() {
+        document.querySelectorAll('.bulk-select').forEach(checkbox => {
+            checkbox.checked = selectAll.checked;
+        });
+    });
+});
@@ -0,0 +1,12 @@
+// The header checkbox selects every row for the bulk actions
+document.addEventListener('DOMContentLoaded', function() {
+    const selectAll = document.querySelector('.bulk-select-all');
+    if (!selectAll) {
+        return;
+    }
+    selectAll.addEventListener('change', function() {
+        document.querySelectorAll('.bulk-select').forEach(checkbox => {
+            checkbox.checked = selectAll.checked;
+        });
+    });
+});
@@ -0,0 +1,43 @@
+AOS.init({ duration: 800, once: true });
+
+const password1 = document.getElementById('password1');
+const strengthBar = document.getElementById('strengthBar');
+
+password1.addEventListener('input', function() {
+    const value = this.value;
+    let strength = 0;
+
+    if (value.length >= 8) strength++;
+    if (/[a-z]/.test(value) && /[A-Z]/.test(value)) strength++;
+    if (/[0-9]/.test(value)) strength++;
+    if (/[^a-zA-Z0-9]/.test(value)) strength++;
+
+    strengthBar.className = 'password-strength-bar';
+
+    if (strength === 0) {
+        strengthBar.style.width = '0%';
+    } else if (strength <= 2) {
+        strengthBar.classList.add('weak');
+    } else if (strength === 3) {
+        strengthBar.classList.add('medium');
+    } else {
+        strengthBar.classList.add('strong');
+    }
+});
+
+document.getElementById('signupForm').addEventListener('submit', function(e) {
+    const pass1 = document.querySelector('input[name="password1"]').value;
+    const pass2 = document.querySelector('input[name="password2"]').value;
+
+    if (pass1 !== pass2) {
+        e.preventDefault();
+        alert('Passwords do not match!');
+        return false;
+    }
+
+    if (pass1.length < 8) {
+        e.preventDefault();
+        alert('Password must be at least 8 characters long!');
+        return false;
+    }
+});
@@ -0,0 +1,13 @@
+document.addEventListener("DOMContentLoaded", () => {
+    const sections = document.querySelectorAll(".what-content");
+
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.classList.add("visible");
+            }
+        });
+    }, { threshold: 0.2 });
+
+    sections.forEach(section => observer.observe(section));
+});
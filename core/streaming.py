@@ -0,0 +1,46 @@
+"""Streaming responses that keep streaming under ASGI.
+
+Django 4.2 serves a streaming response built on a sync iterator (CSV exports,
+file downloads) under ASGI by reading the whole iterator into a list first.
+An export of every donation, or a large resume, then sits in memory before
+the first byte goes out. These responses pull the iterator in small batches
+in a worker thread instead. Under WSGI they behave exactly like the Django
+classes they extend.
+"""
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.http import FileResponse, StreamingHttpResponse
+
+BATCH_SIZE = 64
+
+
+async def athreaded(iterator, batch_size=BATCH_SIZE, thread_sensitive=True):
+    """Yield from a sync iterator, fetching ``batch_size`` items per trip to a worker thread.
+
+    Keep ``thread_sensitive`` for iterators that run queries: every batch then
+    runs on the thread that owns the request's database connection.
+    """
+    iterator = iter(iterator)
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)), thread_sensitive=thread_sensitive)
+    while batch := await next_batch():
+        for item in batch:
+            yield item
+
+
+class ThreadedStreamMixin:
+    async def __aiter__(self):
+        if self.is_async:
+            async for part in self.streaming_content:
+                yield part
+        else:
+            async for part in athreaded(self.streaming_content):
+                yield part
+
+
+class StreamingResponse(ThreadedStreamMixin, StreamingHttpResponse):
+    pass
+
+
+class StreamingFileResponse(ThreadedStreamMixin, FileResponse):
+    pass
@@ -0,0 +1,84 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from core.responsive_images import ENCODERS, load_manifest
+
+register = template.Library()
+
+# Width used for the plain ``src`` when the caller does not say how wide the image renders
+DEFAULT_SRC_WIDTH = 1280
+
+
+def _srcset(sizes):
+    return ', '.join(f'{static(name)} {width}w' for width, name, _ in sizes)
+
+
+def _formats(entry):
+    """(format, variants) pairs in the order browsers should try them"""
+    return [(name, entry['variants'][name]) for name in ENCODERS if name in entry['variants']]
+
+
+def _closest(sizes, width):
+    """Smallest variant at least ``width`` wide, or the largest there is"""
+    for size in sizes:
+        if size[0] >= width:
+            return size
+    return sizes[-1]
+
+
+@register.simple_tag
+def picture(path, alt='', sizes='100vw', width=None, loading='lazy', **attrs):
+    """``<picture>`` with AVIF/WebP sources and a fallback ``<img>`` for a static image.
+
+    ``sizes`` is passed through to the browser. ``width`` is the rendered width in
+    CSS pixels and picks the fallback ``src``. Any other keyword, such as ``class``,
+    becomes an attribute on the ``<img>``.
+    """
+    entry = load_manifest().get(path)
+    attributes = {'alt': alt, 'loading': loading, 'decoding': 'async', **attrs}
+    if entry is None:
+        return format_html('<img src="{}"{}>', static(path), _attributes(attributes))
+
+    fallback = entry['variants'][entry['fallback']]
+    attributes.update({
+        'srcset': _srcset(fallback),
+        'sizes': sizes,
+        'width': entry['width'],
+        'height': entry['height'],
+    })
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((ENCODERS[format_name]['mime'], _srcset(variants), sizes)
+         for format_name, variants in _formats(entry) if format_name != entry['fallback']),
+    )
+    src = static(_closest(fallback, int(width or DEFAULT_SRC_WIDTH))[1])
+    return format_html('<picture>{}<img src="{}"{}></picture>', sources, src, _attributes(attributes))
+
+
+@register.simple_tag
+def image_url(path, width=None, format=None):
+    """URL of one variant, for CSS backgrounds: the fallback format unless ``format`` is given"""
+    entry = load_manifest().get(path)
+    if entry is None:
+        return static(path)
+    variants = entry['variants'].get(format or entry['fallback']) or entry['variants'][entry['fallback']]
+    return static(_closest(variants, int(width or entry['width']))[1])
+
+
+@register.simple_tag
+def image_set(path, width=None):
+    """CSS ``image-set()`` listing every format of one size, best first"""
+    entry = load_manifest().get(path)
+    if entry is None:
+        return format_html('url("{}")', static(path))
+    target = int(width or entry['width'])
+    candidates = format_html_join(
+        ', ', 'url("{}") type("{}")',
+        ((static(_closest(variants, target)[1]), ENCODERS[format_name]['mime'])
+         for format_name, variants in _formats(entry)),
+    )
+    return format_html('image-set({})', candidates)
+
+
+def _attributes(attributes):
+    return format_html_join('', ' {}="{}"', ((key, value) for key, value in attributes.items() if value not in (None, '')))
@@ -0,0 +1,22 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from core import assets
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_css():
+    """The self-hosted stylesheet bundle, or the CDN stylesheets until it has been committed"""
+    if assets.bundle_exists(assets.BUNDLE_CSS):
+        return format_html('<link rel="stylesheet" href="{}">', static(assets.BUNDLE_CSS))
+    return format_html_join('\n', '<link rel="stylesheet" href="{}">', ((url,) for url in assets.CSS_SOURCES))
+
+
+@register.simple_tag
+def vendor_js():
+    """The self-hosted script bundle, or the CDN scripts until it has been committed"""
+    if assets.bundle_exists(assets.BUNDLE_JS):
+        return format_html('<script src="{}"></script>', static(assets.BUNDLE_JS))
+    return format_html_join('\n', '<script src="{}"></script>', ((url,) for url in assets.JS_SOURCES))
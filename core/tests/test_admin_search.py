@@ -0,0 +1,47 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib import admin
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from core import admin_search
+from core.management.commands.benchmark_admin_search import Command as BenchmarkCommand
+from core.models import Donation
+
+
+class IndexedSearchTests(TestCase):
+    def setUp(self):
+        self.model_admin = admin.site._registry[Donation]
+        self.request = RequestFactory().get('/admin/')
+        for i, (first, phone) in enumerate([('Priya', '9876543210'), ('Rohan', '9123456789')]):
+            Donation.objects.create(
+                first_name=first, last_name='Sharma', email=f'{first.lower()}@example.org', phone=phone,
+                amount=Decimal('500'), order_id=f'order_{i}', status='completed',
+            )
+
+    def search(self, term):
+        queryset, _ = self.model_admin.get_search_results(self.request, Donation.objects.all(), term)
+        return queryset
+
+    def test_phone_search_matches_a_prefix_through_the_index(self):
+        queryset = self.search('98765 43')
+        self.assertEqual([donation.first_name for donation in queryset], ['Priya'])
+        self.assertIn('donation_phone_idx', BenchmarkCommand().indexes_used(self.model_admin, self.request, Donation, '98765'))
+
+    def test_phone_search_on_postgresql_uses_the_trigram_expression(self):
+        # The trigram index is on UPPER(phone::text), which is what icontains emits and contains does not
+        with mock.patch.object(admin_search, 'connection', mock.Mock(vendor='postgresql')):
+            condition = self.model_admin.get_fast_path('98765 43210')
+        self.assertEqual(condition.children, [('phone__icontains', '9876543210')])
+
+    def test_name_search_uses_the_lower_indexes(self):
+        self.assertEqual([donation.first_name for donation in self.search('rohan')], ['Rohan'])
+        self.assertIn('donation_first_name_lower_idx', BenchmarkCommand().indexes_used(self.model_admin, self.request, Donation, 'rohan'))
+
+    def test_benchmark_reports_the_indexes_each_search_uses(self):
+        out = StringIO()
+        call_command('benchmark_admin_search', donations=50, applications=20, repeat=1, stdout=out)
+        self.assertIn('donation_phone_idx', out.getvalue())
+        self.assertIn('Seeded rows rolled back', out.getvalue())
@@ -0,0 +1,162 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.cache_backend import SQLiteCache
+
+
+def _increment(location, times):
+    cache = SQLiteCache(location, {})
+    for _ in range(times):
+        cache.incr('counter')
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.location = os.path.join(directory, 'cache.sqlite3')
+        self.cache = self.make_cache()
+
+    def make_cache(self, **options):
+        return SQLiteCache(self.location, {'OPTIONS': options})
+
+    def clock(self, start=1_000_000.0):
+        """Patch the backend's clock; returns a one-item list holding the current time"""
+        now = [start]
+        patcher = mock.patch('core.cache_backend.time.time', lambda: now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Django's timeout arithmetic uses the same time module
+        patcher = mock.patch('django.core.cache.backends.base.time.time', lambda: now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return now
+
+    def test_round_trips_values(self):
+        values = {'int': 42, 'big': 2 ** 70, 'str': 'text', 'dict': {'a': [1, 2]}, 'none': None, 'bool': True}
+        for key, value in values.items():
+            self.cache.set(key, value)
+        for key, value in values.items():
+            self.assertEqual(self.cache.get(key, 'missing'), value)
+            self.assertIs(type(self.cache.get(key)), type(value))
+        self.assertEqual(self.cache.get('absent', 'default'), 'default')
+
+    def test_entries_are_shared_between_instances(self):
+        self.cache.set('shared', 'value')
+        self.assertEqual(self.make_cache().get('shared'), 'value')
+
+    def test_expired_entries_are_invisible(self):
+        now = self.clock()
+        self.cache.set('short', 1, timeout=10)
+        self.cache.set('forever', 1, timeout=None)
+        now[0] += 11
+        self.assertIsNone(self.cache.get('short'))
+        self.assertFalse(self.cache.has_key('short'))
+        self.assertEqual(self.cache.get('forever'), 1)
+
+    def test_touch_extends_expiry(self):
+        now = self.clock()
+        self.cache.set('key', 'value', timeout=10)
+        self.assertTrue(self.cache.touch('key', timeout=100))
+        now[0] += 50
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertFalse(self.cache.touch('absent'))
+
+    def test_add_only_sets_missing_or_expired_keys(self):
+        now = self.clock()
+        self.assertTrue(self.cache.add('key', 'first', timeout=10))
+        self.assertFalse(self.cache.add('key', 'second'))
+        self.assertEqual(self.cache.get('key'), 'first')
+        now[0] += 11
+        self.assertTrue(self.cache.add('key', 'third'))
+        self.assertEqual(self.cache.get('key'), 'third')
+
+    def test_incr_and_decr(self):
+        self.cache.set('counter', 10)
+        self.assertEqual(self.cache.incr('counter'), 11)
+        self.assertEqual(self.cache.incr('counter', 5), 16)
+        self.assertEqual(self.cache.decr('counter', 6), 10)
+        with self.assertRaises(ValueError):
+            self.cache.incr('absent')
+        self.cache.set('text', 'abc')
+        with self.assertRaises(TypeError):
+            self.cache.incr('text')
+
+    def test_incr_does_not_resurrect_expired_keys(self):
+        now = self.clock()
+        self.cache.set('counter', 1, timeout=10)
+        now[0] += 11
+        with self.assertRaises(ValueError):
+            self.cache.incr('counter')
+
+    def test_incr_is_atomic_across_threads(self):
+        self.cache.set('counter', 0)
+        threads = [threading.Thread(target=_increment, args=(self.location, 100)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.get('counter'), 400)
+
+    def test_incr_is_atomic_across_processes(self):
+        self.cache.set('counter', 0)
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=_increment, args=(self.location, 100)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([process.exitcode for process in processes], [0] * 4)
+        self.assertEqual(self.cache.get('counter'), 400)
+
+    def test_many_and_delete(self):
+        self.cache.set_many({'a': 1, 'b': 'two'})
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 'two'})
+        self.assertTrue(self.cache.delete('a'))
+        self.assertFalse(self.cache.delete('a'))
+        self.cache.delete_many(['b'])
+        self.assertEqual(self.cache.get_many(['a', 'b']), {})
+
+    def test_versions_are_separate_keys(self):
+        self.cache.set('key', 'v1', version=1)
+        self.cache.set('key', 'v2', version=2)
+        self.assertEqual((self.cache.get('key', version=1), self.cache.get('key', version=2)), ('v1', 'v2'))
+
+    def test_cull_drops_expired_then_least_recently_used(self):
+        now = self.clock()
+        cache = self.make_cache(MAX_ENTRIES=10, CULL_FREQUENCY=2, CULL_EVERY=10 ** 9, ACCESS_RESOLUTION=0)
+        cache.set('expiring', 1, timeout=5)
+        for i in range(12):
+            now[0] += 1
+            cache.set(f'key{i}', i)
+        now[0] += 1
+        # Reading the oldest keys makes them the most recently used
+        for i in range(3):
+            cache.get(f'key{i}')
+
+        cache.cull()
+
+        remaining = cache.get_many([f'key{i}' for i in range(12)] + ['expiring'])
+        # 12 live rows over a limit of 10: drop the excess plus MAX_ENTRIES // CULL_FREQUENCY
+        self.assertEqual(len(remaining), 5)
+        self.assertNotIn('expiring', remaining)
+        self.assertTrue({'key0', 'key1', 'key2', 'key11'} <= set(remaining))
+
+    def test_cull_frequency_zero_clears_everything(self):
+        cache = self.make_cache(MAX_ENTRIES=2, CULL_FREQUENCY=0, CULL_EVERY=1)
+        for i in range(3):
+            cache.set(f'key{i}', i)
+        self.assertEqual(cache.get_many(['key0', 'key1', 'key2']), {})
+
+    def test_sets_cull_periodically(self):
+        cache = self.make_cache(MAX_ENTRIES=5, CULL_FREQUENCY=5, CULL_EVERY=1)
+        for i in range(50):
+            cache.set(f'key{i}', i)
+        count = cache._connection().execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+        self.assertLessEqual(count, 5)
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import dashboard
+from core.models import VolunteerApplication
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM, DASHBOARD_STATS_TTL=3600)
+class DashboardInvalidationTests(TestCase):
+    def setUp(self):
+        # LocMemCache outlives each test; start from an empty snapshot
+        dashboard.invalidate()
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.volunteers = [
+            VolunteerApplication.objects.create(
+                name=f'Volunteer {i}', email=f'v{i}@example.org', phone='9999999999',
+                area_of_interest='teaching', availability='Weekends',
+            )
+            for i in range(3)
+        ]
+
+    def test_bulk_volunteer_action_refreshes_the_snapshot(self):
+        self.assertEqual(dashboard.get_stats()['pending_volunteers'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('manage_volunteers'), {
+                'action': 'approve', 'volunteer_ids': [v.pk for v in self.volunteers[:2]],
+            })
+
+        stats = dashboard.get_stats()
+        self.assertEqual((stats['pending_volunteers'], stats['total_volunteers']), (1, 2))
+
+    def test_admin_bulk_action_refreshes_the_snapshot(self):
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.org', 'password'))
+        self.assertEqual(dashboard.get_stats()['pending_volunteers'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:core_volunteerapplication_changelist'), {
+                'action': 'reject_volunteers', '_selected_action': [self.volunteers[0].pk],
+            })
+
+        self.assertEqual(dashboard.get_stats()['pending_volunteers'], 2)
+
+
+# Tests do not run collectstatic, so there is no manifest to render pages against
+@override_settings(CACHES=LOCMEM, STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdminPageStylesheetTests(TestCase):
+    def test_page_stylesheets_load_in_the_head(self):
+        # A stylesheet linked from the body renders the page unstyled first
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        for name, stylesheet in [('admin_dashboard', 'css/admin_dashboard.css'), ('create_job', 'css/create_job.css')]:
+            with self.subTest(name=name):
+                html = self.client.get(reverse(name)).content.decode()
+                self.assertLess(html.index(stylesheet), html.index('</head>'))
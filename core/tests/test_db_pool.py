@@ -0,0 +1,261 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from unittest import mock
+
+from django.core.signals import request_finished
+from django.db import connections
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from core import db_pool
+from core.models import EmailOutbox
+
+
+def forget_pool(alias):
+    pool = db_pool._pools.pop((os.getpid(), alias), None)
+    if pool is not None:
+        pool.close_all()
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'pool.sqlite3')
+        self.failures = 0
+
+    def connect(self):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError('database is down')
+        # Pooled connections move between threads, as with Django's own sqlite3 backend
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def make_pool(self, **kwargs):
+        pool = db_pool.ConnectionPool('test', self.connect, **kwargs)
+        self.addCleanup(pool.close_all)
+        return pool
+
+    def clock(self):
+        """Patch the pool's monotonic clock; returns a one-item list holding the current time"""
+        now = [1000.0]
+        patcher = mock.patch('core.db_pool.time.monotonic', lambda: now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return now
+
+    def test_released_connection_is_reused(self):
+        pool = self.make_pool(min_size=1, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        stats = pool.stats()
+        self.assertEqual((stats['opened'], stats['checkouts'], stats['in_use'], stats['idle']), (1, 2, 1, 0))
+
+    def test_first_checkout_opens_min_size(self):
+        pool = self.make_pool(min_size=3, max_size=5)
+        pool.acquire()
+        stats = pool.stats()
+        self.assertEqual((stats['size'], stats['idle'], stats['in_use']), (3, 2, 1))
+
+    def test_exhausted_pool_times_out(self):
+        pool = self.make_pool(min_size=1, max_size=1, timeout=0.05)
+        pool.acquire()
+        with self.assertRaises(db_pool.PoolTimeout):
+            pool.acquire()
+        stats = pool.stats()
+        self.assertEqual((stats['timeouts'], stats['waiting'], stats['size']), (1, 0, 1))
+
+    def test_release_hands_the_connection_to_a_waiting_thread(self):
+        pool = self.make_pool(min_size=1, max_size=1, timeout=5)
+        held = pool.acquire()
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+        waiter.start()
+        while pool.stats()['waiting'] == 0:
+            threading.Event().wait(0.001)
+        pool.release(held)
+        waiter.join()
+        self.assertEqual(received, [held])
+        self.assertEqual(pool.stats()['opened'], 1)
+
+    def test_discarded_connection_frees_a_slot_for_a_waiter(self):
+        pool = self.make_pool(min_size=1, max_size=1, timeout=5)
+        held = pool.acquire()
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+        waiter.start()
+        while pool.stats()['waiting'] == 0:
+            threading.Event().wait(0.001)
+        held.close()
+        pool.release(held)
+        waiter.join()
+        self.assertEqual(len(received), 1)
+        self.assertIsNot(received[0], held)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_pre_ping_replaces_a_dead_connection(self):
+        pool = self.make_pool(min_size=1, max_size=1)
+        first = pool.acquire()
+        pool.release(first)
+        # The server went away while the connection sat idle
+        first.close()
+        second = pool.acquire()
+        self.assertIsNot(second, first)
+        self.assertEqual(second.execute('SELECT 1').fetchone(), (1,))
+        self.assertEqual(pool.stats()['ping_failures'], 1)
+
+    def test_broken_connection_is_closed_on_release(self):
+        pool = self.make_pool(min_size=1, max_size=2)
+        connection = pool.acquire()
+        connection.close()
+        pool.release(connection)
+        stats = pool.stats()
+        self.assertEqual((stats['size'], stats['recycled']), (0, 1))
+
+    def test_release_rolls_back_an_open_transaction(self):
+        pool = self.make_pool(min_size=1, max_size=1)
+        connection = pool.acquire()
+        connection.execute('CREATE TABLE item (name TEXT)')
+        connection.commit()
+        connection.execute("INSERT INTO item VALUES ('left open')")
+        self.assertTrue(connection.in_transaction)
+        pool.release(connection)
+        reused = pool.acquire()
+        self.assertIs(reused, connection)
+        self.assertFalse(reused.in_transaction)
+        self.assertEqual(reused.execute('SELECT COUNT(*) FROM item').fetchone(), (0,))
+
+    def test_old_connections_are_recycled(self):
+        now = self.clock()
+        pool = self.make_pool(min_size=1, max_size=1, max_lifetime=60)
+        first = pool.acquire()
+        pool.release(first)
+        now[0] += 61
+        self.assertIsNot(pool.acquire(), first)
+        self.assertEqual(pool.stats()['recycled'], 1)
+
+    def test_idle_connections_above_min_size_are_closed(self):
+        now = self.clock()
+        pool = self.make_pool(min_size=1, max_size=3, max_idle=10)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        now[0] += 11
+        pool.release(second)
+        stats = pool.stats()
+        self.assertEqual((stats['size'], stats['idle'], stats['recycled']), (1, 1, 1))
+
+    def test_failed_connect_gives_back_the_slot(self):
+        pool = self.make_pool(min_size=1, max_size=1)
+        self.failures = 1
+        with self.assertRaises(sqlite3.OperationalError):
+            pool.acquire()
+        self.assertEqual(pool.stats()['size'], 0)
+        pool.acquire()
+        self.assertEqual(pool.stats()['size'], 1)
+
+
+class PoolRegistryTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'pool.sqlite3')
+
+    def test_get_pool_reads_options_and_is_shared(self):
+        self.addCleanup(forget_pool, 'registry')
+        options = {'MIN_SIZE': 2, 'MAX_SIZE': 4, 'PRE_PING': False}
+        pool = db_pool.get_pool('registry', lambda: sqlite3.connect(self.path), options)
+        self.assertIs(db_pool.get_pool('registry', None, {}), pool)
+        self.assertEqual((pool.min_size, pool.max_size, pool.pre_ping), (2, 4, False))
+
+    def test_render_metrics_exports_each_pool(self):
+        self.addCleanup(forget_pool, 'metrics')
+        pool = db_pool.get_pool('metrics', lambda: sqlite3.connect(self.path), {'MIN_SIZE': 1})
+        pool.release(pool.acquire())
+        metrics = db_pool.render_metrics()
+        self.assertIn('db_pool_checkouts_total{pool="metrics"} 1', metrics)
+        self.assertIn('db_pool_idle{pool="metrics"} 1', metrics)
+        self.assertIn('db_pool_wait_seconds', metrics)
+
+    def test_pooled_backend_returns_connections_on_close(self):
+        alias = 'pooled'
+        self.addCleanup(forget_pool, alias)
+        handler = ConnectionHandler({
+            'default': {},
+            alias: {'ENGINE': 'core.db_backends.sqlite3', 'NAME': self.path, 'POOL': {'MIN_SIZE': 1, 'MAX_SIZE': 1}},
+        })
+        wrapper = handler[alias]
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        self.assertEqual(wrapper.pool.stats()['idle'], 1)
+        wrapper.ensure_connection()
+        self.assertIs(wrapper.connection, raw)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            self.assertEqual(cursor.fetchone(), (1,))
+
+
+class PooledEngineTests(SimpleTestCase):
+    """The DB_POOL engine behind Django's own connection handling"""
+    alias = 'pooled'
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        connections.settings[self.alias] = connections.configure_settings({
+            'default': {},
+            self.alias: {
+                'ENGINE': 'core.db_backends.sqlite3', 'NAME': os.path.join(directory, 'pool.sqlite3'),
+                # What settings.py sets with DB_POOL=true
+                'CONN_MAX_AGE': 0, 'POOL': {'MIN_SIZE': 1, 'MAX_SIZE': 1},
+            },
+        })[self.alias]
+        self.addCleanup(self.remove_alias)
+        with connections[self.alias].schema_editor() as editor:
+            editor.create_model(EmailOutbox)
+        connections[self.alias].close()
+
+    def remove_alias(self):
+        connections[self.alias].close()
+        del connections[self.alias]
+        del connections.settings[self.alias]
+        forget_pool(self.alias)
+
+    def queue(self):
+        EmailOutbox.objects.using(self.alias).create(subject='Subject', body='Body', to='r@example.org')
+        return EmailOutbox.objects.using(self.alias).count()
+
+    def test_orm_connection_goes_back_to_the_pool_on_close(self):
+        wrapper = connections[self.alias]
+        self.queue()
+        raw = wrapper.connection
+        self.assertEqual((wrapper.pool.stats()['in_use'], wrapper.pool.stats()['idle']), (1, 0))
+
+        wrapper.close()
+        self.assertIsNone(wrapper.connection)
+        self.assertEqual((wrapper.pool.stats()['in_use'], wrapper.pool.stats()['idle']), (0, 1))
+
+        self.assertEqual(self.queue(), 2)
+        self.assertIs(wrapper.connection, raw)
+        self.assertEqual(wrapper.pool.stats()['opened'], 1)
+
+    def test_end_of_request_returns_the_connection(self):
+        wrapper = connections[self.alias]
+        self.queue()
+        # What the handler sends once a response is closed; close_old_connections
+        # closes every CONN_MAX_AGE=0 connection
+        request_finished.send(sender=self.__class__)
+        self.assertIsNone(wrapper.connection)
+        self.assertEqual((wrapper.pool.stats()['in_use'], wrapper.pool.stats()['idle']), (0, 1))
+
+    def test_uncommitted_work_is_rolled_back_when_returned(self):
+        wrapper = connections[self.alias]
+        wrapper.set_autocommit(False)
+        self.queue()
+        wrapper.close()
+        self.assertEqual(EmailOutbox.objects.using(self.alias).count(), 0)
@@ -0,0 +1,119 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import Donation, DonationDailyRollup, DonorLeaderboard
+
+
+def make_donation(order_id, amount='100.00', email='donor@example.org', show_name=True, cause='education', **fields):
+    return Donation.objects.create(
+        order_id=order_id, amount=Decimal(amount), email=email, first_name='Asha', last_name='Rao',
+        show_name=show_name, cause=cause, **fields,
+    )
+
+
+class DonationCompleteTests(TestCase):
+    def test_complete_is_idempotent(self):
+        make_donation('order_1')
+
+        donation, newly = Donation.complete('order_1', 'pay_1', 'sig')
+        again, newly_again = Donation.complete('order_1', 'pay_other')
+
+        self.assertTrue(newly)
+        self.assertFalse(newly_again)
+        self.assertEqual(again.payment_id, 'pay_1')
+        entry = DonorLeaderboard.objects.get()
+        self.assertEqual((entry.total_amount, entry.donation_count), (Decimal('100.00'), 1))
+        rollup = DonationDailyRollup.objects.get()
+        self.assertEqual((rollup.total_amount, rollup.donation_count), (Decimal('100.00'), 1))
+
+    def test_unknown_order_raises(self):
+        with self.assertRaises(Donation.DoesNotExist):
+            Donation.complete('missing', 'pay_1')
+
+    def test_pending_donations_are_not_counted(self):
+        make_donation('order_1')
+        self.assertFalse(DonorLeaderboard.objects.exists())
+        self.assertFalse(DonationDailyRollup.objects.exists())
+
+
+class DonorLeaderboardTests(TestCase):
+    def test_donations_are_grouped_by_normalised_email(self):
+        make_donation('order_1', '100', email='Donor@Example.org')
+        make_donation('order_2', '250', email='donor@example.org ')
+        Donation.complete('order_1', 'pay_1')
+        Donation.complete('order_2', 'pay_2')
+
+        entry = DonorLeaderboard.objects.get()
+        self.assertEqual(entry.donor_key, 'donor@example.org')
+        self.assertEqual((entry.total_amount, entry.donation_count), (Decimal('350.00'), 2))
+
+    def test_donations_without_email_fall_back_to_the_user(self):
+        user = User.objects.create_user('asha')
+        make_donation('order_1', email='', user=user)
+        Donation.complete('order_1', 'pay_1')
+        self.assertEqual(DonorLeaderboard.objects.get().donor_key, f'user:{user.pk}')
+
+    def test_named_donation_does_not_reveal_earlier_anonymous_ones(self):
+        make_donation('order_1', show_name=False)
+        make_donation('order_2', show_name=True)
+        Donation.complete('order_1', 'pay_1')
+        Donation.complete('order_2', 'pay_2')
+
+        entry = DonorLeaderboard.objects.get()
+        self.assertFalse(entry.show_name)
+        self.assertEqual(entry.get_display_name(), 'Anonymous Donor')
+
+    def test_anonymous_donation_hides_earlier_named_ones(self):
+        make_donation('order_1', show_name=True)
+        make_donation('order_2', show_name=False)
+        Donation.complete('order_1', 'pay_1')
+        Donation.complete('order_2', 'pay_2')
+        self.assertFalse(DonorLeaderboard.objects.get().show_name)
+
+    def test_rebuild_matches_incremental_bookkeeping(self):
+        make_donation('order_1', '100', show_name=False)
+        make_donation('order_2', '50', show_name=True)
+        make_donation('order_3', '75', email='other@example.org')
+        for order in ('order_1', 'order_2', 'order_3'):
+            Donation.complete(order, f'pay_{order}')
+        incremental = set(DonorLeaderboard.objects.values_list('donor_key', 'total_amount', 'donation_count', 'show_name'))
+
+        call_command('rebuild_leaderboard', stdout=StringIO())
+
+        rebuilt = set(DonorLeaderboard.objects.values_list('donor_key', 'total_amount', 'donation_count', 'show_name'))
+        self.assertEqual(rebuilt, incremental)
+
+    def test_rebuild_locks_the_leaderboard_before_summing(self):
+        make_donation('order_1')
+        Donation.complete('order_1', 'pay_1')
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command('rebuild_leaderboard', stdout=StringIO())
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        table = DonorLeaderboard._meta.db_table
+        lock = next(i for i, sql in enumerate(statements) if sql.startswith(('LOCK TABLE', f'DELETE FROM "{table}"')))
+        first_read = next(i for i, sql in enumerate(statements) if 'FROM "core_donation"' in sql)
+        self.assertLess(lock, first_read)
+        self.assertEqual(DonorLeaderboard.objects.get().donation_count, 1)
+
+
+class DonationDailyRollupTests(TestCase):
+    def test_rollup_tracks_count_total_and_range_per_cause(self):
+        for order, amount, cause in [('o1', '100', 'education'), ('o2', '40', 'education'), ('o3', '500', 'healthcare')]:
+            make_donation(order, amount, cause=cause)
+            Donation.complete(order, f'pay_{order}')
+
+        today = timezone.localdate()
+        education = DonationDailyRollup.objects.get(day=today, cause='education')
+        self.assertEqual(education.donation_count, 2)
+        self.assertEqual(education.total_amount, Decimal('140.00'))
+        self.assertEqual((education.min_amount, education.max_amount), (Decimal('40.00'), Decimal('100.00')))
+        self.assertEqual(DonationDailyRollup.objects.get(day=today, cause='healthcare').total_amount, Decimal('500.00'))
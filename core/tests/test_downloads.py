@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Job, JobApplication
+
+
+@override_settings(PROTECTED_MEDIA_OFFLOAD='')
+class DownloadResumeTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings = override_settings(MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.job = Job.objects.create(title='Teacher', description='-', requirements='-', location='Pune')
+
+    def download(self, name, content, **headers):
+        name = default_storage.save(name, ContentFile(content))
+        application = JobApplication.objects.create(
+            job=self.job, name='Priya Sharma', email=f'{name.replace("/", "-")}@example.org', phone='9999999999',
+            cover_letter='-', resume=name,
+        )
+        response = self.client.get(reverse('download_resume', args=[application.pk]), headers=headers)
+        self.addCleanup(response.close)
+        return response
+
+    def test_documents_are_sent_as_attachments(self):
+        response = self.download('resumes/cv.pdf', b'%PDF-1.4 resume')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="priya-sharma-resume.pdf"')
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 resume')
+
+    def test_renderable_types_are_sent_as_octet_stream(self):
+        # Resumes stored before uploads were type-checked can have any extension
+        for name in ['resumes/cv.html', 'resumes/cv.svg']:
+            with self.subTest(name=name):
+                response = self.download(name, b'<script>alert(1)</script>')
+                self.assertEqual(response['Content-Type'], 'application/octet-stream')
+                self.assertTrue(response['Content-Disposition'].startswith('attachment;'))
+                self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+    def test_partial_content_keeps_the_safe_headers(self):
+        response = self.download('resumes/cv.html', b'<script>alert(1)</script>', Range='bytes=0-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertTrue(response['Content-Disposition'].startswith('attachment;'))
+
+    @override_settings(PROTECTED_MEDIA_OFFLOAD='x-accel-redirect')
+    def test_offloaded_downloads_are_attachments_too(self):
+        response = self.download('resumes/cv.svg', b'<svg/>')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/resumes/cv.svg')
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertTrue(response['Content-Disposition'].startswith('attachment;'))
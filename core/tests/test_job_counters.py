@@ -0,0 +1,85 @@
+from django.test import TestCase
+
+from core.models import Job, JobApplication
+
+STATUSES = [status for status, _ in JobApplication.STATUS_CHOICES]
+
+
+class JobApplicationCounterTests(TestCase):
+    def setUp(self):
+        self.job = self.make_job('Teacher')
+        self.other = self.make_job('Nurse')
+
+    def make_job(self, title):
+        return Job.objects.create(title=title, description='-', requirements='-', location='Pune')
+
+    def apply(self, job, n, status='pending'):
+        return JobApplication.objects.create(
+            job=job, name=f'Applicant {n}', email=f'a{n}@example.org', phone='9999999999', cover_letter='-', status=status,
+        )
+
+    def assertCountersMatch(self, *jobs):
+        for job in jobs:
+            job.refresh_from_db()
+            applications = JobApplication.objects.filter(job=job)
+            self.assertEqual(job.application_count, applications.count())
+            for status in STATUSES:
+                self.assertEqual(getattr(job, f'{status}_count'), applications.filter(status=status).count(), status)
+
+    def test_create_save_and_delete_keep_counters_in_sync(self):
+        first = self.apply(self.job, 1)
+        second = self.apply(self.job, 2, status='reviewed')
+        first.status = 'shortlisted'
+        first.save()
+        second.delete()
+        self.assertCountersMatch(self.job)
+        self.assertEqual((self.job.application_count, self.job.shortlisted_count), (1, 1))
+
+    def test_moving_an_application_between_jobs(self):
+        application = self.apply(self.job, 1)
+        application.job = self.other
+        application.status = 'reviewed'
+        application.save()
+        self.assertCountersMatch(self.job, self.other)
+
+    def test_set_status_does_not_drift(self):
+        for n in range(4):
+            self.apply(self.job, n, status=STATUSES[n % len(STATUSES)])
+        for n in range(4, 7):
+            self.apply(self.other, n)
+
+        updated = JobApplication.objects.all().set_status('rejected')
+        self.assertEqual(updated, 6)
+        # Applying it again touches nothing: rows already in the target status are skipped
+        self.assertEqual(JobApplication.objects.all().set_status('rejected'), 0)
+        self.assertCountersMatch(self.job, self.other)
+        self.assertEqual(self.job.rejected_count, 4)
+
+    def test_set_status_then_instance_save_is_not_double_counted(self):
+        application = self.apply(self.job, 1)
+        JobApplication.objects.filter(pk=application.pk).set_status('reviewed')
+        fresh = JobApplication.objects.get(pk=application.pk)
+        fresh.status = 'shortlisted'
+        fresh.save()
+        self.assertCountersMatch(self.job)
+
+    def test_recount_repairs_drifted_counters(self):
+        self.apply(self.job, 1)
+        self.apply(self.job, 2)
+        Job.objects.filter(pk=self.job.pk).update(application_count=9, pending_count=0)
+
+        self.assertEqual(Job.recount_applications(), 1)
+        self.assertCountersMatch(self.job, self.other)
+        self.assertEqual(Job.recount_applications(), 0)
+
+    def test_decrementing_a_drifted_counter_stops_at_zero(self):
+        application = self.apply(self.job, 1)
+        Job.objects.filter(pk=self.job.pk).update(pending_count=0)
+
+        # Without the clamp this UPDATE would break the positive-integer check
+        JobApplication.objects.filter(pk=application.pk).set_status('reviewed')
+        application.refresh_from_db()
+        application.delete()
+
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.pending_count, self.job.reviewed_count, self.job.application_count), (0, 0, 0))
@@ -0,0 +1,122 @@
+import smtplib
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.management.commands import send_outbox
+from core.models import EmailOutbox, Job, JobApplication
+
+
+class ApplicationStatusEmailTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.job = Job.objects.create(title='Teacher', description='-', requirements='-', location='Pune')
+        self.applications = [
+            JobApplication.objects.create(
+                job=self.job, name=f'Applicant {i}', email=f'a{i}@example.org', phone='9999999999', cover_letter='-',
+            )
+            for i in range(2)
+        ]
+
+    def set_status(self, status, applications):
+        return self.client.post(reverse('manage_applications', args=[self.job.pk]), {
+            'status': status, 'application_ids': [application.pk for application in applications],
+        })
+
+    def test_status_change_queues_one_email_per_applicant(self):
+        self.set_status('shortlisted', self.applications)
+        self.assertEqual(
+            sorted(EmailOutbox.objects.values_list('to', 'subject')),
+            [('a0@example.org', 'Application Update - Teacher'), ('a1@example.org', 'Application Update - Teacher')],
+        )
+        self.assertEqual(mail.outbox, [])
+
+    def test_unchanged_or_silent_statuses_queue_nothing(self):
+        self.set_status('reviewed', self.applications)
+        self.assertFalse(EmailOutbox.objects.exists())
+        self.set_status('rejected', self.applications[:1])
+        self.set_status('rejected', self.applications[:1])
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+
+@override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=3, EMAIL_OUTBOX_BACKOFF=60, EMAIL_OUTBOX_MAX_BACKOFF=100, EMAIL_OUTBOX_LEASE=300)
+class SendOutboxTests(TestCase):
+    def enqueue(self, n=1, **fields):
+        return [
+            EmailOutbox.objects.create(subject=f'Subject {i}', body='Body', to=f'r{i}@example.org', **fields)
+            for i in range(n)
+        ]
+
+    def send(self):
+        call_command('send_outbox', stdout=StringIO(), stderr=StringIO())
+
+    def fail_sends(self):
+        return mock.patch.object(send_outbox.EmailMessage, 'send', side_effect=smtplib.SMTPException('refused'))
+
+    def test_delivers_due_messages(self):
+        message, = self.enqueue()
+        self.send()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('sent', 1))
+        self.assertIsNotNone(message.sent_at)
+        self.assertEqual([sent.to for sent in mail.outbox], [['r0@example.org']])
+
+    def test_future_messages_wait(self):
+        self.enqueue(next_attempt_at=timezone.now() + timedelta(minutes=5))
+        self.send()
+        self.assertEqual(mail.outbox, [])
+
+    def test_claim_leases_the_batch(self):
+        self.enqueue(3)
+        before = timezone.now()
+        batch = send_outbox.Command().claim(2)
+        self.assertEqual(len(batch), 2)
+        leased = EmailOutbox.objects.filter(id__in=[message.id for message in batch])
+        self.assertTrue(all(message.next_attempt_at >= before + timedelta(seconds=300) for message in leased))
+        # A second worker only gets what was not leased
+        self.assertEqual([message.id for message in send_outbox.Command().claim(5)], [
+            message.id for message in EmailOutbox.objects.exclude(id__in=leased).order_by('id')
+        ])
+
+    def test_failure_backs_off_with_jitter(self):
+        message, = self.enqueue()
+        before = timezone.now()
+        with self.fail_sends():
+            self.send()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.last_error), ('pending', 1, 'refused'))
+        self.assertGreaterEqual(message.next_attempt_at, before + timedelta(seconds=30))
+        self.assertLessEqual(message.next_attempt_at, timezone.now() + timedelta(seconds=60))
+
+    def test_backoff_is_capped(self):
+        message, = self.enqueue(attempts=1)
+        with self.fail_sends():
+            self.send()
+        message.refresh_from_db()
+        # 60 * 2 would be 120s; the cap is 100
+        self.assertLessEqual(message.next_attempt_at, timezone.now() + timedelta(seconds=100))
+
+    def test_gives_up_after_max_attempts(self):
+        message, = self.enqueue(attempts=2)
+        with self.fail_sends():
+            self.send()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('failed', 3))
+        self.send()
+        self.assertEqual(mail.outbox, [])
+
+    def test_unreachable_server_defers_the_whole_batch(self):
+        messages = self.enqueue(2)
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=OSError('no route')):
+            self.send()
+        self.assertEqual(
+            list(EmailOutbox.objects.filter(id__in=[m.id for m in messages]).values_list('status', 'attempts')),
+            [('pending', 1), ('pending', 1)],
+        )
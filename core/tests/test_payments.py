@@ -0,0 +1,228 @@
+import threading
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import razorpay
+import requests
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import payments
+from core.management.commands import fake_razorpay_server
+from core.models import Donation
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def fail(self, breaker, times):
+        for _ in range(times):
+            breaker.before_call()
+            breaker.record_failure()
+
+    def test_opens_after_threshold_consecutive_failures(self):
+        breaker = payments.CircuitBreaker(threshold=3, reset_after=60)
+        self.fail(breaker, 2)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+        self.fail(breaker, 1)
+        self.assertEqual(breaker.state, breaker.OPEN)
+        with self.assertRaises(payments.GatewayUnavailable):
+            breaker.before_call()
+
+    def test_success_resets_the_failure_count(self):
+        breaker = payments.CircuitBreaker(threshold=3, reset_after=60)
+        self.fail(breaker, 2)
+        breaker.record_success()
+        self.fail(breaker, 2)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+    def test_half_open_lets_one_trial_call_through(self):
+        breaker = payments.CircuitBreaker(threshold=1, reset_after=0)
+        self.fail(breaker, 1)
+        breaker.before_call()
+        self.assertEqual(breaker.state, breaker.HALF_OPEN)
+        with self.assertRaises(payments.GatewayUnavailable):
+            breaker.before_call()
+
+    def test_half_open_trial_outcome_closes_or_reopens(self):
+        breaker = payments.CircuitBreaker(threshold=1, reset_after=0)
+        self.fail(breaker, 1)
+        breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, breaker.OPEN)
+
+        breaker.before_call()
+        breaker.record_success()
+        self.assertEqual(breaker.state, breaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+
+@override_settings(RAZORPAY_MAX_RETRIES=1, RAZORPAY_RETRY_BACKOFF=0)
+class CallTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = payments.CircuitBreaker(threshold=2, reset_after=60)
+        patcher = mock.patch.object(payments, '_breaker', self.breaker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retries_transport_errors_then_raises_gateway_error(self):
+        func = mock.Mock(side_effect=requests.ConnectionError('down'))
+        with self.assertRaises(payments.GatewayError):
+            payments._call('test', func)
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(self.breaker.state, self.breaker.OPEN)
+
+    def test_retry_that_succeeds_closes_the_breaker(self):
+        func = mock.Mock(side_effect=[requests.ConnectionError('blip'), {'id': 'order_1'}])
+        self.assertEqual(payments._call('test', func), {'id': 'order_1'})
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_read_timeout_is_not_retried(self):
+        func = mock.Mock(side_effect=requests.ReadTimeout('slow'))
+        with self.assertRaises(payments.GatewayTimeout):
+            payments._call('test', func)
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(self.breaker.failures, 1)
+
+    def test_rejected_request_counts_as_healthy(self):
+        self.breaker.record_failure()
+        func = mock.Mock(side_effect=razorpay.errors.BadRequestError('bad amount'))
+        with self.assertRaises(razorpay.errors.BadRequestError):
+            payments._call('test', func)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_unexpected_errors_count_as_failures(self):
+        for error in (razorpay.errors.GatewayError('boom'), KeyError('id')):
+            with self.assertRaises(type(error)):
+                payments._call('test', mock.Mock(side_effect=error))
+        self.assertEqual(self.breaker.state, self.breaker.OPEN)
+
+    def test_unexpected_error_reopens_a_half_open_breaker(self):
+        breaker = payments.CircuitBreaker(threshold=1, reset_after=0)
+        breaker.record_failure()
+        with mock.patch.object(payments, '_breaker', breaker):
+            with self.assertRaises(TypeError):
+                payments._call('test', mock.Mock(side_effect=TypeError('bad response')))
+        self.assertEqual(breaker.state, breaker.OPEN)
+
+
+class PaymentSuccessTests(TestCase):
+    def setUp(self):
+        self.gateway = payments.StubGateway('test-secret')
+        for name, value in [('_client', self.gateway), ('_breaker', payments.CircuitBreaker(1, 60))]:
+            patcher = mock.patch.object(payments, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.donation = Donation.objects.create(order_id='order_1', amount=Decimal('500'), email='donor@example.org')
+
+    def post(self, signature):
+        return self.client.post(reverse('payment_success'), {
+            'razorpay_order_id': 'order_1',
+            'razorpay_payment_id': 'pay_1',
+            'razorpay_signature': signature,
+        })
+
+    def test_valid_signature_completes_the_donation(self):
+        response = self.post(self.gateway.sign('order_1', 'pay_1'))
+        self.assertRedirects(response, reverse('donation_success', args=[self.donation.pk]), fetch_redirect_response=False)
+        self.donation.refresh_from_db()
+        self.assertEqual((self.donation.status, self.donation.payment_id), ('completed', 'pay_1'))
+
+    def test_invalid_signature_is_rejected(self):
+        response = self.post('forged')
+        self.assertRedirects(response, reverse('donate'), fetch_redirect_response=False)
+        self.donation.refresh_from_db()
+        self.assertEqual(self.donation.status, 'pending')
+
+    def test_open_breaker_does_not_block_verification(self):
+        payments._breaker.record_failure()
+        self.assertEqual(payments._breaker.state, payments._breaker.OPEN)
+        self.post(self.gateway.sign('order_1', 'pay_1'))
+        self.donation.refresh_from_db()
+        self.assertEqual(self.donation.status, 'completed')
+        self.assertEqual(payments._breaker.state, payments._breaker.OPEN)
+
+
+@override_settings(
+    RAZORPAY_GATEWAY='razorpay', RAZORPAY_KEY_ID='rzp_test', RAZORPAY_KEY_SECRET='secret',
+    RAZORPAY_MAX_RETRIES=1, RAZORPAY_RETRY_BACKOFF=0, RAZORPAY_CONNECT_TIMEOUT=1, RAZORPAY_READ_TIMEOUT=0.2,
+)
+class FakeGatewayTests(SimpleTestCase):
+    """The real razorpay client and TimeoutSession against manage.py fake_razorpay_server"""
+
+    def setUp(self):
+        self.breaker = payments.CircuitBreaker(threshold=2, reset_after=60)
+        # None makes get_client() build the real client against the fake server
+        for name, value in [('_client', None), ('_breaker', self.breaker)]:
+            patcher = mock.patch.object(payments, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # The razorpay client prints every transport error
+        patcher = mock.patch('razorpay.client.print', create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def serve(self, **options):
+        server = fake_razorpay_server.make_server(**options)
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        patcher = override_settings(RAZORPAY_BASE_URL=url)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        return server
+
+    def test_creates_orders_over_http_with_default_timeouts(self):
+        server = self.serve()
+        order = payments.create_order({'amount': 50000, 'currency': 'INR'})
+        self.assertEqual(order['amount'], 50000)
+        self.assertIn(order['id'], server.RequestHandlerClass.orders)
+        session = payments.get_client().session
+        self.assertIsInstance(session, payments.TimeoutSession)
+        self.assertEqual(session.default_timeout, (1, 0.2))
+
+    def test_slow_gateway_times_out_without_retrying(self):
+        self.serve(latency=0.5)
+        with self.assertRaises(payments.GatewayTimeout):
+            payments.create_order({'amount': 50000})
+        self.assertEqual(self.breaker.failures, 1)
+
+    def test_server_errors_are_retried_then_open_the_breaker(self):
+        self.serve(error_rate=1.0)
+        with self.assertRaises(payments.GatewayError):
+            payments.create_order({'amount': 50000})
+        self.assertEqual(self.breaker.state, self.breaker.OPEN)
+        with self.assertRaises(payments.GatewayUnavailable):
+            payments.create_order({'amount': 50000})
+
+    def test_refused_connection_is_a_gateway_error(self):
+        server = self.serve()
+        server.shutdown()
+        server.server_close()
+        with self.assertRaises(payments.GatewayError):
+            payments.create_order({'amount': 50000})
+        self.assertEqual(self.breaker.state, self.breaker.OPEN)
+
+    def test_bad_request_leaves_the_breaker_closed(self):
+        self.serve()
+        self.breaker.record_failure()
+        with self.assertRaises(razorpay.errors.BadRequestError):
+            payments._call('order.fetch', payments.get_client().order.fetch, 'order_missing')
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_lists_payments(self):
+        self.serve()
+        self.assertEqual(payments.list_payments(0, 100)['items'], [])
+
+    def test_loadtest_runs_against_a_local_base_url_without_allow_live(self):
+        server = self.serve()
+        out = StringIO()
+        url = f'http://localhost:{server.server_address[1]}'
+        call_command('loadtest_gateway', '--requests', '4', '--concurrency', '2', '--base-url', url, stdout=out)
+        self.assertIn('      ok: 4', out.getvalue())
+
+    def test_loadtest_refuses_a_remote_base_url(self):
+        with self.assertRaises(CommandError):
+            call_command('loadtest_gateway', '--base-url', 'https://api.razorpay.com', stdout=StringIO())
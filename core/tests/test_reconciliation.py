@@ -0,0 +1,220 @@
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import payments
+from core.models import Donation, DonorLeaderboard
+
+WEBHOOK_SECRET = 'webhook-secret'
+
+
+def make_donation(order_id, age=timedelta(hours=1), status='pending'):
+    donation = Donation.objects.create(order_id=order_id, amount=Decimal('100'), email='donor@example.org', status=status)
+    Donation.objects.filter(pk=donation.pk).update(created_at=timezone.now() - age)
+    return donation
+
+
+def payment(payment_id, order_id, status, created_at=None):
+    if created_at is None:
+        created_at = int(timezone.now().timestamp()) - 600
+    return {'id': payment_id, 'order_id': order_id, 'status': status, 'created_at': created_at}
+
+
+class StubGatewayMixin:
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(payments, '_client', payments.StubGateway('test-secret'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+@override_settings(RAZORPAY_WEBHOOK_SECRET=WEBHOOK_SECRET)
+class RazorpayWebhookTests(StubGatewayMixin, TestCase):
+    def send(self, event, entity, signature=None):
+        body = json.dumps({'event': event, 'payload': {'payment': {'entity': entity}}})
+        if signature is None:
+            signature = hmac.new(WEBHOOK_SECRET.encode(), body.encode(), hashlib.sha256).hexdigest()
+        return self.client.post(
+            reverse('razorpay_webhook'), body, content_type='application/json', HTTP_X_RAZORPAY_SIGNATURE=signature,
+        )
+
+    def test_captured_payment_completes_the_donation_once(self):
+        donation = make_donation('order_1')
+        for _ in range(2):
+            response = self.send('payment.captured', payment('pay_1', 'order_1', 'captured'))
+            self.assertEqual(response.content, b'OK')
+        donation.refresh_from_db()
+        self.assertEqual((donation.status, donation.payment_id), ('completed', 'pay_1'))
+        self.assertEqual(DonorLeaderboard.objects.get().donation_count, 1)
+
+    def test_bad_signature_is_rejected(self):
+        donation = make_donation('order_1')
+        response = self.send('payment.captured', payment('pay_1', 'order_1', 'captured'), signature='forged')
+        self.assertEqual(response.status_code, 400)
+        donation.refresh_from_db()
+        self.assertEqual(donation.status, 'pending')
+
+    @override_settings(RAZORPAY_WEBHOOK_SECRET='')
+    def test_unconfigured_secret_rejects_everything(self):
+        response = self.send('payment.captured', payment('pay_1', 'order_1', 'captured'), signature='anything')
+        self.assertEqual(response.status_code, 400)
+
+    def test_entity_without_ids_is_ignored(self):
+        make_donation('order_1')
+        self.assertEqual(self.send('payment.captured', {'order_id': 'order_1'}).content, b'Ignored')
+        self.assertEqual(self.send('payment.captured', {'id': 'pay_1'}).content, b'Ignored')
+
+    def test_failure_never_downgrades_a_completed_donation(self):
+        make_donation('order_1')
+        pending = make_donation('order_2')
+        Donation.complete('order_1', 'pay_1')
+
+        self.send('payment.failed', payment('pay_2', 'order_1', 'failed'))
+        self.send('payment.failed', payment('pay_3', 'order_2', 'failed'))
+
+        self.assertEqual(Donation.objects.get(order_id='order_1').status, 'completed')
+        pending.refresh_from_db()
+        self.assertEqual((pending.status, pending.payment_id), ('failed', 'pay_3'))
+
+    def test_unknown_order_is_acknowledged(self):
+        self.assertEqual(self.send('payment.captured', payment('pay_1', 'order_x', 'captured')).content, b'OK')
+
+
+class ReconcileDonationsTests(TestCase):
+    def reconcile(self, pages, *args, orders=None, stdout=None):
+        # list_payments is paged by 100; every page but the last must be full
+        orders = orders or {}
+
+        def order_payments(order_id):
+            attempts = orders.get(order_id, [])
+            if isinstance(attempts, Exception):
+                raise attempts
+            return {'items': attempts}
+
+        with mock.patch.object(payments, 'list_payments', side_effect=pages) as list_payments, \
+                mock.patch.object(payments, 'order_payments', side_effect=order_payments) as checked:
+            call_command('reconcile_donations', *args, stdout=stdout or StringIO())
+        self.checked = [call.args[0] for call in checked.call_args_list]
+        return list_payments
+
+    def statuses(self):
+        return dict(Donation.objects.values_list('order_id', 'status'))
+
+    def test_settles_from_payments_and_expires_the_rest(self):
+        make_donation('order_paid')
+        make_donation('order_failed')
+        make_donation('order_waiting')
+        make_donation('order_stale', age=timedelta(hours=30))
+        make_donation('order_recent', age=timedelta(minutes=1))
+
+        self.reconcile([{'items': [
+            payment('pay_1', 'order_paid', 'captured'),
+            payment('pay_2', 'order_failed', 'failed'),
+            payment('pay_3', 'order_recent', 'captured'),
+        ]}])
+
+        self.assertEqual(self.statuses(), {
+            'order_paid': 'completed', 'order_failed': 'failed', 'order_waiting': 'pending',
+            'order_stale': 'cancelled', 'order_recent': 'pending',
+        })
+        self.assertEqual(DonorLeaderboard.objects.get().donation_count, 1)
+
+    def test_capture_on_a_later_page_outranks_an_earlier_failure(self):
+        make_donation('order_1')
+        filler = [payment(f'pay_x{i}', f'order_x{i}', 'captured') for i in range(99)]
+
+        list_payments = self.reconcile([
+            {'items': [payment('pay_retry', 'order_1', 'failed')] + filler},
+            {'items': [payment('pay_first', 'order_1', 'captured')]},
+        ])
+
+        self.assertEqual(list_payments.call_count, 2)
+        donation = Donation.objects.get(order_id='order_1')
+        self.assertEqual((donation.status, donation.payment_id), ('completed', 'pay_first'))
+
+    def test_lookback_is_capped(self):
+        make_donation('order_1', age=timedelta(days=400))
+        list_payments = self.reconcile([{'items': []}], '--lookback-days', '3')
+        since = list_payments.call_args.args[0]
+        self.assertAlmostEqual(since, (timezone.now() - timedelta(days=3)).timestamp() - 60, delta=5)
+        self.assertEqual(self.statuses(), {'order_1': 'cancelled'})
+
+    def test_dry_run_changes_nothing(self):
+        make_donation('order_1')
+        make_donation('order_stale', age=timedelta(hours=30))
+        out = StringIO()
+        self.reconcile([{'items': [payment('pay_1', 'order_1', 'captured')]}], '--dry-run', stdout=out)
+        self.assertIn('1 completed, 0 failed, 1 cancelled', out.getvalue())
+        self.assertEqual(self.statuses(), {'order_1': 'pending', 'order_stale': 'pending'})
+
+    def test_gateway_error_keeps_pages_already_settled(self):
+        make_donation('order_1')
+        filler = [payment(f'pay_x{i}', f'order_x{i}', 'failed') for i in range(99)]
+        with self.assertRaises(CommandError):
+            self.reconcile([
+                {'items': [payment('pay_1', 'order_1', 'captured')] + filler},
+                payments.GatewayError('down'),
+            ])
+        self.assertEqual(self.statuses(), {'order_1': 'completed'})
+
+    def test_pages_end_at_the_oldest_payment_of_the_page_before(self):
+        make_donation('order_1')
+        now = int(timezone.now().timestamp())
+        first = [payment(f'pay_{i}', f'order_x{i}', 'failed', created_at=now - i) for i in range(100)]
+        # The second page starts at the boundary second again; its repeat must not be settled twice
+        second = [first[-1], payment('pay_old', 'order_1', 'captured', created_at=now - 200)]
+
+        list_payments = self.reconcile([{'items': first}, {'items': second}])
+
+        self.assertEqual(list_payments.call_args_list[1].args[1], now - 99)
+        self.assertEqual(list_payments.call_args_list[1].kwargs['skip'], 0)
+        self.assertEqual(self.statuses()['order_1'], 'completed')
+
+    def test_full_page_from_one_second_moves_on_with_skip(self):
+        make_donation('order_1')
+        same = int(timezone.now().timestamp())
+        page = [payment(f'pay_{i}', f'order_x{i}', 'failed', created_at=same) for i in range(100)]
+
+        list_payments = self.reconcile([{'items': page}, {'items': []}])
+
+        self.assertEqual(list_payments.call_args_list[1].kwargs['skip'], 100)
+
+    def test_stale_orders_are_checked_before_they_are_cancelled(self):
+        make_donation('order_unpaid', age=timedelta(hours=30))
+        make_donation('order_paid', age=timedelta(hours=30))
+        make_donation('order_authorized', age=timedelta(hours=30))
+        make_donation('order_settled', age=timedelta(hours=30))
+
+        self.reconcile([{'items': [payment('pay_s', 'order_settled', 'captured')]}], orders={
+            'order_paid': [payment('pay_p', 'order_paid', 'captured')],
+            'order_authorized': [payment('pay_a', 'order_authorized', 'authorized')],
+        })
+
+        self.assertEqual(self.statuses(), {
+            'order_unpaid': 'cancelled', 'order_paid': 'completed',
+            'order_authorized': 'pending', 'order_settled': 'completed',
+        })
+        # Settled from the payment list already; no need to ask about its order
+        self.assertNotIn('order_settled', self.checked)
+
+    def test_order_beyond_the_lookback_is_settled_from_its_own_payments(self):
+        make_donation('order_old', age=timedelta(days=30))
+        self.reconcile([{'items': []}], '--lookback-days', '3', orders={
+            'order_old': [payment('pay_old', 'order_old', 'captured', created_at=0)],
+        })
+        self.assertEqual(self.statuses(), {'order_old': 'completed'})
+
+    def test_gateway_error_while_checking_an_order_cancels_nothing(self):
+        make_donation('order_1', age=timedelta(hours=30))
+        with self.assertRaises(CommandError):
+            self.reconcile([{'items': []}], orders={'order_1': payments.GatewayError('down')})
+        self.assertEqual(self.statuses(), {'order_1': 'pending'})
@@ -0,0 +1,167 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import SkipFile
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from core.forms import JobApplicationForm
+from core.models import Job, JobApplication, ResumeBlob
+from core.uploads import ResumeUploadHandler, upload_errors
+
+PDF = b'%PDF-1.4 resume'
+DOC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1 resume'
+DOCX = b'PK\x03\x04 resume'
+
+
+class ResumeStorageTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings = override_settings(MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.job = Job.objects.create(title='Teacher', description='-', requirements='-', location='Pune')
+
+    def apply(self, n, blob):
+        return JobApplication.objects.create(
+            job=self.job, name=f'Applicant {n}', email=f'a{n}@example.org', phone='9999999999',
+            cover_letter='-', resume=blob.name,
+        )
+
+
+class ResumeBlobTests(ResumeStorageTestCase):
+    def test_identical_uploads_share_one_stored_file(self):
+        first = ResumeBlob.store(SimpleUploadedFile('cv.PDF', PDF))
+        second = ResumeBlob.store(SimpleUploadedFile('other-name.pdf', PDF))
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(first.sha256, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(first.name, f'resumes/sha256/{first.sha256[:2]}/{first.sha256}.pdf')
+        self.assertTrue(default_storage.exists(first.name))
+        self.assertEqual(len(os.listdir(os.path.dirname(default_storage.path(first.name)))), 1)
+
+    def test_different_content_gets_its_own_blob(self):
+        first = ResumeBlob.store(SimpleUploadedFile('cv.pdf', PDF))
+        second = ResumeBlob.store(SimpleUploadedFile('cv.pdf', PDF + b'!'))
+        self.assertNotEqual(first.name, second.name)
+        self.assertEqual(ResumeBlob.objects.count(), 2)
+
+    def test_precomputed_digest_is_trusted(self):
+        upload = SimpleUploadedFile('cv.pdf', PDF)
+        upload.sha256 = 'a' * 64
+        self.assertEqual(ResumeBlob.digest_of(upload), 'a' * 64)
+
+    def test_applications_hold_references(self):
+        blob = ResumeBlob.store(SimpleUploadedFile('cv.pdf', PDF))
+        first, second = self.apply(1, blob), self.apply(2, blob)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 2)
+
+        first.delete()
+        second.delete()
+        ResumeBlob.release(blob.name)
+        blob.refresh_from_db()
+        # Extra releases never take the count below zero
+        self.assertEqual(blob.ref_count, 0)
+
+    def test_stored_extension_follows_the_content(self):
+        blob = ResumeBlob.store(SimpleUploadedFile('cv.html', DOCX))
+        self.assertTrue(blob.name.endswith('.docx'))
+
+    def test_other_content_is_refused(self):
+        with self.assertRaises(ValidationError):
+            ResumeBlob.store(SimpleUploadedFile('cv.pdf', b'<html><script>alert(1)</script>'))
+        self.assertFalse(ResumeBlob.objects.exists())
+
+
+class JobApplicationFormTests(ResumeStorageTestCase):
+    def form(self, name, content):
+        data = {'name': 'Applicant', 'email': 'a@example.org', 'phone': '9999999999', 'cover_letter': '-'}
+        return JobApplicationForm(data, {'resume': SimpleUploadedFile(name, content)})
+
+    def test_accepts_pdf_and_word_files(self):
+        for name, content in [('cv.pdf', PDF), ('cv.doc', DOC), ('cv.docx', DOCX)]:
+            with self.subTest(name=name):
+                self.assertTrue(self.form(name, content).is_valid())
+
+    def test_rejects_other_extensions(self):
+        form = self.form('cv.html', PDF)
+        self.assertFalse(form.is_valid())
+        self.assertIn('resume', form.errors)
+
+    def test_rejects_content_that_is_not_a_document(self):
+        form = self.form('cv.pdf', b'<svg onload="alert(1)"/>')
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['resume'], ['Upload a PDF or Word document.'])
+
+
+class PruneResumeBlobsTests(ResumeStorageTestCase):
+    def prune(self, *args):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('prune_resume_blobs', *args, stdout=StringIO())
+
+    def test_recounts_references_and_deletes_unused_files(self):
+        used = ResumeBlob.store(SimpleUploadedFile('used.pdf', PDF))
+        unused = ResumeBlob.store(SimpleUploadedFile('unused.pdf', PDF + b'old'))
+        self.apply(1, used)
+        ResumeBlob.objects.filter(pk=used.pk).update(ref_count=5)
+        ResumeBlob.objects.update(created_at=timezone.now() - timedelta(days=1))
+
+        self.prune()
+
+        used.refresh_from_db()
+        self.assertEqual(used.ref_count, 1)
+        self.assertTrue(default_storage.exists(used.name))
+        self.assertFalse(ResumeBlob.objects.filter(pk=unused.pk).exists())
+        self.assertFalse(default_storage.exists(unused.name))
+
+    def test_young_blobs_are_kept(self):
+        blob = ResumeBlob.store(SimpleUploadedFile('new.pdf', PDF))
+        self.prune()
+        self.assertTrue(ResumeBlob.objects.filter(pk=blob.pk).exists())
+        self.assertTrue(default_storage.exists(blob.name))
+
+
+@override_settings(RESUME_MAX_UPLOAD_SIZE=100, FILE_UPLOAD_MAX_MEMORY_SIZE=10)
+class ResumeUploadHandlerTests(TestCase):
+    def start(self):
+        request = RequestFactory().post('/')
+        handler = ResumeUploadHandler(request)
+        handler.new_file('resume', 'cv.pdf', 'application/pdf', None)
+        return request, handler
+
+    def test_hashes_while_streaming_and_spills_to_disk(self):
+        _, handler = self.start()
+        chunks = [b'x' * 8, b'y' * 8, b'z' * 8]
+        offset = 0
+        for chunk in chunks:
+            handler.receive_data_chunk(chunk, offset)
+            offset += len(chunk)
+        upload = handler.file_complete(offset)
+
+        self.assertEqual(upload.sha256, hashlib.sha256(b''.join(chunks)).hexdigest())
+        self.assertTrue(hasattr(upload, 'temporary_file_path'))
+        self.assertEqual(upload.read(), b''.join(chunks))
+        upload.close()
+
+    def test_other_file_types_are_skipped_with_an_error(self):
+        request = RequestFactory().post('/')
+        with self.assertRaises(SkipFile):
+            ResumeUploadHandler(request).new_file('resume', 'cv.svg', 'image/svg+xml', None)
+        self.assertIn('resume', upload_errors(request))
+
+    def test_oversized_file_is_skipped_with_an_error(self):
+        request, handler = self.start()
+        handler.receive_data_chunk(b'x' * 60, 0)
+        with self.assertRaises(SkipFile):
+            handler.receive_data_chunk(b'x' * 60, 60)
+        self.assertIn('resume', upload_errors(request))
@@ -0,0 +1,100 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import search
+from core.models import Job
+
+
+def make_job(title, description='-', requirements='-', location='Pune', **fields):
+    return Job.objects.create(title=title, description=description, requirements=requirements, location=location, **fields)
+
+
+def titles(text, **kwargs):
+    jobs, _ = search.search_jobs(text, **kwargs)
+    return [job.title for job in jobs]
+
+
+class SearchJobsTests(TestCase):
+    def test_title_matches_rank_above_description_matches(self):
+        make_job('Field coordinator', description='Work with the teacher network')
+        make_job('Teacher')
+        self.assertEqual(titles('teacher'), ['Teacher', 'Field coordinator'])
+
+    def test_every_word_must_match_as_a_prefix(self):
+        make_job('Primary teacher', location='Nashik')
+        make_job('Primary nurse', location='Pune')
+        self.assertEqual(titles('prim teach'), ['Primary teacher'])
+        self.assertEqual(titles('nashik'), ['Primary teacher'])
+
+    def test_inactive_jobs_are_hidden(self):
+        make_job('Teacher', is_active=False)
+        self.assertEqual(titles('teacher'), [])
+
+    def test_punctuation_cannot_break_the_query(self):
+        make_job('Teacher')
+        self.assertEqual(titles('"teacher" (*'), ['Teacher'])
+        self.assertEqual(titles('"()*'), [])
+
+    def test_pages_do_not_overlap(self):
+        for n in range(5):
+            make_job(f'Teacher {n}')
+        seen = []
+        for page, expected_next in [(1, True), (2, True), (3, False)]:
+            jobs, has_next = search.search_jobs('teacher', page=page, per_page=2)
+            self.assertEqual(has_next, expected_next)
+            seen += [job.pk for job in jobs]
+        self.assertEqual(sorted(seen), sorted(Job.objects.values_list('pk', flat=True)))
+
+
+class SearchIndexSyncTests(TestCase):
+    def test_saves_bulk_updates_and_deletes_reach_the_index(self):
+        job = make_job('Teacher')
+        job.title = 'Nurse'
+        job.save()
+        self.assertEqual((titles('teacher'), titles('nurse')), ([], ['Nurse']))
+
+        Job.objects.filter(pk=job.pk).update(title='Driver')
+        self.assertEqual(titles('driver'), ['Driver'])
+
+        job.delete()
+        self.assertEqual(titles('driver'), [])
+
+    def test_missing_triggers_are_recreated_and_the_index_rebuilt(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 triggers are SQLite only')
+        with connection.cursor() as cursor:
+            # What a table rebuild by a later AlterField on Job does
+            cursor.execute('DROP TRIGGER core_job_fts_insert')
+            cursor.execute('DROP TRIGGER core_job_fts_update')
+        make_job('Teacher')
+        self.assertEqual(titles('teacher'), [])
+
+        with self.assertLogs('core.search', 'WARNING'):
+            recreated = search.ensure_sqlite_index()
+
+        self.assertEqual(recreated, ['core_job_fts_insert', 'core_job_fts_update'])
+        self.assertEqual(titles('teacher'), ['Teacher'])
+        make_job('Nurse')
+        self.assertEqual(titles('nurse'), ['Nurse'])
+        self.assertEqual(search.ensure_sqlite_index(), [])
+
+
+# Tests do not run collectstatic, so there is no manifest to render pages against
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class JobSearchViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('applicant'))
+
+    def test_renders_one_page_of_results(self):
+        for n in range(3):
+            make_job(f'Teacher {n}')
+        with self.settings(JOB_SEARCH_PAGE_SIZE=2):
+            first = self.client.get(reverse('job_search'), {'q': 'teacher'})
+            second = self.client.get(reverse('job_search'), {'q': 'teacher', 'page': 2})
+        self.assertEqual((len(first.context['jobs']), first.context['has_next']), (2, True))
+        self.assertEqual((len(second.context['jobs']), second.context['has_next']), (1, False))
+
+    def test_empty_query_goes_back_to_the_job_list(self):
+        self.assertRedirects(self.client.get(reverse('job_search'), {'q': ' '}), reverse('jobs'), fetch_redirect_response=False)
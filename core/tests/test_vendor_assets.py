@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from core import assets
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class VendorAssetsTests(SimpleTestCase):
+    def setUp(self):
+        static_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, static_dir)
+        patcher = mock.patch.object(assets, 'STATIC_DIR', static_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.vendor_dir = static_dir / assets.VENDOR_DIR
+
+    def build(self):
+        (self.vendor_dir / 'fonts').mkdir(parents=True)
+        (self.vendor_dir / 'site.css').write_text('body {}')
+        (self.vendor_dir / 'site.js').write_text(';')
+        (self.vendor_dir / 'fonts' / 'inter.woff2').write_bytes(b'font')
+        assets.write_lock({'sources': {}, 'files': assets.bundle_files()})
+
+    def render(self):
+        return Template('{% load vendor_assets %}{% vendor_css %}{% vendor_js %}').render(Context())
+
+    def check(self):
+        out = StringIO()
+        call_command('vendor_assets', '--check', stdout=out)
+        return out.getvalue()
+
+    def test_tags_use_the_cdn_until_the_bundle_is_committed(self):
+        html = self.render()
+        for url in assets.CSS_SOURCES + assets.JS_SOURCES:
+            self.assertIn(url.replace('&', '&amp;'), html)
+        self.assertNotIn('vendor/site', html)
+
+    def test_tags_use_the_committed_bundle(self):
+        self.build()
+        html = self.render()
+        self.assertIn('/static/vendor/site.css', html)
+        self.assertIn('/static/vendor/site.js', html)
+        self.assertNotIn('cdn.jsdelivr.net', html)
+
+    def test_check_only_warns_without_a_bundle(self):
+        self.assertIn('No vendor bundle committed', self.check())
+
+    def test_check_accepts_a_bundle_matching_the_lock(self):
+        self.build()
+        self.assertIn('matches', self.check())
+
+    def test_check_rejects_modified_missing_and_unlocked_files(self):
+        self.build()
+        (self.vendor_dir / 'site.css').write_text('body { color: red }')
+        (self.vendor_dir / 'site.js').unlink()
+        (self.vendor_dir / 'fonts' / 'extra.woff2').write_bytes(b'font')
+        with self.assertRaisesMessage(CommandError, 'modified site.css') as raised:
+            self.check()
+        self.assertIn('missing site.js', str(raised.exception))
+        self.assertIn('not in the lock: fonts/extra.woff2', str(raised.exception))
+
+    def test_check_rejects_a_bundle_without_a_lock(self):
+        self.build()
+        (self.vendor_dir / assets.LOCK_NAME).unlink()
+        with self.assertRaises(CommandError):
+            self.check()
@@ -0,0 +1,111 @@
+"""Thumbnail and medium variants for uploaded ModelVillage images.
+
+Saving a village with a new image schedules ``generate`` on a small thread
+pool once the transaction commits, so the admin request returns as soon as
+the original is stored. Each variant is a WebP named after the SHA-256 of the
+original (``villages/variants/ab/<digest>-thumbnail.webp``): the URL changes
+whenever the content does, so the front server can cache it forever. Until
+the variants exist, ``ModelVillage.thumbnail_url``/``medium_url`` fall back to
+the original.
+
+The pool lives inside the web worker and nothing persists its queue. A
+worker that gunicorn recycles (max_requests, a timeout) or a deploy drops the
+jobs it had not finished, and nothing retries them. ``manage.py
+generate_village_variants`` regenerates whatever is missing; build.sh runs it
+on every deploy, and it can be run by hand at any time.
+"""
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# name -> (box, crop to fill the box exactly)
+VARIANTS = {
+    'thumbnail': ((400, 300), True),
+    'medium': ((1200, 1200), False),
+}
+WEBP_OPTIONS = {'quality': 80, 'method': 4}
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_VARIANT_WORKERS,
+    thread_name_prefix='thumbnails',
+)
+
+
+def variant_name(digest, variant):
+    return f'villages/variants/{digest[:2]}/{digest}-{variant}.webp'
+
+
+def render(image, variant):
+    box, crop = VARIANTS[variant]
+    if crop:
+        resized = ImageOps.fit(image, box, Image.LANCZOS)
+    else:
+        resized = image.copy()
+        resized.thumbnail(box, Image.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, format='WEBP', **WEBP_OPTIONS)
+    return buffer.getvalue()
+
+
+def generate(village, force=False):
+    """Create any missing variants of ``village.image``. Returns True if the row was updated"""
+    from .models import ModelVillage
+
+    source = village.image.name
+    if not source:
+        return False
+
+    hasher = hashlib.sha256()
+    with default_storage.open(source, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        names = {variant: variant_name(digest, variant) for variant in VARIANTS}
+        missing = [variant for variant, name in names.items() if force or not default_storage.exists(name)]
+        if missing:
+            handle.seek(0)
+            with Image.open(handle) as image:
+                # Camera originals are often stored sideways with an EXIF rotation flag
+                image = ImageOps.exif_transpose(image).convert('RGB')
+            for variant in missing:
+                if default_storage.exists(names[variant]):
+                    default_storage.delete(names[variant])
+                default_storage.save(names[variant], ContentFile(render(image, variant)))
+
+    if village.image_digest == digest and village.thumbnail.name == names['thumbnail'] and not missing:
+        return False
+    # Only record the variants if the image was not replaced while we worked
+    return bool(ModelVillage.objects.filter(pk=village.pk, image=source).update(
+        image_digest=digest,
+        thumbnail=names['thumbnail'],
+        image_medium=names['medium'],
+    ))
+
+
+def _generate_in_background(village_id):
+    from .models import ModelVillage
+
+    try:
+        village = ModelVillage.objects.filter(pk=village_id).first()
+        if village:
+            generate(village)
+    except Exception:
+        logger.exception('Could not generate image variants for village %s', village_id)
+    finally:
+        # Worker threads get their own connection; do not leave it open between jobs
+        connection.close()
+
+
+def schedule(village_id):
+    """Generate variants off the request thread once the current transaction commits"""
+    transaction.on_commit(lambda: _executor.submit(_generate_in_background, village_id))
@@ -0,0 +1,86 @@
+"""Streaming upload handling for job application resumes.
+
+``ResumeUploadHandler`` replaces Django's default handlers on the application
+form. It skips files without a .pdf/.doc/.docx name, hashes each file while
+the chunks arrive and enforces RESUME_MAX_UPLOAD_SIZE as it goes, dropping
+the rest of an oversized file instead of buffering it. Small files stay in memory and larger ones spill to
+a temporary file. Nothing is written to MEDIA_ROOT at this stage:
+``ResumeBlob.store`` uses the precomputed digest to store the file under its
+content hash, or to reuse a copy that already exists.
+"""
+import hashlib
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.template.defaultfilters import filesizeformat
+
+from .models import RESUME_EXTENSIONS
+
+
+class ResumeUploadHandler(FileUploadHandler):
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = settings.RESUME_MAX_UPLOAD_SIZE
+        self.spill_size = settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        extension = os.path.splitext(self.file_name)[1].lower().lstrip('.')
+        if extension not in RESUME_EXTENSIONS:
+            upload_errors(self.request)[self.field_name] = 'Upload a PDF or Word document.'
+            raise SkipFile()
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.file = BytesIO()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            upload_errors(self.request)[self.field_name] = (
+                f'File is too large. The maximum size is {filesizeformat(self.max_size)}.'
+            )
+            raise SkipFile()
+
+        if isinstance(self.file, BytesIO) and self.size > self.spill_size:
+            spilled = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+            spilled.write(self.file.getvalue())
+            self.file = spilled
+
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        if isinstance(self.file, BytesIO):
+            upload = InMemoryUploadedFile(
+                self.file, self.field_name, self.file_name, self.content_type,
+                file_size, self.charset, self.content_type_extra,
+            )
+        else:
+            upload = self.file
+            upload.size = file_size
+        upload.sha256 = self.digest.hexdigest()
+        return upload
+
+
+def upload_errors(request):
+    """Per-field messages for files the handler refused, keyed by field name"""
+    if not hasattr(request, 'upload_errors'):
+        request.upload_errors = {}
+    return request.upload_errors
+
+
+def use_resume_handler(request):
+    """Swap in ResumeUploadHandler; must run before request.POST/FILES are read"""
+    request.upload_handlers = [ResumeUploadHandler(request)]
+
+
+def report_upload_errors(request, form):
+    for field, message in upload_errors(request).items():
+        # Replaces the "required" error the missing file produced
+        form.errors.pop(field, None)
+        form.add_error(field, message)
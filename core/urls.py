@@ -17,6 +17,7 @@ urlpatterns = [
     path('payment-success/', views.payment_success, name='payment_success'),
     path('payment-cancelled/', views.payment_cancelled, name='payment_cancelled'),
     path('donation-success/<int:donation_id>/', views.donation_success, name='donation_success'),
+    path('payments/razorpay/webhook/', views.razorpay_webhook, name='razorpay_webhook'),
     
     # Volunteer
     path('volunteer/', views.volunteer, name='volunteer'),
@@ -24,6 +25,7 @@ urlpatterns = [
     
     # Jobs
     path('jobs/', views.jobs, name='jobs'),
+    path('jobs/search/', views.job_search, name='job_search'),
     path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
     path('job-application-success/', views.job_application_success, name='job_application_success'),
     
@@ -32,7 +34,13 @@ urlpatterns = [
     path('admin-dashboard/volunteers/', views.manage_volunteers, name='manage_volunteers'),
     path('admin-dashboard/jobs/', views.manage_jobs, name='manage_jobs'),
     path('admin-dashboard/jobs/create/', views.create_job, name='create_job'),
+    path('admin-dashboard/jobs/applications/export/', views.export_all_applications, name='export_all_applications'),
     path('admin-dashboard/jobs/<int:job_id>/applications/', views.manage_applications, name='manage_applications'),
     path('admin-dashboard/jobs/<int:job_id>/applications/export/', views.export_applications, name='export_applications'),
+    path('admin-dashboard/applications/<int:application_id>/resume/', views.download_resume, name='download_resume'),
     path('admin-dashboard/donations/', views.donation_reports, name='donation_reports'),
+    path('admin-dashboard/donations/export/', views.export_donations, name='export_donations'),
+    
+    # Monitoring
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -1,27 +1,62 @@
-from django.db import IntegrityError
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.views import redirect_to_login
 from django.contrib.auth import authenticate, login
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_POST
 from django.conf import settings
-from django.db.models import Sum, Count
+from django.db.models import Sum, Count, Q
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.utils.text import slugify
 from datetime import timedelta, datetime
-import razorpay
 from django.contrib.auth.models import User
-from .models import Donation, VolunteerApplication, Job, JobApplication, Page, ModelVillage, UserProfile
+from .models import Donation, DonorLeaderboard, DonationDailyRollup, EmailOutbox, VolunteerApplication, Job, JobApplication, Page, ModelVillage, UserProfile
 from .forms import VolunteerForm, JobApplicationForm
-import csv
-from django.http import HttpResponse
+from .page_cache import cache_anonymous_page
+from .pagination import KeysetPaginator
+from . import dashboard, db_pool, downloads, exports, notifications, payments, search, uploads
+import razorpay
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+import hmac
+import json
+import os
+from functools import wraps
 
-razorpay_client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
 
 def is_admin(user):
     return user.is_staff or user.is_superuser
 
 
+def async_login_required(view):
+    """login_required for coroutine views (Django 4.2's decorator only wraps sync ones)"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # Loading request.user reads the session and the user row, so it runs in a thread
+        if await sync_to_async(lambda: request.user.is_authenticated)():
+            return await view(request, *args, **kwargs)
+        return redirect_to_login(request.get_full_path())
+    return wrapper
+
+
+def selected_ids(values):
+    """Primary keys from checkbox/hidden inputs, ignoring blanks and junk"""
+    return [int(value) for value in values if value and value.isdigit()]
+
+
+def metrics(request):
+    """Expose per-process gateway latency and database pool metrics for Prometheus"""
+    token = settings.METRICS_TOKEN
+    authorized = request.user.is_authenticated and is_admin(request.user)
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        authorized = True
+    if not authorized:
+        return HttpResponseForbidden()
+    return HttpResponse(payments.render_metrics() + db_pool.render_metrics(), content_type='text/plain; version=0.0.4')
+
+
 # Authentication Views
 def login_page(request):
     
@@ -90,35 +125,21 @@ def signup_page(request):
     return render(request, 'signup.html')  
 
 # Public Views
+@cache_anonymous_page
 def home(request):
     return render(request, 'home.html')
 
+@cache_anonymous_page
 def model_village(request):
     return render(request, "model_village.html")
+
+@cache_anonymous_page
 def what_we_do(request):
     return render(request, 'what_we_do.html')
 
-@login_required
-def donate(request):
-    # Get top donors
-    top_donors = Donation.objects.filter(
-        status='completed'
-    ).values('first_name', 'last_name', 'show_name').annotate(
-        total_amount=Sum('amount')
-    ).order_by('-total_amount')[:10]
-    
-    # Format top donors list
-    formatted_donors = []
-    for donor in top_donors:
-        if donor['show_name']:
-            name = f"{donor['first_name']} {donor['last_name']}"
-        else:
-            name = "Anonymous Donor"
-        formatted_donors.append({
-            'name': name,
-            'total_amount': donor['total_amount']
-        })
-    
+@async_login_required
+async def donate(request):
+    # Async so the wait on the gateway holds no thread under ASGI; the queries run in sync helpers
     if request.method == 'POST':
         amount = int(float(request.POST.get('amount')) * 100)
         cause = request.POST.get('cause')
@@ -128,35 +149,57 @@ def donate(request):
             'currency': 'INR',
             'payment_capture': 1
         }
-        order = razorpay_client.order.create(data=order_data)
-        
-        # Create donation with all fields
-        donation = Donation.objects.create(
-            user=request.user,
-            first_name=request.POST.get('first_name'),
-            last_name=request.POST.get('last_name'),
-            email=request.POST.get('email'),
-            country_code=request.POST.get('country_code', '+91'),
-            phone=request.POST.get('phone'),
-            country=request.POST.get('country', 'India'),
-            state=request.POST.get('state'),
-            city=request.POST.get('city'),
-            pincode=request.POST.get('pin_code'),
-            address=request.POST.get('address'),
-            amount=amount / 100,
-            cause=cause,
-            order_id=order['id'],
-            status='pending',
-            show_name=request.POST.get('show_name') == 'on'
-        )
-        
-        context = {
-            'order_id': order['id'],
-            'razorpay_key': settings.RAZORPAY_KEY_ID,
-            'amount': amount,
-            'donation_id': donation.id
-        }
-        return render(request, 'payment.html', context)
+        try:
+            order = await payments.acreate_order(order_data)
+        except payments.GatewayError as e:
+            messages.error(request, f'Could not start the payment: {e}')
+            return redirect('donate')
+        return await sync_to_async(_start_payment)(request, order, amount, cause)
+    
+    return await sync_to_async(_donate_page)(request)
+
+
+def _start_payment(request, order, amount, cause):
+    # Create donation with all fields
+    donation = Donation.objects.create(
+        user=request.user,
+        first_name=request.POST.get('first_name'),
+        last_name=request.POST.get('last_name'),
+        email=request.POST.get('email'),
+        country_code=request.POST.get('country_code', '+91'),
+        phone=request.POST.get('phone'),
+        country=request.POST.get('country', 'India'),
+        state=request.POST.get('state'),
+        city=request.POST.get('city'),
+        pincode=request.POST.get('pin_code'),
+        address=request.POST.get('address'),
+        amount=amount / 100,
+        cause=cause,
+        order_id=order['id'],
+        status='pending',
+        show_name=request.POST.get('show_name') == 'on'
+    )
+    
+    context = {
+        'order_id': order['id'],
+        'razorpay_key': settings.RAZORPAY_KEY_ID,
+        'amount': amount,
+        'donation_id': donation.id
+    }
+    return render(request, 'payment.html', context)
+
+
+def _donate_page(request):
+    # Get top donors from the pre-aggregated leaderboard
+    top_donors = DonorLeaderboard.objects.only(
+        'first_name', 'last_name', 'show_name', 'total_amount'
+    ).order_by('-total_amount', 'id')[:10]
+    
+    # Format top donors list
+    formatted_donors = [
+        {'name': donor.get_display_name(), 'total_amount': donor.total_amount}
+        for donor in top_donors
+    ]
     
     # Get user profile data for auto-fill
     user_data = {}
@@ -200,32 +243,35 @@ def payment_success(request):
             'razorpay_signature': signature
         }
         
+        if not (payment_id and order_id and signature):
+            messages.error(request, 'Payment verification failed')
+            return redirect('donate')
+        
         try:
-            razorpay_client.utility.verify_payment_signature(params_dict)
-            
-            donation = Donation.objects.get(order_id=order_id)
-            donation.payment_id = payment_id
-            donation.signature = signature
-            donation.status = 'completed'
-            donation.save()
-            
-            # Update user profile with latest information
-            if donation.user:
-                profile, created = UserProfile.objects.get_or_create(user=donation.user)
-                profile.phone = donation.phone
-                profile.country_code = donation.country_code
-                profile.country = donation.country
-                profile.state = donation.state
-                profile.city = donation.city
-                profile.pin_code = donation.pin_code
-                profile.address = donation.address
-                profile.save()
-            
-            messages.success(request, 'Thank you for your donation!')
-            return redirect('donation_success', donation_id=donation.id)
-        except:
+            payments.verify_payment_signature(params_dict)
+            donation, _ = Donation.complete(order_id, payment_id, signature)
+        except (razorpay.errors.SignatureVerificationError, Donation.DoesNotExist):
             messages.error(request, 'Payment verification failed')
             return redirect('donate')
+        except payments.GatewayError:
+            # The webhook and reconcile_donations complete the donation once the payment is confirmed
+            messages.error(request, 'We could not confirm your payment yet. If you were charged, it will be confirmed shortly.')
+            return redirect('donate')
+        
+        # Update user profile with latest information
+        if donation.user:
+            profile, created = UserProfile.objects.get_or_create(user=donation.user)
+            profile.phone = donation.phone
+            profile.country_code = donation.country_code
+            profile.country = donation.country
+            profile.state = donation.state
+            profile.city = donation.city
+            profile.pin_code = donation.pincode
+            profile.address = donation.address
+            profile.save()
+        
+        messages.success(request, 'Thank you for your donation!')
+        return redirect('donation_success', donation_id=donation.id)
     
     return redirect('donate')
 
@@ -244,6 +290,37 @@ def payment_cancelled(request):
     messages.warning(request, 'Payment was cancelled. You can try again.')
     return redirect('donate')
 
+@csrf_exempt
+@require_POST
+def razorpay_webhook(request):
+    """Finalize donations from Razorpay payment events, even if the donor closed the tab"""
+    body = request.body.decode('utf-8')
+    try:
+        payments.verify_webhook_signature(body, request.headers.get('X-Razorpay-Signature', ''))
+        event = json.loads(body)
+    except (razorpay.errors.SignatureVerificationError, ValueError):
+        return HttpResponse('Invalid signature', status=400)
+    
+    payment = event.get('payload', {}).get('payment', {}).get('entity', {})
+    order_id = payment.get('order_id')
+    payment_id = payment.get('id', '')
+    if not order_id or not payment_id:
+        return HttpResponse('Ignored')
+    
+    try:
+        if event.get('event') in ('payment.captured', 'order.paid'):
+            Donation.complete(order_id, payment_id)
+        elif event.get('event') == 'payment.failed':
+            # Never downgrade a donation that another path already completed
+            Donation.objects.filter(order_id=order_id, status='pending').update(
+                status='failed', payment_id=payment_id, updated_at=timezone.now()
+            )
+    except Donation.DoesNotExist:
+        pass
+    
+    # Always acknowledge so Razorpay does not keep retrying events we cannot use
+    return HttpResponse('OK')
+
 @login_required
 def donation_success(request, donation_id):
     donation = get_object_or_404(Donation, id=donation_id)
@@ -275,7 +352,35 @@ def jobs(request):
     return render(request, 'jobs.html', {'jobs': jobs_list})
 
 @login_required
+def job_search(request):
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return redirect('jobs')
+    
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    results, has_next = search.search_jobs(query, page=page)
+    
+    return render(request, 'jobs.html', {
+        'jobs': results,
+        'query': query,
+        'page_number': page,
+        'has_next': has_next,
+    })
+
+@login_required
+@csrf_exempt
 def job_detail(request, job_id):
+    # The upload handlers must be swapped before CSRF checks read request.POST,
+    # so the check is re-applied by csrf_protect on the inner view
+    uploads.use_resume_handler(request)
+    return _job_detail(request, job_id)
+
+
+@csrf_protect
+def _job_detail(request, job_id):
     job = get_object_or_404(Job, id=job_id, is_active=True)
     
     # Check if user has already applied for this job
@@ -291,6 +396,7 @@ def job_detail(request, job_id):
             return redirect('job_detail', job_id=job_id)
             
         form = JobApplicationForm(request.POST, request.FILES)
+        uploads.report_upload_errors(request, form)
         if form.is_valid():
             application = form.save(commit=False)
             application.job = job
@@ -322,71 +428,54 @@ def job_application_success(request):
 @login_required
 @user_passes_test(is_admin)
 def admin_dashboard(request):
-    total_donations = Donation.objects.filter(status='completed').aggregate(Sum('amount'))['amount__sum'] or 0
-    donations_count = Donation.objects.filter(status='completed').count()
-    pending_volunteers = VolunteerApplication.objects.filter(status='pending').count()
-    total_volunteers = VolunteerApplication.objects.filter(status='approved').count()
-    pending_applications = JobApplication.objects.filter(status='pending').count()
-    active_jobs = Job.objects.filter(is_active=True).count()
-    
-    recent_donations = Donation.objects.filter(status='completed').order_by('-created_at')[:10]
-    recent_volunteers = VolunteerApplication.objects.order_by('-created_at')[:10]
-    
-    # Fix: Calculate percentages for donations by cause
-    total_donation_amount = Donation.objects.filter(status='completed').aggregate(Sum('amount'))['amount__sum'] or 1
-    donations_by_cause = Donation.objects.filter(status='completed').values('cause').annotate(
-        total=Sum('amount'),
-        count=Count('id')
-    )
-    
-    # Add percentage calculation
-    donations_by_cause_list = []
-    for item in donations_by_cause:
-        item['percentage'] = (item['total'] / total_donation_amount) * 100 if total_donation_amount > 0 else 0
-        donations_by_cause_list.append(item)
-    
-    context = {
-        'total_donations': total_donations,
-        'donations_count': donations_count,
-        'pending_volunteers': pending_volunteers,
-        'total_volunteers': total_volunteers,
-        'pending_applications': pending_applications,
-        'active_jobs': active_jobs,
-        'recent_donations': recent_donations,
-        'recent_volunteers': recent_volunteers,
-        'donations_by_cause': donations_by_cause_list,
-    }
-    
+    context = dashboard.get_stats()
     return render(request, 'admin_dashboard.html', context)
 
 @login_required
 @user_passes_test(is_admin)
 def manage_volunteers(request):
-    volunteers = VolunteerApplication.objects.all().order_by('-created_at')
-    
     if request.method == 'POST':
-        volunteer_id = request.POST.get('volunteer_id')
+        # Either one row's buttons or the bulk form with several checked rows
+        ids = selected_ids(request.POST.getlist('volunteer_ids') or [request.POST.get('volunteer_id')])
         action = request.POST.get('action')
+        statuses = {'approve': 'approved', 'reject': 'rejected'}
         
-        volunteer = get_object_or_404(VolunteerApplication, id=volunteer_id)
-        
-        if action == 'approve':
-            volunteer.status = 'approved'
-            messages.success(request, f'{volunteer.name} has been approved!')
-        elif action == 'reject':
-            volunteer.status = 'rejected'
-            messages.info(request, f'{volunteer.name} has been rejected.')
+        if action not in statuses or not ids:
+            messages.error(request, 'Select at least one volunteer and an action.')
+            return redirect(request.get_full_path())
         
-        volunteer.save()
-        return redirect('manage_volunteers')
+        status = statuses[action]
+        updated = VolunteerApplication.objects.filter(id__in=ids).exclude(status=status).update(
+            status=status, updated_at=timezone.now()
+        )
+        if updated:
+            # update() sends no post_save, so drop the dashboard snapshot here
+            transaction.on_commit(dashboard.invalidate)
+        if status == 'approved':
+            messages.success(request, f'{updated} volunteer(s) approved successfully.')
+        else:
+            messages.info(request, f'{updated} volunteer(s) rejected.')
+        return redirect(request.get_full_path())
     
-    return render(request, 'manage_volunteers.html', {'volunteers': volunteers})
+    page = KeysetPaginator(
+        VolunteerApplication.objects.all(),
+        search_fields=['name', 'email', 'phone'],
+        statuses=KeysetPaginator.status_choices('status', VolunteerApplication.STATUS_CHOICES),
+    ).page(request.GET)
+    return render(request, 'manage_volunteers.html', {'volunteers': page.object_list, 'page': page})
 
 @login_required
 @user_passes_test(is_admin)
 def manage_jobs(request):
-    jobs_list = Job.objects.all().order_by('-created_at')
-    return render(request, 'manage_jobs.html', {'jobs': jobs_list})
+    page = KeysetPaginator(
+        Job.objects.all(),
+        search_fields=['title', 'location'],
+        statuses={
+            'active': ('Active', Q(is_active=True)),
+            'inactive': ('Inactive', Q(is_active=False)),
+        },
+    ).page(request.GET)
+    return render(request, 'manage_jobs.html', {'jobs': page.object_list, 'page': page})
 
 @login_required
 @user_passes_test(is_admin)
@@ -410,20 +499,28 @@ def manage_applications(request, job_id):
 @login_required
 @user_passes_test(is_admin)
 def donation_reports(request):
-    donations = Donation.objects.filter(status='completed').order_by('-created_at')
-    
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    
-    if start_date:
-        donations = donations.filter(created_at__gte=start_date)
-    if end_date:
-        donations = donations.filter(created_at__lte=end_date)
+    paginator = KeysetPaginator(
+        Donation.objects.filter(status='completed'),
+        search_fields=['first_name', 'last_name', 'email', 'payment_id'],
+    )
+    page = paginator.page(request.GET)
+    start_date = page.filters['start_date']
+    end_date = page.filters['end_date']
     
-    total = donations.aggregate(Sum('amount'))['amount__sum'] or 0
+    # The total covers every matching row, not just this page
+    if page.filters['q']:
+        total = paginator.filter(request.GET)[0].aggregate(Sum('amount'))['amount__sum'] or 0
+    else:
+        rollups = DonationDailyRollup.objects.all()
+        if start_date:
+            rollups = rollups.filter(day__gte=start_date)
+        if end_date:
+            rollups = rollups.filter(day__lte=end_date)
+        total = rollups.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
     
     context = {
-        'donations': donations,
+        'donations': page.object_list,
+        'page': page,
         'total': total,
         'start_date': start_date,
         'end_date': end_date,
@@ -431,59 +528,75 @@ def donation_reports(request):
     
     return render(request, 'donate_reports.html', context)
 
+@login_required
+@user_passes_test(is_admin)
+def export_donations(request):
+    """Stream completed donations matching the report filters as CSV or JSON Lines"""
+    donations, filters = KeysetPaginator(
+        Donation.objects.filter(status='completed'),
+        search_fields=['first_name', 'last_name', 'email', 'payment_id'],
+    ).filter(request.GET)
+    
+    columns = [
+        'id', 'created_at', 'first_name', 'last_name', 'email', 'country_code', 'phone',
+        'amount', 'cause', 'status', 'order_id', 'payment_id', 'city', 'state', 'country',
+    ]
+    rows = donations.order_by('-created_at', '-id').values_list(*columns).iterator(chunk_size=exports.EXPORT_CHUNK_SIZE)
+    
+    period = '_'.join(filter(None, [filters['start_date'], filters['end_date']])) or timezone.now().strftime('%Y%m%d')
+    return exports.export_response(columns, rows, f'donations_{period}', request.GET.get('format', 'csv'))
+
 
 @login_required
 @user_passes_test(is_admin)
 def manage_applications(request, job_id):
     job = get_object_or_404(Job, id=job_id)
-    applications = JobApplication.objects.filter(job=job).order_by('-created_at')
-    
-    # Calculate statistics by status
-    pending_count = applications.filter(status='pending').count()
-    reviewed_count = applications.filter(status='reviewed').count()
-    shortlisted_count = applications.filter(status='shortlisted').count()
-    rejected_count = applications.filter(status='rejected').count()
+    applications = JobApplication.objects.filter(job=job)
     
     if request.method == 'POST':
-        app_id = request.POST.get('application_id')
+        # Either one row's status menu or the bulk form with several checked rows
+        ids = selected_ids(request.POST.getlist('application_ids') or [request.POST.get('application_id')])
         status = request.POST.get('status')
+        status_labels = dict(JobApplication.STATUS_CHOICES)
         
-        application = get_object_or_404(JobApplication, id=app_id)
-        application.status = status
-        application.save()
+        if status not in status_labels or not ids:
+            messages.error(request, 'Select at least one application and a status.')
+            return redirect(request.get_full_path())
         
-        # Send email notification after status update
-        try:
-            if status == 'shortlisted':
-                send_mail(
-                    f'Application Update - {job.title}',
-                    f'Dear {application.name},\n\nCongratulations! Your application for {job.title} has been shortlisted. We will contact you soon with next steps.\n\nBest regards,\nEvergreen Villages Trust',
-                    settings.DEFAULT_FROM_EMAIL,
-                    [application.email],
-                    fail_silently=True,
-                )
-            elif status == 'rejected':
-                send_mail(
-                    f'Application Update - {job.title}',
-                    f'Dear {application.name},\n\nThank you for your interest in the {job.title} position. After careful consideration, we have decided to move forward with other candidates.\n\nWe appreciate your time and wish you the best in your job search.\n\nBest regards,\nEvergreen Villages Trust',
-                    settings.DEFAULT_FROM_EMAIL,
-                    [application.email],
-                    fail_silently=True,
-                )
-        except Exception as e:
-            # Log error but don't stop the process
-            print(f"Email sending failed: {e}")
+        # One UPDATE for the whole selection; notifications are queued with it and sent by send_outbox
+        with transaction.atomic():
+            changing = list(
+                applications.select_for_update().filter(id__in=ids).exclude(status=status).only('id', 'name', 'email')
+            )
+            updated = applications.filter(id__in=[application.id for application in changing]).set_status(status)
+            if updated:
+                # set_status() updates rows and job counters without post_save
+                transaction.on_commit(dashboard.invalidate)
+            EmailOutbox.objects.bulk_create([
+                message for message in (
+                    notifications.application_status_email(application, job, status) for application in changing
+                ) if message is not None
+            ])
         
-        messages.success(request, f'Application status updated to {status}')
-        return redirect('manage_applications', job_id=job_id)
+        messages.success(request, f'{updated} application(s) updated to {status_labels[status]}')
+        return redirect(request.get_full_path())
+    
+    page = KeysetPaginator(
+        applications,
+        search_fields=['name', 'email', 'phone'],
+        statuses=KeysetPaginator.status_choices('status', JobApplication.STATUS_CHOICES),
+    ).page(request.GET)
     
     context = {
         'job': job,
-        'applications': applications,
-        'pending_count': pending_count,
-        'reviewed_count': reviewed_count,
-        'shortlisted_count': shortlisted_count,
-        'rejected_count': rejected_count,
+        'applications': page.object_list,
+        'page': page,
+        # Statistics by status come from the job's denormalized counters
+        'total_count': job.application_count,
+        'pending_count': job.pending_count,
+        'reviewed_count': job.reviewed_count,
+        'shortlisted_count': job.shortlisted_count,
+        'rejected_count': job.rejected_count,
     }
     
     return render(request, 'manage_applications.html', context)
@@ -496,51 +609,35 @@ def manage_applications(request, job_id):
 def export_applications(request, job_id):
     """Export job applications to CSV"""
     job = get_object_or_404(Job, id=job_id)
-    applications = JobApplication.objects.filter(job=job).order_by('-created_at')
-    
-    # Create the HttpResponse object with CSV header
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="applications_{job.title.replace(" ", "_")}_{timezone.now().strftime("%Y%m%d")}.csv"'
-    
-    # Create CSV writer
-    writer = csv.writer(response)
-    
-    # Write header row
-    writer.writerow([
-        'ID',
-        'Name',
-        'Email',
-        'Phone',
-        'Status',
-        'Applied On',
-        'Resume URL',
-        'Resume Filename',
-        'Cover Letter Preview'
-    ])
-    
-    # Write data rows
-    for app in applications:
-        # Get resume information
-        if app.resume:
-            resume_url = request.build_absolute_uri(app.resume.url)
-            resume_filename = app.resume.name.split('/')[-1]  # Get just the filename
-        else:
-            resume_url = 'No resume uploaded'
-            resume_filename = 'N/A'
-        
-        writer.writerow([
-            app.id,
-            app.name,
-            app.email,
-            app.phone,
-            app.get_status_display(),
-            app.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            resume_url,
-            resume_filename,
-            app.cover_letter[:100] + '...' if len(app.cover_letter) > 100 else app.cover_letter
-        ])
-    
-    return response
+    header, rows = exports.application_rows(
+        JobApplication.objects.filter(job=job),
+        origin=request.build_absolute_uri('/').rstrip('/'),
+    )
+    filename = f'applications_{job.title.replace(" ", "_")}_{timezone.now().strftime("%Y%m%d")}'
+    return exports.export_response(header, rows, filename, request.GET.get('format', 'csv'))
+
+@login_required
+@user_passes_test(is_admin)
+def export_all_applications(request):
+    """Export applications for every job to CSV"""
+    header, rows = exports.application_rows(
+        JobApplication.objects.all(),
+        origin=request.build_absolute_uri('/').rstrip('/'),
+        include_job=True,
+    )
+    filename = f'applications_all_jobs_{timezone.now().strftime("%Y%m%d")}'
+    return exports.export_response(header, rows, filename, request.GET.get('format', 'csv'))
+
+@login_required
+@user_passes_test(is_admin)
+def download_resume(request, application_id):
+    """Send an applicant's resume; media is not publicly served in production"""
+    application = get_object_or_404(JobApplication.objects.only('id', 'name', 'resume'), id=application_id)
+    if not application.resume:
+        raise Http404('No resume uploaded')
+    extension = os.path.splitext(application.resume.name)[1]
+    filename = f"{slugify(application.name) or 'applicant'}-resume{extension}"
+    return downloads.serve_protected(request, application.resume.name, filename)
 
 @login_required
 @user_passes_test(is_admin)
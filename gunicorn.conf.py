@@ -0,0 +1,19 @@
+"""Gunicorn settings for both deployment profiles; `gunicorn` with no arguments reads this file.
+
+SERVER_MODE=wsgi (default) runs sync workers on ngo_project.wsgi.
+SERVER_MODE=asgi runs uvicorn workers on ngo_project.asgi. Async views then
+wait on the payment gateway without holding a thread, and uploads are read
+before the view starts. Sync views still run, each in a worker thread.
+
+Gunicorn itself picks up PORT (bind) and WEB_CONCURRENCY (workers).
+`manage.py benchmark_servers` compares the two profiles.
+"""
+from decouple import config
+
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'ngo_project.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'ngo_project.wsgi:application'
@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 from decouple import config
 import dj_database_url
@@ -23,6 +24,10 @@ ALLOWED_HOSTS = config(
     default='localhost,127.0.0.1'
 ).split(',')
 
+# Old keys that still verify signatures (signed-cookie sessions, password reset
+# links) while SECRET_KEY is rotated; comma separated
+SECRET_KEY_FALLBACKS = [key for key in config('SECRET_KEY_FALLBACKS', default='').split(',') if key]
+
 CSRF_TRUSTED_ORIGINS = [
     'https://*.onrender.com',
 ]
@@ -54,7 +59,10 @@ INSTALLED_APPS = [
 # --------------------------------------------------
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # WhiteNoise, but async-capable so the stack stays async under ASGI
+    'core.middleware.AsyncWhiteNoiseMiddleware',
+    # Answers anonymous hits on the public pages before sessions/auth run
+    'core.page_cache.AnonymousPageCacheMiddleware',
 
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,11 +75,20 @@ MIDDLEWARE = [
 ]
 
 # --------------------------------------------------
-# URL / WSGI
+# URL / WSGI / ASGI
 # --------------------------------------------------
 ROOT_URLCONF = 'ngo_project.urls'
 WSGI_APPLICATION = 'ngo_project.wsgi.application'
 
+# Deployment profile read by gunicorn.conf.py
+# wsgi: sync gunicorn workers serving ngo_project.wsgi
+# asgi: uvicorn workers serving ngo_project.asgi; async views (donate) wait on
+# the payment gateway without holding a thread
+SERVER_MODES = ('wsgi', 'asgi')
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+if SERVER_MODE not in SERVER_MODES:
+    raise ValueError(f'SERVER_MODE must be one of {", ".join(SERVER_MODES)}')
+
 # --------------------------------------------------
 # TEMPLATES
 # --------------------------------------------------
@@ -98,10 +115,78 @@ DATABASES = {
     'default': dj_database_url.config(
         default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
         conn_max_age=600,
+        conn_health_checks=True,
         ssl_require=not DEBUG
     )
 }
 
+# DB_POOL=true swaps in the pooled engines from core.db_backends (postgresql
+# or sqlite3): each worker process shares at most DB_POOL_MAX_SIZE connections
+# between its threads, pinged before use and recycled after DB_POOL_MAX_LIFETIME
+# seconds. Total connections = workers x DB_POOL_MAX_SIZE
+# DB_POOL must stay off with SERVER_MODE=asgi, where CONN_MAX_AGE is forced to
+# 0 below instead. A connection only goes back to the pool when Django closes it
+# on the thread that opened it; under ASGI that thread ends with the request, so
+# a connection it leaves open (a client disconnect cancels the request before
+# request_finished) stays checked out for good and the pool drains
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+if DB_POOL and SERVER_MODE == 'asgi':
+    raise ValueError('DB_POOL is not supported with SERVER_MODE=asgi')
+if DB_POOL:
+    DATABASES['default'].update({
+        'ENGINE': 'core.db_backends.' + DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+        # Connections go back to the pool at the end of every request
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MIN_SIZE': config('DB_POOL_MIN_SIZE', default=1, cast=int),
+            'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'MAX_LIFETIME': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+            'MAX_IDLE': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            'PRE_PING': config('DB_POOL_PRE_PING', default=True, cast=bool),
+        },
+    })
+elif SERVER_MODE == 'asgi':
+    # Under ASGI a request's sync code runs on a thread that ends with the
+    # request, so a persistent per-thread connection is never reused
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# --------------------------------------------------
+# CACHE
+# --------------------------------------------------
+# One SQLite file per host, shared by every gunicorn worker (core.cache_backend)
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache_backend.SQLiteCache',
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache.sqlite3')),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int),
+        },
+    }
+}
+# `manage.py test` must not read pages or dashboard snapshots cached by the dev
+# server or an earlier run, nor leave its own behind; core/tests/test_cache_backend.py
+# exercises SQLiteCache against temporary files
+if sys.argv[1:2] == ['test']:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# --------------------------------------------------
+# SESSIONS
+# --------------------------------------------------
+# cached_db: read from the shared cache above, written through to the database
+# signed_cookies: no server-side storage; rotate SECRET_KEY via SECRET_KEY_FALLBACKS
+# db: Django's default, one query per authenticated request
+# `manage.py prune_sessions` deletes expired rows left in the database
+SESSION_ENGINES = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
+}
+SESSION_MODE = config('SESSION_MODE', default='cached_db')
+if SESSION_MODE not in SESSION_ENGINES:
+    raise ValueError(f'SESSION_MODE must be one of {", ".join(SESSION_ENGINES)}')
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+
 # --------------------------------------------------
 # AUTHENTICATION / ALLAUTH
 # --------------------------------------------------
@@ -130,11 +215,55 @@ ACCOUNT_FORMS = {
 # --------------------------------------------------
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Outbox worker (python manage.py send_outbox --loop). build.sh starts one next
+# to Gunicorn unless OUTBOX_WORKER=off, for deploys with a separate worker service
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=8, cast=int)
+EMAIL_OUTBOX_BACKOFF = config('EMAIL_OUTBOX_BACKOFF', default=60, cast=int)
+EMAIL_OUTBOX_MAX_BACKOFF = config('EMAIL_OUTBOX_MAX_BACKOFF', default=3600, cast=int)
+EMAIL_OUTBOX_LEASE = config('EMAIL_OUTBOX_LEASE', default=300, cast=int)
+
 # --------------------------------------------------
 # RAZORPAY
 # --------------------------------------------------
 RAZORPAY_KEY_ID = config('RAZORPAY_KEY_ID', default='')
 RAZORPAY_KEY_SECRET = config('RAZORPAY_KEY_SECRET', default='')
+RAZORPAY_WEBHOOK_SECRET = config('RAZORPAY_WEBHOOK_SECRET', default='')
+
+# 'razorpay' for the real API, 'stub' for the local gateway in core.payments
+RAZORPAY_GATEWAY = config('RAZORPAY_GATEWAY', default='razorpay')
+RAZORPAY_ORDER_TIMEOUT = config('RAZORPAY_ORDER_TIMEOUT', default=10, cast=float)
+RAZORPAY_MAX_CONCURRENCY = config('RAZORPAY_MAX_CONCURRENCY', default=8, cast=int)
+RAZORPAY_STUB_LATENCY = config('RAZORPAY_STUB_LATENCY', default=0.3, cast=float)
+RAZORPAY_BASE_URL = config('RAZORPAY_BASE_URL', default='https://api.razorpay.com')
+RAZORPAY_CONNECT_TIMEOUT = config('RAZORPAY_CONNECT_TIMEOUT', default=3.05, cast=float)
+RAZORPAY_READ_TIMEOUT = config('RAZORPAY_READ_TIMEOUT', default=8, cast=float)
+RAZORPAY_MAX_RETRIES = config('RAZORPAY_MAX_RETRIES', default=2, cast=int)
+RAZORPAY_RETRY_BACKOFF = config('RAZORPAY_RETRY_BACKOFF', default=0.2, cast=float)
+RAZORPAY_BREAKER_THRESHOLD = config('RAZORPAY_BREAKER_THRESHOLD', default=5, cast=int)
+RAZORPAY_BREAKER_RESET = config('RAZORPAY_BREAKER_RESET', default=30, cast=float)
+
+# Bearer token for scraping /metrics/ (staff users can always read it)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# --------------------------------------------------
+# ADMIN DASHBOARD
+# --------------------------------------------------
+DASHBOARD_STATS_TTL = config('DASHBOARD_STATS_TTL', default=30, cast=int)
+ADMIN_LIST_PAGE_SIZE = config('ADMIN_LIST_PAGE_SIZE', default=50, cast=int)
+
+# --------------------------------------------------
+# PUBLIC PAGE CACHE
+# --------------------------------------------------
+# Anonymous home/what_we_do/model_village pages are served from the cache
+# (core.page_cache). 0 disables it. Set PAGE_CACHE_VERSION to the release id
+# so a deploy never serves pages rendered by the previous one
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=600, cast=int)
+PAGE_CACHE_VERSION = config('PAGE_CACHE_VERSION', default='')
+
+# --------------------------------------------------
+# JOB SEARCH
+# --------------------------------------------------
+JOB_SEARCH_PAGE_SIZE = config('JOB_SEARCH_PAGE_SIZE', default=20, cast=int)
 
 # --------------------------------------------------
 # PASSWORD VALIDATION
@@ -166,12 +295,30 @@ STATICFILES_DIRS = [
 
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Widths generated by `manage.py build_responsive_images` (see core.responsive_images)
+RESPONSIVE_IMAGE_WIDTHS = [160, 320, 640, 960, 1280, 1920]
+
 # --------------------------------------------------
 # MEDIA FILES
 # --------------------------------------------------
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resumes are streamed through core.uploads.ResumeUploadHandler, which stops
+# reading a file once it passes this many bytes
+RESUME_MAX_UPLOAD_SIZE = config('RESUME_MAX_UPLOAD_SIZE', default=5 * 1024 * 1024, cast=int)
+
+# Protected media (resumes) is served through core.downloads. Set to
+# 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache/lighttpd) to let the front
+# server send the bytes; empty streams them from Django
+PROTECTED_MEDIA_OFFLOAD = config('PROTECTED_MEDIA_OFFLOAD', default='')
+PROTECTED_MEDIA_INTERNAL_URL = config('PROTECTED_MEDIA_INTERNAL_URL', default='/protected-media/')
+
+# Threads per process that build ModelVillage thumbnails (core.thumbnails).
+# Variants live under villages/variants/ with content-hash names, so the front
+# server may send them with a far-future Cache-Control
+IMAGE_VARIANT_WORKERS = config('IMAGE_VARIANT_WORKERS', default=2, cast=int)
+
 # --------------------------------------------------
 # DEFAULT PK
 # --------------------------------------------------